@@ -0,0 +1,32 @@
+import argparse
+import asyncio
+from genedesign.service import DesignService, serve
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve transcript and operon designs over newline-delimited JSON (TCP).")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=2, help="Worker processes, each with a warm designer")
+    parser.add_argument('--batch-size', type=int, default=4, help="Most requests sent to a worker at once")
+    parser.add_argument('--batch-window', type=float, default=0.01, help="Seconds to wait for a batch to fill")
+    parser.add_argument('--max-queue', type=int, default=64, help="Queued requests before answering 'busy'")
+    parser.add_argument('--deadline', type=float, default=60.0, help="Default per-request deadline in seconds")
+    args = parser.parse_args()
+
+    service = DesignService()
+    service.host = args.host
+    service.port = args.port
+    service.workers = args.workers
+    service.batch_size = args.batch_size
+    service.batch_window = args.batch_window
+    service.max_queue = args.max_queue
+    service.default_deadline = args.deadline
+    service.initiate()
+
+    try:
+        asyncio.run(serve(service))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
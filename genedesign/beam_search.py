@@ -1,18 +1,18 @@
 import heapq
 from genedesign.models.rbs_option import RBSOption
 from genedesign.rbs_chooser import RBSChooser
+from genedesign.objective import Objective
 class BeamSearch():
     def __init__(self):
-        ## heuristic func hyperparameters
-        self.cai_weight = None
-        self.hairpin_weight = None
-        self.forbidden_seq_weight = None
-        self.internal_promoter_weight = None
-        self.rnase_weight = None
+        ## heuristic func hyperparameters live in the shared objective (see genedesign/objective.py)
+        self.objective = None
 
     def initiate(self):
         self.chooser = RBSChooser()
         self.chooser.initiate()
+        if self.objective is None:
+            self.objective = Objective()
+            self.objective.initiate()
 
     def run(self, peptide:str, ignores:set) -> tuple[RBSOption, list[str]]:
         # Initialize the beam with sequences for the first amino acid
@@ -100,42 +100,34 @@ class BeamSearch():
         coding_sequence = ''.join(codons)
         return self.chooser.optimized_run(coding_sequence)
 
-    def calculate_score(self, codon_sequence):
-        # Compute the heuristic score for the sequence
-        codon_score = NotImplemented # if using min, have to invert, or have it be inverted already here
-        hairpin_score = NotImplemented
-        fseq_score = NotImplemented
-        ip_score = NotImplemented
-        rnase_score = NotImplemented
-
-        # might have to normalize here so scores can be compared easier
-        # as sequences get longer, hairpin counts, # of internal promoters etc increase
-
+    def calculate_score(self, codon_sequence, rbs=None, state=None):
         """
-        length of longest rare codon stretch or num of rare codons?
-        number of RNAase E sites
-
-        coding region:
-        - Codon usage (CAI)
-        - internal starts
-        - internal terminators
-        - RNAse E sites
-
-        first third OR -4 -> +37:
-        - secondary structure
-
-        5' UTR: (maybe don't need this one with RBSChooser)
-        Shine-dalgarno
-        secondary structure
-        spacing
-        """
-
+        Scores a partial codon sequence with the shared objective (higher is better).
 
-
-
-
-        score = self.cai_weight * codon_score + self.hairpin_weight * hairpin_score + self.forbidden_seq_weight * fseq_score + self.internal_promoter_weight * ip_score + self.rnase_weight * rnase_score
-        return score
+        Beam entries can pass the ObjectiveState of their parent extended by the new codon, so the
+        score is updated in time proportional to one codon instead of rescoring the whole sequence.
+        """
+        if state is None:
+            state = self.objective.new_state().extend(codon_sequence)
+
+        # Design notes:
+        # length of longest rare codon stretch or num of rare codons?
+        # number of RNAase E sites
+        #
+        # coding region:
+        # - Codon usage (CAI)
+        # - internal starts
+        # - internal terminators
+        # - RNAse E sites
+        #
+        # first third OR -4 -> +37:
+        # - secondary structure
+        #
+        # 5' UTR: (maybe don't need this one with RBSChooser)
+        # Shine-dalgarno
+        # secondary structure
+        # spacing
+        return state.score()
     
     def violates_constraints(seq):
         # Check for forbidden sequences, RNAse sites, internal promoters, and other hard constraints
@@ -1,6 +1,11 @@
 import sys
 import csv
 from collections import Counter  # Import Counter for counting codons
+from genedesign.models.violation import Violation
+
+DIVERSITY_THRESHOLD = 0.5  # Least fraction of the 62 sense codons used
+RARE_CODON_LIMIT = 3       # Most rare codons in the CDS
+CAI_THRESHOLD = 0.2        # Least Codon Adaptation Index
 
 class CodonChecker:
     """
@@ -74,15 +79,31 @@ class CodonChecker:
         cai_value = cai_product ** (1 / len(cai_numerators)) if cai_numerators else 0.0
 
         # Apply thresholds to determine if the codons are above board
-        diversity_threshold = 0.5
-        rare_codon_limit = 3
-        cai_threshold = 0.2
-
-        codons_above_board = (codon_diversity >= diversity_threshold and
-                              rare_codon_count <= rare_codon_limit and
-                              cai_value >= cai_threshold)
+        codons_above_board = (codon_diversity >= DIVERSITY_THRESHOLD and
+                              rare_codon_count <= RARE_CODON_LIMIT and
+                              cai_value >= CAI_THRESHOLD)
 
         return codons_above_board, codon_diversity, rare_codon_count, cai_value
+
+    def locate(self, cds: list[str]) -> list[Violation]:
+        """
+        Returns the codons behind run()'s failure, in nucleotide coordinates of the joined CDS.
+
+        Too many rare codons is reported as one violation per rare codon. Low codon diversity or CAI
+        are properties of the whole CDS and are reported as a single violation covering all of it.
+
+        :param cds: List of codons representing the CDS.
+        :return: Violations, empty if run() passes.
+        """
+        above_board, codon_diversity, rare_codon_count, cai_value = self.run(cds)
+        if above_board:
+            return []
+        violations = []
+        if codon_diversity < DIVERSITY_THRESHOLD or cai_value < CAI_THRESHOLD:
+            violations.append(Violation('codons', 0, 3 * len(cds), f'diversity {codon_diversity:.2f}, CAI {cai_value:.2f}'))
+        if rare_codon_count > RARE_CODON_LIMIT:
+            violations.extend(Violation('codons', 3 * i, 3 * i + 3, codon) for i, codon in enumerate(cds) if codon in self.rare_codons)
+        return violations
     
     def my_run(self, cds: list[str], len_peptide:int) -> tuple[bool, float, int, float]:
         """
@@ -96,9 +117,9 @@ class CodonChecker:
             return False, 0.0, 0, 0.0  # Return false for empty CDS
         
         # Thresholds to determine if the codons are above board
-        diversity_threshold = 0.5
-        global_rare_codon_limit = 3
-        cai_threshold = 0.2
+        diversity_threshold = DIVERSITY_THRESHOLD
+        global_rare_codon_limit = RARE_CODON_LIMIT
+        cai_threshold = CAI_THRESHOLD
         max_diff_codons = 62 # 
 
         codon_counts = Counter(cds)
@@ -233,13 +254,9 @@ class CodonChecker2:
         cai_value = cai_product ** (1 / len(w_values)) if w_values else 0.0
 
         # Apply thresholds to determine if the codons are above board
-        diversity_threshold = 0.5
-        rare_codon_limit = 3
-        cai_threshold = 0.2
-
-        codons_above_board = (codon_diversity >= diversity_threshold and
-                              rare_codon_count <= rare_codon_limit and
-                              cai_value >= cai_threshold)
+        codons_above_board = (codon_diversity >= DIVERSITY_THRESHOLD and
+                              rare_codon_count <= RARE_CODON_LIMIT and
+                              cai_value >= CAI_THRESHOLD)
 
         return codons_above_board, codon_diversity, rare_codon_count, cai_value
 
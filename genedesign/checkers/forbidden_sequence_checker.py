@@ -1,4 +1,5 @@
 from genedesign.seq_utils.reverse_complement import reverse_complement
+from genedesign.models.violation import Violation
 
 class ForbiddenSequenceChecker:
     def __init__(self):
@@ -38,6 +39,22 @@ class ForbiddenSequenceChecker:
 
         return True, None
 
+    def locate(self, dnaseq) -> list[Violation]:
+        """
+        Returns every occurrence of a forbidden site on either strand, sorted by position. A site on
+        the reverse strand is reported at the forward bases it covers, so the list is empty exactly
+        when run() passes.
+        """
+        seq = dnaseq.upper()
+        violations = set()
+        for site in self.forbidden:
+            for pattern in {site, reverse_complement(site)}:
+                i = seq.find(pattern)
+                while i != -1:
+                    violations.add(Violation('forbidden', i, i + len(pattern), site))
+                    i = seq.find(pattern, i + 1)
+        return sorted(violations, key=lambda v: (v.start, v.end, v.detail))
+
 def main():
     checker = ForbiddenSequenceChecker()
     checker.initiate()
@@ -1,4 +1,8 @@
 import re
+from genedesign.models.violation import Violation
+
+GC_LOWER_BOUND = .4
+GC_UPPER_BOUND = .6
 
 def gc_checker(sequence):
     sequence = sequence.upper()
@@ -28,14 +32,24 @@ def gc_checker(sequence):
         # Calculate GC content as a percentage
         gc_content = (gc_count / total_nucleotides)
 
-    lower_bound = .4
-    upper_bound = .6
+    lower_bound = GC_LOWER_BOUND
+    upper_bound = GC_UPPER_BOUND
     
     # Determine if GC content is between 40% and 60% inclusive
     in_range = lower_bound <= gc_content <= upper_bound
     
     return in_range, gc_content
 
+def locate_gc(sequence) -> list[Violation]:
+    """
+    Returns a single violation covering the whole sequence if its GC content is out of range, since
+    GC content is a property of the sequence as a whole. Empty otherwise.
+    """
+    in_range, gc_content = gc_checker(sequence)
+    if in_range:
+        return []
+    return [Violation('gc', 0, len(sequence), f'{gc_content:.3f}')]
+
 if __name__ == '__main__':
     # Sample DNA sequences for testing
     sequences = [
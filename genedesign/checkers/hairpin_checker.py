@@ -1,4 +1,12 @@
-from genedesign.seq_utils.hairpin_counter import hairpin_counter
+from genedesign.seq_utils.hairpin_counter import hairpin_counter, hairpin_sites
+from genedesign.models.violation import Violation
+
+CHUNK_SIZE = 50  # 50 bp window
+OVERLAP = 25     # Overlap by 25 bp
+MIN_STEM = 3     # Minimum number of bases in the stem
+MIN_LOOP = 4     # Minimum number of bases in the loop
+MAX_LOOP = 9     # Maximum number of bases in the loop
+MAX_HAIRPINS = 1 # Most hairpins allowed in a single chunk
 
 def hairpin_checker(dna):
     """
@@ -14,11 +22,11 @@ def hairpin_checker(dna):
             - True and None if no problematic hairpins are found.
             - False and the problematic hairpin string if more than one hairpin is found in any chunk.
     """
-    chunk_size = 50  # 50 bp window
-    overlap = 25     # Overlap by 25 bp
-    min_stem = 3     # Minimum number of bases in the stem
-    min_loop = 4     # Minimum number of bases in the loop
-    max_loop = 9     # Maximum number of bases in the loop
+    chunk_size = CHUNK_SIZE
+    overlap = OVERLAP
+    min_stem = MIN_STEM
+    min_loop = MIN_LOOP
+    max_loop = MAX_LOOP
     
     # Iterate over the sequence in 50 bp chunks with 25 bp overlap
     for i in range(0, len(dna) - chunk_size + 1, overlap):
@@ -28,12 +36,39 @@ def hairpin_checker(dna):
         hairpin_count, hairpin_string = hairpin_counter(chunk, min_stem, min_loop, max_loop)
         
         # If more than 1 hairpin is found, return False and the problematic hairpin string
-        if hairpin_count > 1:
+        if hairpin_count > MAX_HAIRPINS:
             return False, hairpin_string
     
     # If no problematic hairpin chunk is found, return True and None
     return True, None
 
+def locate_hairpins(dna) -> list[Violation]:
+    """
+    Returns the hairpins behind hairpin_checker's failures: every hairpin inside a chunk that has more
+    than MAX_HAIRPINS of them, in sequence coordinates and sorted by position. Chunks are the same 50 bp
+    windows with 25 bp overlap, so the list is empty exactly when hairpin_checker passes. Breaking all
+    but MAX_HAIRPINS of the hairpins in a chunk is enough to fix it.
+
+    Parameters:
+        dna (str): The DNA sequence to analyze.
+
+    Returns:
+        list[Violation]: One violation per hairpin, with its stems and loop as detail.
+    """
+    found = set()
+    for i in range(0, len(dna) - CHUNK_SIZE + 1, OVERLAP):
+        chunk = dna[i:i + CHUNK_SIZE]
+        sites = hairpin_sites(chunk, MIN_STEM, MIN_LOOP, MAX_LOOP)
+        if len(sites) > MAX_HAIRPINS:
+            found.update((i + start, i + end) for start, end in sites)
+
+    violations = []
+    for start, end in sorted(found):
+        hairpin = dna[start:end]
+        detail = f"{hairpin[:MIN_STEM]}({hairpin[MIN_STEM:-MIN_STEM]}){hairpin[-MIN_STEM:]}"
+        violations.append(Violation('hairpin', start, end, detail))
+    return violations
+
 # Example usage
 if __name__ == "__main__":
     result, hairpin = hairpin_checker("AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAACCCCAAAAAAAGGGGAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA")
@@ -1,5 +1,7 @@
 import math
+import numpy as np
 from genedesign.seq_utils.reverse_complement import reverse_complement
+from genedesign.models.violation import Violation
 
 class PromoterChecker:
     """
@@ -11,8 +13,13 @@ class PromoterChecker:
 
     Attributes:
         pwm: A 2D list representing the Position Weight Matrix (PWM) used to score sequences.
+        sliding_frame: The length of the scored window in nucleotides.
+        threshold: The window score at or above which a promoter is reported.
     """
 
+    sliding_frame = 29  # The sliding window size is 29 nucleotides.
+    threshold = 9.134   # A threshold score for detecting promoter activity.
+
     def __init__(self):
         """
         Initializes the PromoterChecker by setting pwm to None.
@@ -68,8 +75,8 @@ class PromoterChecker:
         rc = reverse_complement(seq)
         combined = seq + "x" + rc  # Concatenate the original sequence and its reverse complement.
 
-        sliding_frame = 29  # The sliding window size is 29 nucleotides.
-        threshold = 9.134   # A threshold score for detecting promoter activity.
+        sliding_frame = self.sliding_frame
+        threshold = self.threshold
 
         # Slide over the sequence and calculate the score for each window.
         for i in range(len(combined) - sliding_frame + 1):
@@ -85,6 +92,48 @@ class PromoterChecker:
                 return False, partseq  # Promoter found, return the sequence
         return True, None  # No promoter detected in the sequence
 
+    def locate(self, seq) -> list[Violation]:
+        """
+        Returns every window that run() would report as a promoter, in forward-strand coordinates.
+
+        The same windows as run() are scored, over the sequence, the separator and its reverse
+        complement. A reverse-strand window is reported at the forward bases it covers; a window
+        spanning the separator covers bases at the 3' end of both strands, so it maps to a single
+        interval at the end of the sequence.
+
+        Returns:
+            list[Violation]: The promoter windows, with the scored window as detail.
+        """
+        seq = seq.upper()
+        n = len(seq)
+        combined = seq + "x" + reverse_complement(seq)
+        frame = self.sliding_frame
+        if len(combined) < frame:
+            return []
+
+        def forward(p):
+            return p if p < n else 2 * n - p
+
+        # Score every window at once (other characters hit a zero row), then rescore the windows near
+        # the threshold exactly as run() does so rounding cannot change the verdict
+        rows = np.frombuffer(combined.encode('ascii'), dtype=np.uint8)
+        rows = np.select([rows == ord(base) for base in 'ACGT'], [0, 1, 2, 3], default=4)
+        weights = np.vstack([np.asarray(self.pwm, dtype=float), np.zeros((1, frame))])
+        scores = weights[np.lib.stride_tricks.sliding_window_view(rows, frame), np.arange(frame)].sum(axis=1)
+
+        violations = []
+        for i in np.flatnonzero(scores >= self.threshold - 1e-6).tolist():
+            score = 0.0
+            partseq = combined[i:i + frame]
+            for x, base in enumerate(partseq):
+                y = {'A': 0, 'C': 1, 'G': 2, 'T': 3}.get(base, -1)
+                if y != -1:
+                    score += self.pwm[y][x]
+            if score >= self.threshold:
+                positions = [forward(p) for p in range(i, i + frame) if p != n]
+                violations.append(Violation('promoter', min(positions), max(positions) + 1, partseq))
+        return violations
+
 
 if __name__ == "__main__":
     checker = PromoterChecker()
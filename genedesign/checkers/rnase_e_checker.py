@@ -0,0 +1,83 @@
+import re
+from genedesign.models.violation import Violation
+
+class RNaseEChecker:
+    """
+    Counts predicted RNase E cleavage sites in a transcript.
+
+    RNase E cuts single-stranded mRNA at AU-rich sites matching the consensus RN^WUU (R = A/G,
+    W = A/U, ^ = cleavage point). The number of predicted sites explains part of the variation in
+    expression, so the count is meant to feed a search score rather than act as a hard filter.
+    Only the sense strand is scanned because the mRNA is single stranded.
+
+    All motifs are compiled into one regular expression with a zero-width lookahead, so overlapping
+    sites are found in a single C-level scan. `count` also supports an incremental mode: passing
+    `start` counts only the sites that end after `start`, which are exactly the sites added when
+    the sequence grew from seq[:start] to seq.
+
+    Attributes:
+        motifs: DNA regular expressions for the cleavage site consensus sequences.
+        max_site_density: Most sites per nucleotide allowed before `run` reports a failure.
+    """
+
+    def __init__(self):
+        self.motifs = []
+        self.pattern = None
+        self.max_motif_length = None
+        self.max_site_density = None
+
+    def initiate(self):
+        self.motifs = [
+            "[AG][ACGT][AT]TT",  # RN^WUU
+        ]
+        self.pattern = re.compile("(?=(" + "|".join(self.motifs) + "))")
+        self.max_motif_length = 5
+        # Twice the density expected in a random sequence (1 / 64 for RN^WUU)
+        self.max_site_density = 2 / 64
+
+    def sites(self, seq, start=0) -> list[int]:
+        """
+        Returns the start positions of all cleavage sites ending after `start`.
+        """
+        seq = str(seq).upper()
+        scan_from = max(0, start - self.max_motif_length + 1)
+        return [match.start() for match in self.pattern.finditer(seq, scan_from) if match.end(1) > start]
+
+    def count(self, seq, start=0) -> int:
+        """
+        Counts the cleavage sites in `seq` that end after `start`.
+
+        With the default start of 0 this is the total count. For incremental updates,
+        count(seq[:start]) + count(seq, start) == count(seq).
+        """
+        return len(self.sites(seq, start))
+
+    def run(self, seq) -> tuple[bool, int]:
+        """
+        Checks the cleavage site density of the given sequence.
+
+        Returns:
+            tuple: (bool, int)
+                - True if the site density is at most max_site_density, False otherwise.
+                - The number of predicted cleavage sites.
+        """
+        site_count = self.count(seq)
+        return site_count <= self.max_site_density * len(seq), site_count
+
+    def locate(self, seq) -> list[Violation]:
+        """
+        Returns every cleavage site if the site density is above max_site_density, otherwise an
+        empty list. Removing sites anywhere lowers the density, so all of them are reported.
+        """
+        sites = self.sites(seq)
+        if len(sites) <= self.max_site_density * len(seq):
+            return []
+        seq = str(seq).upper()
+        return [Violation('rnase', start, start + self.max_motif_length, seq[start:start + self.max_motif_length]) for start in sites]
+
+if __name__ == "__main__":
+    checker = RNaseEChecker()
+    checker.initiate()
+
+    print(checker.run("GCGCGCGCGCGCGCGCGCGC"))  # No AU-rich sites
+    print(checker.run("ACATTTGAATTAGCATTGCAATTT"))  # Several RN^WUU sites
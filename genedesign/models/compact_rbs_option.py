@@ -0,0 +1,89 @@
+from dataclasses import dataclass, field
+from .rbs_option import RBSOption
+
+class RBSRegistry:
+    """
+    Assigns a stable integer ID to every RBSOption so that compact models can refer to an RBS by ID
+    instead of holding the option itself. Each option is stored once, column by column.
+
+    The registry keeps only the four field strings, never the RBSOption objects. The source gene cds is
+    among them because CompactRBSOption.cds and to_rbs_option must give back an option equal to the one
+    registered; the strings are the ones the RBS library already holds, so registering copies none.
+
+    Attributes:
+        utrs (list[str]): The 5' UTR of each registered option, indexed by ID.
+        cds (list[str]): The source gene coding sequence of each option, indexed by ID.
+        gene_names (list[str]): The source gene name of each option, indexed by ID.
+        first_six_aas (list[str]): The first six amino acids of each option, indexed by ID.
+    """
+
+    def __init__(self):
+        self.utrs = []
+        self.cds = []
+        self.gene_names = []
+        self.first_six_aas = []
+        self.ids = {}  # {(utr, cds, gene_name, first_six_aas): ID}
+
+    def register(self, option: RBSOption) -> int:
+        """
+        Returns the ID of the option, registering it first if it is new.
+        """
+        key = (option.utr, option.cds, option.gene_name, option.first_six_aas)
+        rbs_id = self.ids.get(key)
+        if rbs_id is None:
+            rbs_id = len(self.utrs)
+            self.ids[key] = rbs_id
+            self.utrs.append(option.utr)
+            self.cds.append(option.cds)
+            self.gene_names.append(option.gene_name)
+            self.first_six_aas.append(option.first_six_aas)
+        return rbs_id
+
+    def get(self, rbs_id: int) -> RBSOption:
+        """
+        Rebuilds the full RBSOption for an ID.
+        """
+        return RBSOption(
+            utr=self.utrs[rbs_id],
+            cds=self.cds[rbs_id],
+            gene_name=self.gene_names[rbs_id],
+            first_six_aas=self.first_six_aas[rbs_id],
+        )
+
+    def compact(self, option: RBSOption) -> 'CompactRBSOption':
+        return CompactRBSOption(self.register(option), self)
+
+    def __len__(self) -> int:
+        return len(self.utrs)
+
+@dataclass(frozen=True, slots=True)
+class CompactRBSOption:
+    """
+    A memory-compact stand-in for RBSOption that stores only an integer ID into an RBSRegistry.
+    The RBSOption attributes are available as properties read from the registry on access.
+
+    Attributes:
+        rbs_id (int): The ID of the option in the registry.
+        registry (RBSRegistry): The registry that owns the option's sequences.
+    """
+    rbs_id: int
+    registry: RBSRegistry = field(repr=False, compare=False)
+
+    @property
+    def utr(self) -> str:
+        return self.registry.utrs[self.rbs_id]
+
+    @property
+    def cds(self) -> str:
+        return self.registry.cds[self.rbs_id]
+
+    @property
+    def gene_name(self) -> str:
+        return self.registry.gene_names[self.rbs_id]
+
+    @property
+    def first_six_aas(self) -> str:
+        return self.registry.first_six_aas[self.rbs_id]
+
+    def to_rbs_option(self) -> RBSOption:
+        return self.registry.get(self.rbs_id)
@@ -0,0 +1,63 @@
+from dataclasses import dataclass, field
+from typing import List
+from .compact_rbs_option import CompactRBSOption, RBSRegistry
+from .transcript import Transcript
+
+# All 64 codons in a fixed order; a codon's index in this list is its one-byte ID
+CODONS = [a + b + c for a in "ACGT" for b in "ACGT" for c in "ACGT"]
+CODON_IDS = {codon: codon_id for codon_id, codon in enumerate(CODONS)}
+
+def encode_codons(codons: List[str]) -> bytes:
+    """
+    Packs a list of codons into one byte per codon.
+
+    Raises:
+        ValueError: If a codon is not one of the 64 DNA triplets.
+    """
+    try:
+        return bytes(CODON_IDS[codon] for codon in codons)
+    except KeyError as e:
+        raise ValueError(f"Invalid codon: {e.args[0]}") from None
+
+def decode_codons(codon_ids: bytes) -> List[str]:
+    """
+    Unpacks codon IDs back into a list of codon strings.
+    """
+    return [CODONS[codon_id] for codon_id in codon_ids]
+
+@dataclass(frozen=True, slots=True)
+class CompactTranscript:
+    """
+    A memory-compact Transcript: the codons are stored as one byte each and the RBS as an integer
+    ID into an RBSRegistry. The Transcript attributes (rbs, peptide, codons) are provided as
+    properties, so code that reads transcripts works with either class.
+
+    Attributes:
+        rbs_id (int): The ID of the RBS in the registry.
+        peptide (str): The encoded protein.
+        codon_ids (bytes): One codon ID per codon, including the stop codon.
+        registry (RBSRegistry): The registry that owns the RBS sequences.
+    """
+    rbs_id: int
+    peptide: str
+    codon_ids: bytes
+    registry: RBSRegistry = field(repr=False, compare=False)
+
+    @classmethod
+    def from_transcript(cls, transcript: Transcript, registry: RBSRegistry) -> 'CompactTranscript':
+        return cls(registry.register(transcript.rbs), transcript.peptide, encode_codons(transcript.codons), registry)
+
+    @property
+    def rbs(self) -> CompactRBSOption:
+        return CompactRBSOption(self.rbs_id, self.registry)
+
+    @property
+    def codons(self) -> List[str]:
+        return decode_codons(self.codon_ids)
+
+    @property
+    def cds(self) -> str:
+        return ''.join(CODONS[codon_id] for codon_id in self.codon_ids)
+
+    def to_transcript(self) -> Transcript:
+        return Transcript(self.registry.get(self.rbs_id), self.peptide, self.codons)
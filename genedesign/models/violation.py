@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass(frozen=True)
+class Violation:
+    """
+    A failed design constraint located in a sequence.
+
+    Coordinates are 0-based and half-open on the forward strand of the checked sequence; sites found
+    on the reverse strand are mapped back to the forward bases they cover.
+
+    Attributes:
+        check (str): The check that failed: 'forbidden', 'promoter', 'hairpin', 'gc', 'codons' or 'rnase'.
+        start (int): The first nucleotide of the offending interval.
+        end (int): One past the last nucleotide of the offending interval.
+        detail (str | None): The offending site or sequence, or a short description for global checks.
+    """
+    check: str
+    start: int
+    end: int
+    detail: Optional[str] = None
+
+    def overlaps(self, start: int, end: int) -> bool:
+        """
+        Returns True if the violation shares at least one nucleotide with [start, end).
+        """
+        return self.start < end and start < self.end
+
+    def codons(self, offset: int = 0) -> range:
+        """
+        Returns the indices of the codons the violation overlaps, for a reading frame that starts at
+        `offset` in the checked sequence. Indices can be negative when the interval reaches before it.
+        """
+        return range((self.start - offset) // 3, (self.end - offset + 2) // 3)
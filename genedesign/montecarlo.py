@@ -1,9 +1,21 @@
+import math
+import time
 from genedesign.models.rbs_option import RBSOption
 from genedesign.sliding_window_generator import sliding_window_generator
+from genedesign.window_planner import WindowPlanner
 from genedesign.rbs_chooser import RBSChooser
 from genedesign.seq_utils.sample_codon import SampleCodon
+from genedesign.seq_utils.constrained_sampler import ConstrainedSampler
 from genedesign.seq_utils.check_seq import CheckSequence
 from genedesign.checkers.codon_checker import CodonChecker
+from genedesign.profiler import Profiler
+from genedesign.objective import Objective
+
+class DesignCancelled(Exception):
+    """
+    Raised by a search backend when its stop hook asks it to abandon the current design.
+    """
+
 class MonteCarlo():
     def __init__(self):
         # Params
@@ -11,79 +23,341 @@ class MonteCarlo():
         self.n_behind = 3
         self.n_ahead = 6
         self.step = None
+        self.short_circuit_checks = True  # Stop checking a candidate at its first failed check
+        self.constrained_sampling = True  # Only draw codons that cannot form a forbidden site
+        self.reuse_lookahead = True  # Seed each window with the previous window's accepted lookahead codons
+        self.last_lookahead = []  # Lookahead codons of the most recently accepted window
+        self.last_attempts = 0  # Candidates sampled for the most recent window
+        self.last_accepted = False  # Whether the most recent window found a passing candidate
+        self.fallback_windows = 0  # Windows of the last run that kept a failing candidate
+        self.targeted_repair = True  # Resample only the codons overlapping a rejected candidate's violations
+        self.max_repairs = 3  # Consecutive repairs before a candidate is resampled from scratch
+        self.deadline = None  # time.perf_counter() value the current run should finish by, if any
+        self.timed_out = False  # Whether the last run reached its deadline before the final window
+        self.fill_seconds_per_residue = 5e-5  # Running estimate of the post-deadline fill cost
+        self.adaptive_windows = True  # Size windows with WindowPlanner instead of the fixed generator
+        self.planner = None
+        self.profiler = Profiler()
+        self.seed = None  # Seed for the codon sampler; None draws fresh entropy
+        self.objective = None  # Scoring objective shared with the checker; a default one is built if None
+        self.should_stop = None  # Optional callable polled once per window; returning True cancels the run
+        self.segment_offset = 0  # Codon index of the segment being designed; 0 when it starts the CDS
+        self.window_cache = None  # Optional WindowCache consulted before each window is searched
+        self.cache_constraints = None  # Constraint key of the cache entries made by this search
+        self.cache_context = 6  # Nucleotides before a window that are part of its cache key
 
     def initiate(self):
         self.sampler = SampleCodon()
+        self.constrained_sampler = ConstrainedSampler()
         self.chooser = RBSChooser()
         self.checker = CheckSequence()
         self.codon_checker = CodonChecker()
+        self.planner = WindowPlanner()
+        self.planner.n_in_scope = self.n_codons_in_scope
+        self.planner.n_ahead = self.n_ahead
+        self.planner.min_in_scope = min(self.planner.min_in_scope, self.n_codons_in_scope)
 
+        if self.objective is None:
+            self.objective = Objective()
+            self.objective.initiate()
+
+        self.sampler.seed = self.seed
+        self.checker.objective = self.objective
         self.sampler.initiate()
+        self.constrained_sampler.seed = self.seed
+        self.constrained_sampler.initiate()
         self.chooser.initiate()
         self.checker.initiate()
         self.codon_checker.initiate()
+        self.planner.initiate()
+
+        # Share one profiler across the whole search
+        self.chooser.profiler = self.profiler
+        self.checker.profiler = self.profiler
     
-    def run(self, peptide:str, ignores:set) -> tuple[RBSOption, list[str]]:
+    def run(self, peptide:str, ignores:set, deadline: float = None, template: list = None) -> tuple[RBSOption, list[str]]:
+        """
+        Designs the RBS and codons for a peptide.
+
+        `deadline` is a time.perf_counter() value to finish by. The time left is split evenly over the
+        windows still to go, so each window stops retrying when its share runs out and keeps its best
+        candidate. Once only the time needed to encode the rest is left, the rest of the peptide is
+        sampled in one unchecked draw (constrained sampling still keeps it free of forbidden sites), so
+        a complete design is always returned; self.timed_out tells whether that happened.
+
+        `template` warm-starts the search from earlier designs: one codon or None per residue of the
+        peptide and stop (see DesignIndex.template). Each window's first proposal takes the template
+        codons it covers and only samples the rest, so stretches shared with an earlier design cost one
+        check per window and the search only works on the divergent residues and their junctions.
+        """
         if not peptide:
             raise ValueError("Peptide needs to be a non-empty string.")
+        full_peptide = peptide + '*' # Adding stop codon
+        return self.run_segment(full_peptide, ignores, len(full_peptide), deadline=deadline, template=template)
+
+    def run_segment(self, residues: str, ignores: set, len_peptide: int, codon_offset: int = 0, rare_offset: int = 0,
+                    deadline: float = None, template: list = None) -> tuple[RBSOption, list[str]]:
+        """
+        Designs the codons for residues [codon_offset, codon_offset + len(residues)) of a peptide of
+        len_peptide residues (stop included), so segments of one long protein can be designed apart.
+
+        The segment at codon 0 starts the CDS: its RBS is chosen as in run() and returned. Later segments
+        return None for the RBS; they are designed without any preceding sequence, their first codon is
+        not treated as a start codon, and their codon checks are placed at codon_offset with up to
+        rare_offset rare codons allowed before it (SequenceContext.place), so the rare codon budget of
+        the whole CDS is kept when the segments are joined.
+        """
+        if not residues:
+            raise ValueError("Segment needs to be a non-empty string.")
+        self.deadline = deadline
+        self.timed_out = False
+        self.fallback_windows = 0
+        self.segment_offset = codon_offset
 
         codons = []
-        full_peptide = peptide + '*' # Adding stop codon
-        len_peptide = len(full_peptide)
-        
-        # Phase 1: Generate RBSOption
-        first_6_aas = full_peptide[:6]
-        first_6_codons = self.__montecarlo(first_6_aas, codons)
-        gened_cds = ''.join(first_6_codons)
-        selected_RBS = self.chooser.optimized_run(gened_cds, ignores)
-        codons.extend(first_6_codons)
+        selected_RBS = None
+        if codon_offset == 0:
+            # Phase 1: Generate RBSOption
+            first_6_aas = residues[:6]
+            first_6_codons = self.__montecarlo(first_6_aas, codons)
+            self.__check_stop()
+            gened_cds = ''.join(first_6_codons)
+            with self.profiler.stage('rbs_selection'):
+                selected_RBS = self.chooser.optimized_run(gened_cds, ignores)
+            codons.extend(first_6_codons)
+
+            # Rolling view of the committed sequence that every candidate is checked against
+            context = self.checker.new_context(selected_RBS.utr, codons)
+        else:
+            context = self.checker.new_context('')
+            context.place(codon_offset, rare_offset)
+        if self.window_cache is not None:
+            self.cache_constraints = self.checker.constraint_key(context.window_size)
 
         # Phase 2:
         len_codons = len(codons)
-        rest_peptide = full_peptide[len_codons:]
-
+        rest_peptide = residues[len_codons:]
+
+        # Lookahead codons of the last accepted window, already checked in place
+        seed_codons = []
+        if self.adaptive_windows:
+            self.planner.reset()
+            for start, scope_end, end in self.planner.plan(len(rest_peptide)):
+                self.__check_stop()
+                if self.__past_deadline(len(rest_peptide) - start):
+                    codons.extend(self.__fill(rest_peptide[start:], codons, context, seed_codons))
+                    break
+                window = rest_peptide[start:end]
+                window_deadline = self.__window_deadline(len(rest_peptide) - start, scope_end - start)
+                window_template = self.__template_slice(template, len_codons + start, len_codons + end)
+                window_codons = self.__find_codons(window, codons, selected_RBS, len_peptide, context, seed_codons, n_in_scope=scope_end - start, deadline=window_deadline, template=window_template)
+                self.planner.record(self.last_attempts, self.last_accepted)
+                self.fallback_windows += not self.last_accepted
+                codons.extend(window_codons)
+                context.commit(window_codons)
+                seed_codons = self.last_lookahead if self.reuse_lookahead else []
+            return selected_RBS, codons
+
+        carry = self.reuse_lookahead and self.step in (None, self.n_codons_in_scope)
         for window in sliding_window_generator(rest_peptide, n_in_scope=self.n_codons_in_scope, n_ahead=self.n_ahead, step=self.step):
-            window_codons = self.__find_codons(window, codons, selected_RBS, len_peptide)
+            self.__check_stop()
+            if self.__past_deadline(len(residues) - len(codons)):
+                codons.extend(self.__fill(residues[len(codons):], codons, context, seed_codons))
+                break
+            window_deadline = self.__window_deadline(len(residues) - len(codons), self.n_codons_in_scope)
+            window_template = self.__template_slice(template, len(codons), len(codons) + len(window))
+            window_codons = self.__find_codons(window, codons, selected_RBS, len_peptide, context, seed_codons, deadline=window_deadline, template=window_template)
+            self.fallback_windows += not self.last_accepted
             codons.extend(window_codons)
+            context.commit(window_codons)
+            seed_codons = self.last_lookahead if carry else []
 
         return selected_RBS, codons
+
+    @staticmethod
+    def __template_slice(template, start: int, end: int):
+        # The template codons of one window, or None when it has none there
+        if template is None:
+            return None
+        window_template = list(template[start:end])
+        return window_template if any(window_template) else None
+
+    def __check_stop(self):
+        if self.should_stop is not None and self.should_stop():
+            raise DesignCancelled("Design cancelled by the stop hook.")
+
+    def __reserve(self, remaining: int) -> float:
+        # Time kept back to encode `remaining` residues in one draw if the search runs out of time
+        return remaining * self.fill_seconds_per_residue
+
+    def __past_deadline(self, remaining: int) -> bool:
+        return self.deadline is not None and time.perf_counter() + self.__reserve(remaining) >= self.deadline
+
+    def __fill(self, residues: str, codons: list[str], context, seed_codons: list[str]) -> list[str]:
+        """
+        Encodes the remaining residues in one unchecked draw after the deadline, keeping the already
+        checked seed codons.
+        """
+        self.timed_out = True
+        self.profiler.count('deadline.filled_codons', len(residues))
+        seed_codons = list(seed_codons[:len(residues)])
+        if len(seed_codons) == len(residues):
+            return seed_codons
+        start = time.perf_counter()
+        history = context.tail(self.constrained_sampler.automaton.max_site_length) + ''.join(seed_codons)
+        filled = seed_codons + self.__montecarlo(residues[len(seed_codons):], codons or seed_codons, history)
+        # Keep the reserve in line with the measured cost
+        measured = (time.perf_counter() - start) / len(residues)
+        self.fill_seconds_per_residue = 0.5 * self.fill_seconds_per_residue + 0.5 * measured
+        return filled
+
+    def __window_deadline(self, remaining: int, n_in_scope: int):
+        """
+        Returns the time the next window should finish by: an even share of the time left over the
+        windows needed for the `remaining` residues. None without a run deadline.
+        """
+        if self.deadline is None:
+            return None
+        now = time.perf_counter()
+        windows_left = max(1, math.ceil(remaining / max(1, n_in_scope)))
+        return now + max(0.0, self.deadline - self.__reserve(remaining) - now) / windows_left
     
-    def __find_codons(self, window, codons, selectedRBS, len_peptide):
+    def __find_codons(self, window, codons, selectedRBS, len_peptide, context=None, seed_codons=(), n_in_scope=None, deadline=None, template=None):
+            """
+            Samples and checks candidates for one window and returns its in-scope codons. The lookahead
+            codons of an accepted candidate are kept in self.last_lookahead (empty if no candidate passed).
+
+            When seed_codons are given (the accepted lookahead of the previous window), the first
+            proposal keeps all of them and only samples the residues after them. Each rejection keeps
+            n_codons_in_scope fewer seed codons, until candidates are sampled from scratch.
+
+            n_in_scope overrides n_codons_in_scope for windows sized by the WindowPlanner.
+
+            With targeted_repair, a rejected candidate is located with CheckSequence.violating_codons and
+            the next proposal resamples only the codons overlapping a violation, keeping the rest. After
+            max_repairs repairs in a row, or when every codon is implicated, the candidate is resampled
+            as usual.
+
+            `deadline` (a time.perf_counter() value) stops the retries once at least one candidate has
+            been checked.
+
+            With a window_cache, the codons accepted for the same window after the same last
+            cache_context nucleotides are the first proposal; a passing one costs a single check.
+            Accepted candidates are stored in the cache.
+
+            `template` (a codon or None per window residue) takes precedence over both: the first
+            proposal keeps its codons and samples only the residues it leaves open.
+            """
+            if n_in_scope is None:
+                n_in_scope = self.n_codons_in_scope
+            cache_tail = None
+            cached = None
+            if self.window_cache is not None and context is not None:
+                cache_tail = context.tail(self.cache_context)
+                cached = self.window_cache.get(window, cache_tail, self.cache_constraints)
+            seed_codons = list(seed_codons[:len(window)])
             good_seq = False
             generated_codons = []
             attempts = 0
             max_attempts = 100  # Limit attempts to prevent infinite loop
-            best_codon_score = 0
+            best_key = (False, float('-inf'))  # (passes the codon check, score) of the best rejected candidate
             best_generated_codons = []
+            # Bases the window's codons follow, for junction-aware sampling
+            history = context.tail(self.constrained_sampler.automaton.max_site_length) if context is not None else ''
+            repair = []  # Codon indices of the rejected candidate to resample
+            repairs = 0
 
             while not good_seq and attempts < max_attempts:
+                if attempts and deadline is not None and time.perf_counter() >= deadline:
+                    self.profiler.count('deadline.truncated_windows')
+                    break
                 # Generate
                 # 3 (in scope) + n_ahead
-                generated_codons = self.__montecarlo(window, codons)
+                with self.profiler.stage('sampling'):
+                    keep = len(seed_codons) - attempts * self.n_codons_in_scope
+                    if template is not None and not attempts:
+                        open_positions = [i for i, codon in enumerate(template) if codon is None]
+                        generated_codons = self.__repair(window, [codon or '' for codon in template], open_positions, codons, history)
+                        self.profiler.count('warm_start.reused_codons', len(window) - len(open_positions))
+                    elif cached is not None and not attempts:
+                        generated_codons = cached
+                    elif repair:
+                        generated_codons = self.__repair(window, generated_codons, repair, codons, history)
+                        self.profiler.count('repair.codons', len(repair))
+                    elif keep > 0:
+                        prefix = seed_codons[:keep]
+                        generated_codons = prefix + self.__montecarlo(window[keep:], codons, history + ''.join(prefix)) if keep < len(window) else prefix
+                        self.profiler.count('lookahead.reused_codons', keep)
+                    else:
+                        generated_codons = self.__montecarlo(window, codons, history)
 
                 # Check
-                good_seq, score = self.checker.run(generated_codons, codons, selectedRBS, len_peptide)
+                with self.profiler.stage('checking'):
+                    good_seq, score = self.checker.run(generated_codons, codons, selectedRBS, len_peptide, short_circuit=self.short_circuit_checks, context=context)
 
                 # Compare
+                if template is not None and not attempts:
+                    self.profiler.count('warm_start.accepted' if good_seq else 'warm_start.rejected')
+                elif cached is not None and not attempts:
+                    self.profiler.count('window_cache.accepted' if good_seq else 'window_cache.rejected')
                 if good_seq:
                     break
-                elif score > best_codon_score:
-                    best_codon_score = score
+                # A fallback over the rare codon budget would fail the codon check of every later
+                # window, so candidates that pass it are preferred
+                codons_pass = context is None or self.checker.check_context_codons(context, generated_codons, len_peptide)[0]
+                if (codons_pass, score) > best_key:
+                    best_key = (codons_pass, score)
                     best_generated_codons = generated_codons
 
                 attempts += 1
 
+                # Locate the violations so the next proposal only resamples the codons involved
+                repair = []
+                if self.targeted_repair and context is not None and repairs < self.max_repairs:
+                    with self.profiler.stage('locating'):
+                        repair = self.checker.violating_codons(generated_codons, context, len_peptide)
+                    if len(repair) == len(generated_codons):
+                        repair = []
+                repairs = repairs + 1 if repair else 0
+
+            self.last_attempts = attempts + 1 if good_seq else attempts
+            self.last_accepted = good_seq
+            self.profiler.record_window(self.last_attempts, good_seq)
+
+            if good_seq and cache_tail is not None:
+                self.window_cache.put(window, cache_tail, self.cache_constraints, generated_codons)
             if not good_seq:
                 generated_codons = best_generated_codons
                 # print(f'No valid window sequence found after {max_attempts}. Returning best codons.')
 
-            return generated_codons[:self.n_codons_in_scope]
+            self.last_lookahead = generated_codons[n_in_scope:] if good_seq else []
+            return generated_codons[:n_in_scope]
 
-    def __montecarlo(self, window: str, last_n_codons: list[str]) -> list[str]:
+    def __repair(self, window: str, generated_codons: list[str], positions: list[int], codons: list[str], history: str) -> list[str]:
+        """
+        Returns a copy of generated_codons with the codons at `positions` resampled. Each run of
+        consecutive positions is drawn in one go after the bases that precede it, so constrained
+        sampling keeps the run's own junctions free of forbidden sites.
+        """
+        repaired = list(generated_codons)
+        runs = []
+        for i in positions:
+            if runs and runs[-1][1] == i:
+                runs[-1][1] = i + 1
+            else:
+                runs.append([i, i + 1])
+        for start, end in runs:
+            repaired[start:end] = self.__montecarlo(window[start:end], codons or repaired[:start], history + ''.join(repaired[:start]))
+        return repaired
+
+    def __montecarlo(self, window: str, last_n_codons: list[str], history: str = '') -> list[str]:
         """
         Description:
         Generates a sequence of codons based on a window of amino acids and checks if the generated codons form a valid sequence using a sequence checker. 
         The function repeatedly generates codons until a valid sequence is found.
+
+        With constrained_sampling the codons are drawn so that, following `history`, they contain no
+        forbidden site. If no such encoding exists the codons are sampled independently instead.
         """
 
         # Ensure the window is not empty
@@ -92,14 +366,26 @@ class MonteCarlo():
         
         # Handle special cases for the first codon if at the start of the sequence
         special_first_codon = None
-        if not last_n_codons:
-            first_amino_acid = window[0]
+        first_amino_acid = window[0]
+        if not last_n_codons and self.segment_offset == 0:
             special_codons = {'V': 'GTG', 'L': 'TTG', 'M': 'ATG'}
             special_first_codon = special_codons.get(first_amino_acid)
 
+        if special_first_codon:
             # Exclude the first amino acid since it's handled
             window = window[1:]
 
+        if self.constrained_sampling:
+            with self.profiler.stage('sampling.constrained'):
+                constrained = self.constrained_sampler.run(
+                    window if not special_first_codon else first_amino_acid + window,
+                    history,
+                    fixed_first=special_first_codon,
+                )
+            if constrained is not None:
+                return constrained
+            self.profiler.count('sampling.unconstrained_fallback')
+
         # Generate
         generated_codons = [self.sampler.run(amino_acid) for amino_acid in window]
 
@@ -0,0 +1,300 @@
+import math
+from dataclasses import dataclass
+from typing import Optional
+from genedesign.checkers import hairpin_checker as hairpin
+from genedesign.checkers.gc_content_checker import GC_LOWER_BOUND, GC_UPPER_BOUND
+from genedesign.checkers.codon_checker import CodonChecker
+from genedesign.checkers.rnase_e_checker import RNaseEChecker
+from genedesign.checkers.internal_promoter_checker import PromoterChecker
+
+@dataclass
+class Measurements:
+    """
+    The raw quantities an Objective scores. Every field is optional: a backend fills in what it has
+    measured and terms whose quantity is missing contribute nothing.
+
+    Attributes:
+        checks_passed (int | None): Number of hard checks that passed.
+        checks_total (int | None): Number of hard checks evaluated (or that would have been).
+        cai (float | None): Codon Adaptation Index of the codons scored so far.
+        hairpin_counts (tuple[int, ...] | None): Hairpin count of every 50 bp chunk.
+        hairpin_excess (int | None): Hairpins beyond MAX_HAIRPINS summed over the chunks, for backends
+            that keep the running total instead of the per-chunk counts.
+        promoter_max_score (float | None): Highest promoter PWM window score on either strand.
+        promoter_excess (float | None): Summed excess of every promoter window on either strand over
+            the 'promoter_excess' term's floor (threshold - margin).
+        gc_content (float | None): GC fraction of the scored sequence.
+        rnase_sites (int | None): Number of predicted RNase E cleavage sites.
+        length (int | None): Length in nucleotides of the sequence the sites were counted in.
+    """
+    checks_passed: Optional[int] = None
+    checks_total: Optional[int] = None
+    cai: Optional[float] = None
+    hairpin_counts: Optional[tuple] = None
+    hairpin_excess: Optional[int] = None
+    promoter_max_score: Optional[float] = None
+    promoter_excess: Optional[float] = None
+    gc_content: Optional[float] = None
+    rnase_sites: Optional[int] = None
+    length: Optional[int] = None
+
+class ObjectiveTerm:
+    """
+    One weighted component of an Objective. Subclasses implement `value`, which returns the term's
+    unweighted contribution (higher is better, so penalties are zero or negative) or None when the
+    quantity it needs was not measured.
+    """
+
+    name = None
+
+    def __init__(self, weight: float = 1.0):
+        self.weight = weight
+
+    def value(self, m: Measurements) -> Optional[float]:
+        raise NotImplementedError
+
+class PassFractionTerm(ObjectiveTerm):
+    """
+    Fraction of hard checks passed, the score the search backends used before graded penalties.
+    """
+
+    name = 'pass_fraction'
+
+    def value(self, m):
+        if not m.checks_total:
+            return None
+        return m.checks_passed / m.checks_total
+
+class CAITerm(ObjectiveTerm):
+    """
+    Codon Adaptation Index, already in [0, 1].
+    """
+
+    name = 'cai'
+
+    def value(self, m):
+        return m.cai
+
+class HairpinTerm(ObjectiveTerm):
+    """
+    Penalises every hairpin beyond MAX_HAIRPINS in each chunk, so a chunk with three hairpins costs
+    more than one with two instead of both simply failing.
+    """
+
+    name = 'hairpin'
+
+    def value(self, m):
+        if m.hairpin_counts is not None:
+            return -float(sum(max(0, count - hairpin.MAX_HAIRPINS) for count in m.hairpin_counts))
+        if m.hairpin_excess is not None:
+            return -float(m.hairpin_excess)
+        return None
+
+class PromoterTerm(ObjectiveTerm):
+    """
+    Penalises the best promoter window by how far it comes within `margin` of the detection
+    threshold. Windows well below the threshold cost nothing; the penalty grows linearly (in PWM bits)
+    as a window approaches and crosses it.
+    """
+
+    name = 'promoter'
+
+    def __init__(self, weight: float = 1.0, margin: float = 2.0):
+        super().__init__(weight)
+        self.margin = margin
+        self.threshold = PromoterChecker.threshold
+
+    def value(self, m):
+        if m.promoter_max_score is None:
+            return None
+        return -max(0.0, m.promoter_max_score - (self.threshold - self.margin))
+
+class PromoterExcessTerm(PromoterTerm):
+    """
+    Penalises every promoter window by how far it comes within `margin` of the detection threshold,
+    summed over the windows. Unlike PromoterTerm's best window, the sum is additive over positions, so
+    the whole-transcript refiner can update it per codon swap; the measuring backend applies the margin.
+    """
+
+    name = 'promoter_excess'
+
+    def value(self, m):
+        if m.promoter_excess is None:
+            return None
+        return -m.promoter_excess
+
+class GCTerm(ObjectiveTerm):
+    """
+    Penalises GC content by its distance outside [GC_LOWER_BOUND, GC_UPPER_BOUND], in units of 10%.
+    """
+
+    name = 'gc'
+
+    def value(self, m):
+        if m.gc_content is None:
+            return None
+        deviation = max(GC_LOWER_BOUND - m.gc_content, m.gc_content - GC_UPPER_BOUND, 0.0)
+        return -deviation * 10
+
+class RNaseTerm(ObjectiveTerm):
+    """
+    Penalises predicted RNase E cleavage sites per nucleotide.
+    """
+
+    name = 'rnase'
+
+    def value(self, m):
+        if m.rnase_sites is None or not m.length:
+            return None
+        return -m.rnase_sites / m.length
+
+# Weights used when an Objective is created without explicit terms. The pass fraction, CAI and RNase
+# weights reproduce the original CheckSequence score; the graded penalties break ties between
+# candidates that fail the same number of checks.
+DEFAULT_WEIGHTS = {
+    'pass_fraction': 1.0,
+    'cai': 1.0,
+    'hairpin': 0.25,
+    'promoter': 0.1,
+    'promoter_excess': 0.1,
+    'gc': 0.5,
+    'rnase': 1.0,
+}
+
+TERM_TYPES = {term.name: term for term in (PassFractionTerm, CAITerm, HairpinTerm, PromoterTerm, PromoterExcessTerm, GCTerm, RNaseTerm)}
+
+class Objective:
+    """
+    A weighted sum of ObjectiveTerms shared by every search backend, so MonteCarlo, BeamSearch and any
+    later optimizer rank candidates the same way. Higher scores are better.
+
+    Usage:
+        objective = Objective()
+        objective.initiate()                      # default terms and weights
+        objective.set_weight('hairpin', 1.0)
+        score = objective.score(Measurements(cai=0.7, gc_content=0.45))
+
+    For sequences that grow one codon at a time, `new_state` returns an ObjectiveState that keeps
+    running totals (CAI log-sum, GC count, RNase site count) so each extension costs time proportional
+    to the codons added rather than to the whole sequence.
+    """
+
+    def __init__(self, terms: Optional[list] = None):
+        self.terms = terms
+        self.codon_checker = None
+        self.rnase_checker = None
+
+    def initiate(self) -> None:
+        if self.terms is None:
+            self.terms = [TERM_TYPES[name](weight) for name, weight in DEFAULT_WEIGHTS.items()]
+        self.codon_checker = CodonChecker()
+        self.codon_checker.initiate()
+        self.rnase_checker = RNaseEChecker()
+        self.rnase_checker.initiate()
+
+    @property
+    def weights(self) -> dict:
+        return {term.name: term.weight for term in self.terms}
+
+    def term(self, name: str) -> ObjectiveTerm:
+        term = self.find_term(name)
+        if term is None:
+            raise KeyError(f"No objective term named '{name}'")
+        return term
+
+    def find_term(self, name: str) -> Optional[ObjectiveTerm]:
+        """
+        Returns the term with the given name, or None when the objective has no such term.
+        """
+        for term in self.terms:
+            if term.name == name:
+                return term
+        return None
+
+    def set_weight(self, name: str, weight: float) -> None:
+        self.term(name).weight = weight
+
+    def add_term(self, term: ObjectiveTerm) -> None:
+        """
+        Adds a custom term, replacing any existing term with the same name.
+        """
+        self.terms = [existing for existing in self.terms if existing.name != term.name]
+        self.terms.append(term)
+
+    def breakdown(self, m: Measurements) -> dict:
+        """
+        Returns the weighted contribution of every term that could be evaluated.
+        """
+        contributions = {}
+        for term in self.terms:
+            if term.weight == 0:
+                continue
+            value = term.value(m)
+            if value is not None:
+                contributions[term.name] = term.weight * value
+        return contributions
+
+    def score(self, m: Measurements) -> float:
+        return sum(self.breakdown(m).values())
+
+    def new_state(self) -> 'ObjectiveState':
+        return ObjectiveState(self)
+
+class ObjectiveState:
+    """
+    Running totals for a codon sequence that is extended incrementally, as in beam search.
+
+    Attributes:
+        log_cai_sum (float): Sum of log codon frequencies (CAI is exp of its mean).
+        n_codons (int): Number of codons added.
+        gc_count (int): Number of G and C bases.
+        rnase_sites (int): RNase E sites found so far.
+        seq (str): The concatenated sequence.
+    """
+
+    __slots__ = ('objective', 'log_cai_sum', 'n_codons', 'gc_count', 'rnase_sites', 'seq')
+
+    def __init__(self, objective: Objective):
+        self.objective = objective
+        self.log_cai_sum = 0.0
+        self.n_codons = 0
+        self.gc_count = 0
+        self.rnase_sites = 0
+        self.seq = ''
+
+    def copy(self) -> 'ObjectiveState':
+        state = ObjectiveState.__new__(ObjectiveState)
+        state.objective = self.objective
+        state.log_cai_sum = self.log_cai_sum
+        state.n_codons = self.n_codons
+        state.gc_count = self.gc_count
+        state.rnase_sites = self.rnase_sites
+        state.seq = self.seq
+        return state
+
+    def extend(self, codons: list[str]) -> 'ObjectiveState':
+        """
+        Appends codons and updates the totals using only the new bases. Returns self for chaining.
+        """
+        frequencies = self.objective.codon_checker.codon_frequencies
+        added = ''.join(codons).upper()
+        for codon in codons:
+            self.log_cai_sum += math.log(frequencies.get(codon, 0.01))
+        self.n_codons += len(codons)
+        self.gc_count += added.count('G') + added.count('C')
+        start = len(self.seq)
+        self.seq += added
+        self.rnase_sites += self.objective.rnase_checker.count(self.seq, start)
+        return self
+
+    def measurements(self) -> Measurements:
+        length = len(self.seq)
+        return Measurements(
+            cai=math.exp(self.log_cai_sum / self.n_codons) if self.n_codons else None,
+            gc_content=self.gc_count / length if length else None,
+            rnase_sites=self.rnase_sites,
+            length=length,
+        )
+
+    def score(self) -> float:
+        return self.objective.score(self.measurements())
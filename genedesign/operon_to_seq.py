@@ -1,10 +1,43 @@
-from models.operon import Operon
-from transcript_to_seq import transcript_to_seq
+from typing import Iterator, TextIO
+from genedesign.models.operon import Operon
+from genedesign.transcript_to_seq import transcript_parts, transcript_length
+
+def operon_parts(operon: Operon) -> Iterator[str]:
+    """
+    Yields the pieces of a construct's DNA sequence in order: promoter, the RBS and CDS of each mRNA,
+    and terminator. Nothing is concatenated, so the pieces can be written straight into one output.
+    """
+    yield operon.promoter
+    for mrna in operon.transcripts:
+        yield from transcript_parts(mrna)
+    yield operon.terminator
+
+def operon_length(operon: Operon) -> int:
+    """
+    Returns the length of the construct's DNA sequence without building it.
+    """
+    return len(operon.promoter) + sum(transcript_length(mrna) for mrna in operon.transcripts) + len(operon.terminator)
+
+def write_operon(operon: Operon, out: TextIO) -> int:
+    """
+    Writes the construct's DNA sequence piece by piece to a text stream.
+
+    Returns:
+        int: The number of bases written.
+    """
+    written = 0
+    for part in operon_parts(operon):
+        out.write(part)
+        written += len(part)
+    return written
 
 def operon_to_seq(operon: Operon) -> str:
     """
     Converts a Construct object into its full DNA sequence by concatenating the promoter,
     the sequences of the mRNAs, and the terminator.
+
+    The pieces are joined in a single pass, which sizes the result once and copies each piece
+    into it directly instead of building an intermediate string per mRNA.
     
     Parameters:
         operon (Operon): The construct object containing mRNAs, promoter, and terminator.
@@ -12,14 +45,4 @@ def operon_to_seq(operon: Operon) -> str:
     Returns:
         str: The full DNA sequence of the construct.
     """
-    # Start with the promoter
-    out = [operon.promoter]
-    
-    # Append the sequence of each mRNA by calling transcript_to_seq on each one
-    out.extend(transcript_to_seq(mrna) for mrna in operon.transcripts)
-    
-    # Finally, append the terminator
-    out.append(operon.terminator)
-    
-    # Join the list into a single string and return
-    return ''.join(out)
+    return ''.join(operon_parts(operon))
@@ -0,0 +1,153 @@
+import datetime
+from typing import Iterable, Iterator, TextIO
+from genedesign.models.operon import Operon
+from genedesign.operon_to_seq import operon_parts, operon_length
+from genedesign.transcript_to_seq import transcript_length
+
+FASTA_LINE_WIDTH = 80
+GENBANK_LINE_WIDTH = 60  # Bases per ORIGIN line, in blocks of 10
+QUALIFIER_INDENT = ' ' * 21
+QUALIFIER_WIDTH = 79
+
+def iter_chunks(parts: Iterable[str], size: int) -> Iterator[str]:
+    """
+    Regroups a stream of sequence pieces into chunks of exactly `size` characters (the last chunk
+    may be shorter). Only the characters that straddle a chunk boundary are copied into a new string.
+    """
+    pending = []
+    pending_length = 0
+    for part in parts:
+        start = 0
+        while start < len(part):
+            take = min(size - pending_length, len(part) - start)
+            if take == size:
+                yield part[start:start + take]
+            else:
+                pending.append(part[start:start + take])
+                pending_length += take
+                if pending_length == size:
+                    yield ''.join(pending)
+                    pending = []
+                    pending_length = 0
+            start += take
+    if pending:
+        yield ''.join(pending)
+
+def _open(handle, mode='w'):
+    """
+    Returns (stream, should_close) for a path or an already open text stream.
+    """
+    if isinstance(handle, str):
+        return open(handle, mode), True
+    return handle, False
+
+def write_fasta(records: Iterable[tuple[str, Operon]], handle, line_width: int = FASTA_LINE_WIDTH) -> int:
+    """
+    Streams constructs to a FASTA file. Each construct is written directly from its promoter, RBS,
+    CDS and terminator pieces, without assembling the full sequence in memory.
+
+    Parameters:
+        records: (name, Operon) pairs, for example from a generator over a batch of designs.
+        handle: A file path or an open text stream.
+        line_width (int): Bases per sequence line.
+
+    Returns:
+        int: The number of records written.
+    """
+    out, should_close = _open(handle)
+    try:
+        count = 0
+        for name, operon in records:
+            out.write(f">{name}\n")
+            for line in iter_chunks(operon_parts(operon), line_width):
+                out.write(line)
+                out.write('\n')
+            count += 1
+        return count
+    finally:
+        if should_close:
+            out.close()
+
+def operon_features(operon: Operon) -> list[tuple[str, int, int, dict]]:
+    """
+    Lists the annotated parts of a construct as (feature key, start, end, qualifiers) with 1-based
+    inclusive coordinates, computed from part lengths alone.
+    """
+    features = []
+    position = 0
+
+    def add(key, length, qualifiers):
+        nonlocal position
+        if length:
+            features.append((key, position + 1, position + length, qualifiers))
+        position += length
+
+    add('promoter', len(operon.promoter), {'label': 'promoter'})
+    for index, mrna in enumerate(operon.transcripts, start=1):
+        utr_length = len(mrna.rbs.utr)
+        add("5'UTR", utr_length, {'label': f"RBS {mrna.rbs.gene_name}"})
+        add('CDS', transcript_length(mrna) - utr_length, {
+            'label': f"CDS {index}",
+            'codon_start': 1,
+            'translation': mrna.peptide,
+        })
+    add('terminator', len(operon.terminator), {'label': 'terminator'})
+    return features
+
+def _qualifier_lines(name, value) -> Iterator[str]:
+    text = f'/{name}={value}' if isinstance(value, int) else f'/{name}="{value}"'
+    width = QUALIFIER_WIDTH - len(QUALIFIER_INDENT)
+    for start in range(0, len(text), width):
+        yield QUALIFIER_INDENT + text[start:start + width]
+
+def write_genbank_record(name: str, operon: Operon, out: TextIO, date: str = None) -> None:
+    """
+    Writes one construct as a GenBank record. The header and features are computed from part lengths,
+    and the ORIGIN section is streamed from the construct's pieces.
+    """
+    length = operon_length(operon)
+    if date is None:
+        date = datetime.date.today().strftime('%d-%b-%Y').upper()
+    locus = name.replace(' ', '_')[:16]
+
+    out.write(f"LOCUS       {locus:<16} {length:>11} bp    DNA     linear   SYN {date}\n")
+    out.write(f"DEFINITION  {name}\n")
+    out.write(f"ACCESSION   {locus}\n")
+    out.write("FEATURES             Location/Qualifiers\n")
+    for key, start, end, qualifiers in operon_features(operon):
+        out.write(f"     {key:<16}{start}..{end}\n")
+        for qualifier, value in qualifiers.items():
+            for line in _qualifier_lines(qualifier, value):
+                out.write(line + '\n')
+
+    out.write("ORIGIN\n")
+    position = 1
+    for line in iter_chunks(operon_parts(operon), GENBANK_LINE_WIDTH):
+        line = line.lower()
+        blocks = ' '.join(line[i:i + 10] for i in range(0, len(line), 10))
+        out.write(f"{position:>9} {blocks}\n")
+        position += len(line)
+    out.write("//\n")
+
+def write_genbank(records: Iterable[tuple[str, Operon]], handle, date: str = None) -> int:
+    """
+    Streams constructs to a GenBank file, one record per construct.
+
+    Parameters:
+        records: (name, Operon) pairs.
+        handle: A file path or an open text stream.
+        date (str): The LOCUS date (DD-MON-YYYY). Defaults to today.
+
+    Returns:
+        int: The number of records written.
+    """
+    out, should_close = _open(handle)
+    try:
+        count = 0
+        for name, operon in records:
+            write_genbank_record(name, operon, out, date)
+            count += 1
+        return count
+    finally:
+        if should_close:
+            out.close()
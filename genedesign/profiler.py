@@ -0,0 +1,167 @@
+import time
+
+class _NullStage:
+    """
+    A reusable no-op context manager returned by a disabled Profiler.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+class _Stage:
+    """
+    Times one entry into a named stage and adds it to the owning Profiler.
+    """
+
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+class Profiler:
+    """
+    Collects lightweight performance counters across the design pipeline: wall time and call count
+    per stage, Monte Carlo attempts per window, and pass rates per checker.
+
+    A disabled profiler (the default) returns immediately from every hook, and `stage` hands back a
+    shared no-op context manager, so instrumented code pays one attribute lookup and one call.
+
+    Usage:
+        profiler = Profiler(enabled=True)
+        with profiler.stage('checking'):
+            ...
+        profiler.record_check('forbidden', passed)
+        print(profiler.report())
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Clears all collected counters.
+        """
+        self.stage_times = {}       # {stage: total seconds}
+        self.stage_calls = {}       # {stage: number of entries}
+        self.counters = {}          # {name: count}
+        self.window_attempts = {}   # {attempts needed: number of windows}
+        self.windows_accepted = 0
+        self.windows_fallback = 0
+        self.check_calls = {}       # {checker: calls}
+        self.check_passes = {}      # {checker: passes}
+
+    def stage(self, name: str):
+        """
+        Returns a context manager that times the enclosed block under the given stage name.
+        """
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """
+        Adds an externally measured duration to a stage.
+        """
+        if not self.enabled:
+            return
+        self.stage_times[name] = self.stage_times.get(name, 0.0) + seconds
+        self.stage_calls[name] = self.stage_calls.get(name, 0) + 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        if not self.enabled:
+            return
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def record_window(self, attempts: int, accepted: bool) -> None:
+        """
+        Records how many candidates a Monte Carlo window sampled and whether one passed every check.
+        """
+        if not self.enabled:
+            return
+        self.window_attempts[attempts] = self.window_attempts.get(attempts, 0) + 1
+        if accepted:
+            self.windows_accepted += 1
+        else:
+            self.windows_fallback += 1
+
+    def record_check(self, name: str, passed: bool) -> None:
+        if not self.enabled:
+            return
+        self.check_calls[name] = self.check_calls.get(name, 0) + 1
+        if passed:
+            self.check_passes[name] = self.check_passes.get(name, 0) + 1
+
+    def summary(self) -> dict:
+        """
+        Returns the collected counters as a plain dictionary.
+        """
+        total_windows = self.windows_accepted + self.windows_fallback
+        total_attempts = sum(attempts * n for attempts, n in self.window_attempts.items())
+        return {
+            'stages': {
+                name: {
+                    'seconds': self.stage_times[name],
+                    'calls': self.stage_calls[name],
+                    'mean_seconds': self.stage_times[name] / self.stage_calls[name],
+                }
+                for name in self.stage_times
+            },
+            'counters': dict(self.counters),
+            'windows': {
+                'total': total_windows,
+                'accepted': self.windows_accepted,
+                'fallback': self.windows_fallback,
+                'attempts': total_attempts,
+                'mean_attempts': total_attempts / total_windows if total_windows else 0.0,
+                'attempt_histogram': dict(sorted(self.window_attempts.items())),
+            },
+            'checks': {
+                name: {
+                    'calls': calls,
+                    'passes': self.check_passes.get(name, 0),
+                    'acceptance_rate': self.check_passes.get(name, 0) / calls,
+                }
+                for name, calls in self.check_calls.items()
+            },
+        }
+
+    def report(self) -> str:
+        """
+        Formats the summary as a human-readable text report.
+        """
+        summary = self.summary()
+        lines = ["Stage timings:"]
+        for name, stage in sorted(summary['stages'].items(), key=lambda x: x[1]['seconds'], reverse=True):
+            lines.append(f"- {name}: {stage['seconds']:.3f} s over {stage['calls']} calls "
+                         f"({stage['mean_seconds'] * 1e6:.1f} us/call)")
+
+        windows = summary['windows']
+        lines.append("\nMonte Carlo windows:")
+        lines.append(f"- Windows: {windows['total']} ({windows['accepted']} accepted, {windows['fallback']} fell back to best)")
+        lines.append(f"- Attempts: {windows['attempts']} ({windows['mean_attempts']:.2f} per window)")
+
+        lines.append("\nChecker acceptance:")
+        for name, check in sorted(summary['checks'].items()):
+            lines.append(f"- {name}: {check['passes']}/{check['calls']} passed ({check['acceptance_rate']:.1%})")
+
+        if summary['counters']:
+            lines.append("\nCounters:")
+            for name, count in sorted(summary['counters'].items()):
+                lines.append(f"- {name}: {count}")
+        return '\n'.join(lines)
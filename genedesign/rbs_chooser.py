@@ -2,9 +2,11 @@ from genedesign.models.rbs_option import RBSOption
 from genedesign.seq_utils.calc_edit_distance import calculate_edit_distance
 from genedesign.seq_utils.hairpin_counter import non_stupid_hairpin_counter, optimized_non_stupid_hairpin_counter
 from genedesign.seq_utils.Translate import Translate
-from genedesign.seq_utils.get_top_5_percent_utr_cds import get_top_5_percent_utr_cds
-import time
-import Levenshtein
+from genedesign.seq_utils.peptide_index import PeptideIndex
+from genedesign.rbs_library import get_rbs_library
+from genedesign.models.host import Host
+from genedesign.profiler import Profiler
+import heapq
 
 class RBSChooser:
     """
@@ -13,33 +15,46 @@ class RBSChooser:
 
     def __init__(self):
         self.translator = None
-        self.rbsOptions = []
+        self.rbs_options: list[RBSOption] = []
+        self.host = Host.Ecoli  # Organism whose RBS library is used
+        self.percentile = 5.0  # Percentage of most abundant proteins whose RBSs are candidates
+        self.option_buckets = None
+        self.peptide_index = None
+        self.utr_hairpins = None
+        self._indexed_options = None
+        self.profiler = Profiler()
 
     def initiate(self) -> None:
         """
-        Initialization method for RBSChooser.
+        Initialization method for RBSChooser. Loads the shared RBS library for the chooser's host
+        and percentile, compiling it on first use.
         """
-
-        locus_file_path = "genedesign/data/511145-WHOLE_ORGANISM-integrated.txt"  # Path to the text file
-        genbank_file_path = "genedesign/data/Ecoli_sequence.gb"  # Path to the GenBank file
-
         self.translator = Translate()
         self.translator.initiate()
-        self.rbs_options: list[RBSOption] = []
 
-        top_5_percent_utr_cds = get_top_5_percent_utr_cds(locus_file_path, genbank_file_path)
+        library = get_rbs_library(self.host, self.percentile)
+        self.rbs_options = list(library.options)
+        self.index_options()
 
-        for locus_tag, data in top_5_percent_utr_cds.items():
-            gene_name = data['gene']
-            utr = data['UTR']
-            cds = data['CDS']
-
-            # Calculate the first six amino acids
-            first_six_aas = self.translator.run(cds[:18])  # First six amino acids come from the first 18 nucleotides
-
-            # Create an RBSOption and add it to the list
-            rbs_option = RBSOption(utr=utr, cds=cds, gene_name=gene_name, first_six_aas=first_six_aas)
-            self.rbs_options.append(rbs_option)
+    def index_options(self) -> None:
+        """
+        Precomputes what optimized_run needs per option: the options grouped by their first six amino
+        acids, a PeptideIndex over those prefixes, and the hairpin count of each UTR on its own.
+        Called automatically when rbs_options is replaced.
+        """
+        buckets = {}
+        self.utr_hairpins = []
+        for index, rbs_option in enumerate(self.rbs_options):
+            buckets.setdefault(rbs_option.first_six_aas, []).append(index)
+            try:
+                utr_hairpins = optimized_non_stupid_hairpin_counter(rbs_option.utr, min_stem=4, min_loop=3, max_loop=8)
+            except (ValueError, IndexError):
+                utr_hairpins = 0  # Non-ACGT or too short to hold a stem: fall back to the trivial bound
+            self.utr_hairpins.append(utr_hairpins)
+        self.option_buckets = list(buckets.items())
+        self.peptide_index = PeptideIndex()
+        self.peptide_index.initiate(first_six_aas for first_six_aas, _ in self.option_buckets)
+        self._indexed_options = self.rbs_options
 
 
     def run(self, cds: str, ignores: set[RBSOption]) -> RBSOption:
@@ -72,19 +87,15 @@ class RBSChooser:
         hairpin_weight = 0.5  # Weight for secondary structure
         peptide_weight = 0.5  # Weight for peptide similarity
 
-        total_hairpin_time = 0
-        total_similarity_time = 0
         # Step 2 and 3: Iterate through available RBSOptions
         for rbs_option in available_rbs_options:
-            hc_start = time.time()
             # Step 2: Calculate the hairpin score using hairpin_counter
-            hairpin_score = optimized_non_stupid_hairpin_counter(rbs_option.utr + cds, min_stem=4, min_loop=3, max_loop=8)
-            total_hairpin_time += time.time() - hc_start
+            with self.profiler.stage('rbs.hairpin'):
+                hairpin_score = optimized_non_stupid_hairpin_counter(rbs_option.utr + cds, min_stem=4, min_loop=3, max_loop=8)
 
-            psc_start = time.time()
             # Step 3: Calculate the peptide similarity score using calculate_edit_distance
-            peptide_similarity_score = calculate_edit_distance(input_peptide, rbs_option.first_six_aas)
-            total_similarity_time += time.time() - psc_start
+            with self.profiler.stage('rbs.similarity'):
+                peptide_similarity_score = calculate_edit_distance(input_peptide, rbs_option.first_six_aas)
 
             # Combine the scores using a weighted sum
             final_score = (float(hairpin_score) * hairpin_weight) + (float(peptide_similarity_score) * peptide_weight)
@@ -94,15 +105,23 @@ class RBSChooser:
                 best_score = final_score
                 best_rbs_option = rbs_option
 
-        print(f"    Total hairpin_counter time: {total_hairpin_time}")
-        print(f'    Total similarity time:      {total_similarity_time}')
-
         # Return the RBSOption with the lowest combined score
         return best_rbs_option
     
     def optimized_run(self, cds: str, ignores: set[RBSOption]) -> RBSOption:
         """
-        Executes the RBS selection process for the given CDS.
+        Executes the RBS selection process for the given CDS. Returns the same option as run.
+
+        The score of an option is 0.5 * hairpins(utr + cds) + 0.5 * peptide distance. Every hairpin
+        lying wholly inside the UTR or wholly inside the CDS is also a hairpin of utr + cds, so
+        0.5 * (hairpins(utr) + hairpins(cds) + distance) is a lower bound on the score.
+
+        The search is a branch and bound over that bound. The PeptideIndex returns the prefixes
+        within distance 2 of the input peptide, grouped by distance; every other prefix starts with
+        distance 3 as a bound and gets its exact distance only if it reaches the front of the queue.
+        Options are popped in order of increasing bound, and the search stops once the bound cannot
+        beat the best score, skipping the full hairpin count for every remaining option. Ties are
+        broken by list order, as in a full scan.
 
         Parameters:
         - cds (str): The coding sequence to pair with an RBS.
@@ -110,43 +129,77 @@ class RBSChooser:
 
         Returns:
         - RBSOption: The selected RBSOption that best pairs with the given CDS.
-        """
-        # Exclude ignored RBSOptions
-        available_rbs_options = [
-            rbs_option for rbs_option in self.rbs_options if rbs_option not in ignores
-        ]
 
-        if not available_rbs_options:
-            raise ValueError("No valid RBS options available after filtering.")
+        Raises:
+        - ValueError: If no valid RBS options remain after filtering.
+        """
+        if self._indexed_options is not self.rbs_options:
+            self.index_options()
 
         input_peptide = self.translator.run(cds[:18])  # First six amino acids
 
         hairpin_weight = 0.5
         peptide_weight = 0.5
 
+        with self.profiler.stage('rbs.similarity'):
+            cds_hairpins = optimized_non_stupid_hairpin_counter(cds, min_stem=4, min_loop=3, max_loop=8)
+
+            # Exact distances for the nearby prefix buckets, a bound for all others
+            far_distance = self.peptide_index.max_distance + 1
+            bucket_distances = [far_distance] * len(self.option_buckets)
+            exact = [False] * len(self.option_buckets)
+            for distance, bucket_ids in self.peptide_index.query(input_peptide).items():
+                for bucket_id in bucket_ids:
+                    bucket_distances[bucket_id] = distance
+                    exact[bucket_id] = True
+
+            queue = []
+            for bucket_id, (_, indices) in enumerate(self.option_buckets):
+                distance_bound = bucket_distances[bucket_id] * peptide_weight
+                for index in indices:
+                    lower_bound = ((self.utr_hairpins[index] + cds_hairpins) * hairpin_weight) + distance_bound
+                    queue.append((lower_bound, index, bucket_id))
+            heapq.heapify(queue)
+
         best_score = float('inf')
-        best_rbs_option = None
+        best_index = None
+
+        while queue:
+            lower_bound, index, bucket_id = heapq.heappop(queue)
+            if lower_bound > best_score or (lower_bound == best_score and index > best_index):
+                break  # No remaining option can beat the best, and ties go to the earlier option
+
+            rbs_option = self.rbs_options[index]
+            if rbs_option in ignores:
+                continue
+
+            if not exact[bucket_id]:
+                # First time a far bucket reaches the front: compute its exact distance
+                bucket_distances[bucket_id] = self.peptide_index.distance(input_peptide, bucket_id)
+                exact[bucket_id] = True
+            refined = ((self.utr_hairpins[index] + cds_hairpins) * hairpin_weight) + (bucket_distances[bucket_id] * peptide_weight)
+            if refined > lower_bound:
+                heapq.heappush(queue, (refined, index, bucket_id))  # Bound went up; wait for its turn
+                continue
 
-        for rbs_option in available_rbs_options:
             # Hairpin score
-            hairpin_score = optimized_non_stupid_hairpin_counter(
-                rbs_option.utr + cds, min_stem=4, min_loop=3, max_loop=8
-            )
-
-            # Peptide similarity score
-            peptide_similarity_score = Levenshtein.distance(
-                input_peptide, rbs_option.first_six_aas
-            )
+            with self.profiler.stage('rbs.hairpin'):
+                hairpin_score = optimized_non_stupid_hairpin_counter(
+                    rbs_option.utr + cds, min_stem=4, min_loop=3, max_loop=8
+                )
 
             # Final weighted score
-            final_score = (hairpin_score * hairpin_weight) + (peptide_similarity_score * peptide_weight)
+            final_score = (hairpin_score * hairpin_weight) + (bucket_distances[bucket_id] * peptide_weight)
 
             # Update the best option
-            if final_score < best_score:
+            if final_score < best_score or (final_score == best_score and index < best_index):
                 best_score = final_score
-                best_rbs_option = rbs_option
+                best_index = index
 
-        return best_rbs_option
+        if best_index is None:
+            raise ValueError("No valid RBS options available after filtering.")
+
+        return self.rbs_options[best_index]
 
 if __name__ == "__main__":
     # Example usage of RBSChooser
@@ -0,0 +1,140 @@
+import csv
+import os
+from genedesign.models.host import Host
+from genedesign.models.rbs_option import RBSOption
+from genedesign.seq_utils.Translate import Translate
+from genedesign.seq_utils.get_top_5_percent_utr_cds import get_top_percent_utr_cds
+
+LIBRARY_VERSION = 1
+LIBRARY_DIR = "genedesign/data"
+
+# Abundance and genome files per host. Hosts without an entry have no RBS library yet;
+# register_rbs_library_source adds one.
+RBS_LIBRARY_SOURCES = {
+    Host.Ecoli: {
+        'abundance': "genedesign/data/511145-WHOLE_ORGANISM-integrated.txt",
+        'genbank': "genedesign/data/Ecoli_sequence.gb",
+    },
+}
+
+_libraries = {}  # {(Host, percentile): RBSLibrary}, filled on first use
+
+def register_rbs_library_source(host: Host, abundance_file: str, genbank_file: str) -> None:
+    """
+    Registers (or replaces) the protein abundance and GenBank files used to build a host's RBS library.
+    """
+    RBS_LIBRARY_SOURCES[host] = {'abundance': abundance_file, 'genbank': genbank_file}
+    for key in [key for key in _libraries if key[0] == host]:
+        del _libraries[key]
+
+def _as_host(host) -> Host:
+    if isinstance(host, Host):
+        return host
+    try:
+        return Host[host]
+    except KeyError:
+        raise ValueError(f"Unknown host: {host}") from None
+
+def get_rbs_library(host=Host.Ecoli, percentile: float = 5.0) -> 'RBSLibrary':
+    """
+    Returns the RBS library for a host and abundance percentile, loading it on first use.
+    Every chooser in the process shares the same loaded library.
+    """
+    key = (_as_host(host), float(percentile))
+    library = _libraries.get(key)
+    if library is None:
+        library = RBSLibrary(*key)
+        library.initiate()
+        _libraries[key] = library
+    return library
+
+class RBSLibrary:
+    """
+    The RBS options of one host: the UTR and CDS of its most abundant proteins.
+
+    The library is compiled once into a tab-separated file next to the source data, holding each
+    option's gene name, UTR, CDS and precomputed first six amino acids, so later loads skip the
+    abundance ranking, genome extraction and translation. The compiled file records the size and
+    modification time of its sources and is rebuilt when they change.
+
+    Attributes:
+        host (Host): The organism the RBS sequences come from.
+        percentile (float): The percentage of most abundant proteins included.
+        options (list[RBSOption]): The options, ordered by decreasing abundance.
+    """
+
+    def __init__(self, host: Host, percentile: float = 5.0):
+        self.host = host
+        self.percentile = percentile
+        self.options = None
+        self.path = None
+
+    def initiate(self) -> None:
+        """
+        Loads the compiled library, compiling it from the host's source files first if needed.
+
+        Raises:
+            ValueError: If no source files are registered for the host.
+            FileNotFoundError: If neither a compiled library nor the source files exist.
+        """
+        sources = RBS_LIBRARY_SOURCES.get(self.host)
+        if sources is None:
+            raise ValueError(f"No RBS library data is registered for host {self.host.name}.")
+
+        self.path = os.path.join(LIBRARY_DIR, f"rbs_library_{self.host.name}_p{self.percentile:g}.tsv")
+        signature = self._signature(sources)
+        if not self._is_current(signature):
+            self.compile(sources, signature)
+        self.options = self._load()
+
+    @staticmethod
+    def _signature(sources) -> str:
+        """
+        Describes the source files by size and mtime; None when a source is missing.
+        """
+        parts = []
+        for name in ('abundance', 'genbank'):
+            path = sources[name]
+            if not os.path.exists(path):
+                return None
+            stat = os.stat(path)
+            parts.append(f"{stat.st_size}:{stat.st_mtime_ns}")
+        return ','.join(parts)
+
+    def _is_current(self, signature) -> bool:
+        if not os.path.exists(self.path):
+            return False
+        if signature is None:
+            return True  # A compiled library can be shipped without its sources
+        with open(self.path, 'r') as f:
+            header = f.readline().rstrip('\n').split('\t')
+        return header == ["#version", str(LIBRARY_VERSION), "sources", signature]
+
+    def compile(self, sources, signature=None) -> None:
+        """
+        Builds the options from the source files and writes the compiled library.
+        """
+        top = get_top_percent_utr_cds(sources['abundance'], sources['genbank'], self.percentile)
+        translator = Translate()
+        translator.initiate()
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', newline='') as f:
+            f.write(f"#version\t{LIBRARY_VERSION}\tsources\t{signature or self._signature(sources)}\n")
+            writer = csv.writer(f, delimiter='\t', lineterminator='\n')
+            writer.writerow(['locus_tag', 'gene', 'utr', 'cds', 'first_six_aas'])
+            for locus_tag, data in top.items():
+                # First six amino acids come from the first 18 nucleotides
+                writer.writerow([locus_tag, data['gene'] or '', data['UTR'], data['CDS'], translator.run(data['CDS'][:18])])
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> list[RBSOption]:
+        with open(self.path, 'r', newline='') as f:
+            next(f)  # Version header
+            return [
+                RBSOption(utr=row['utr'], cds=row['cds'], gene_name=row['gene'] or None, first_six_aas=row['first_six_aas'])
+                for row in csv.DictReader(f, delimiter='\t')
+            ]
+
+    def __len__(self) -> int:
+        return len(self.options)
@@ -0,0 +1,342 @@
+import math
+import re
+import time
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from genedesign.models.transcript import Transcript
+from genedesign.objective import Objective, Measurements
+from genedesign.checkers import hairpin_checker as hairpin
+from genedesign.checkers.codon_checker import DIVERSITY_THRESHOLD, RARE_CODON_LIMIT
+from genedesign.checkers.forbidden_sequence_checker import ForbiddenSequenceChecker
+from genedesign.checkers.internal_promoter_checker import PromoterChecker
+from genedesign.seq_utils.hairpin_counter import hairpin_counter
+from genedesign.seq_utils.fused_check import encode_sequence
+from genedesign.seq_utils.reverse_complement import reverse_complement
+from genedesign.seq_utils.sample_codon import SampleCodon
+from genedesign.profiler import Profiler
+
+# Distinct codons CodonChecker.run needs to meet DIVERSITY_THRESHOLD
+MIN_DISTINCT_CODONS = math.ceil(DIVERSITY_THRESHOLD * 62)
+
+class AnnealingRefiner:
+    """
+    Refines a finished transcript by simulated annealing over synonymous single-codon swaps.
+
+    The Monte Carlo search commits codons window by window and never revisits them, so a violation
+    created early (or one that only shows up once the UTR and CDS are joined) stays in the final
+    design. The refiner scores the whole transcript (UTR + CDS, as the benchmark validator sees it) and
+    repeatedly proposes replacing one codon by a synonym, accepting improvements always and
+    regressions with the Metropolis probability exp(delta / temperature). The temperature decays
+    geometrically over the time budget, so the pass behaves like hill climbing towards the end.
+
+    Every score component is additive over positions, so a swap only rescans the bases that can see it:
+    - forbidden sites: occurrences on either strand overlapping the codon,
+    - promoters: PWM windows overlapping the codon, counted when at or above the threshold and
+      penalised by how far they come within the margin of it, summed over windows (the objective's
+      'promoter_excess' term; the search's 'promoter' term only sees the best window of a candidate),
+    - hairpins: the (at most three) 50 bp hairpin_checker chunks containing the codon,
+    - RNase E sites overlapping the codon,
+    - CAI, GC content, rare codon count and codon diversity as running totals.
+    A proposal therefore costs O(window) regardless of the transcript length.
+
+    The score is the shared Objective evaluated on those quantities minus `violation_weight` for every
+    hard violation the validator would report (forbidden site, promoter window, overfull hairpin chunk,
+    each rare codon over the limit and each missing distinct codon).
+
+    Attributes:
+        time_budget (float): Seconds spent per transcript unless overridden in run().
+        max_iterations (int | None): Optional cap on proposals, useful for reproducible runs.
+        should_stop (callable | None): Polled before every proposal; True ends the pass early.
+        initial_temperature (float): Temperature of the first proposal.
+        final_temperature (float): Temperature reached when the budget runs out.
+        violation_weight (float): Score cost of each hard violation.
+        seed (int | None): Seed for proposal and acceptance sampling.
+        last_stats (dict): Counters describing the most recent run.
+    """
+
+    def __init__(self) -> None:
+        self.objective = None
+        self.profiler = Profiler()
+        self.seed = None
+        self.time_budget = 0.5
+        self.max_iterations = None
+        self.should_stop = None  # Optional callable; returning True ends the pass early
+        self.initial_temperature = 0.5
+        self.final_temperature = 0.005
+        self.violation_weight = 1.0
+        self.rng = None
+        self.synonyms = None
+        self.codon_frequencies = None
+        self.rare_codons = None
+        self.forbidden_pattern = None
+        self.max_site_length = None
+        self.pwm = None
+        self.promoter_threshold = None
+        self.promoter_frame = None
+        self.last_stats = None
+
+    def initiate(self) -> None:
+        if self.objective is None:
+            self.objective = Objective()
+            self.objective.initiate()
+        self.rng = np.random.default_rng(self.seed)
+
+        # Synonymous codons per amino acid, from the same table the sampler draws from
+        sampler = SampleCodon()
+        sampler.initiate()
+        self.synonyms = {}
+        for amino_acid, (codons, _) in sampler.codon_probabilities.items():
+            for codon in codons:
+                self.synonyms[str(codon)] = [str(c) for c in codons if c != codon]
+
+        codon_checker = self.objective.codon_checker
+        self.codon_frequencies = codon_checker.codon_frequencies
+        self.rare_codons = set(codon_checker.rare_codons)
+
+        # Forbidden sites and their reverse complements in one overlapping scan of the forward strand
+        forbidden_checker = ForbiddenSequenceChecker()
+        forbidden_checker.initiate()
+        variants = set(forbidden_checker.forbidden) | {reverse_complement(site) for site in forbidden_checker.forbidden}
+        self.forbidden_pattern = re.compile("(?=(" + "|".join(sorted(variants)) + "))")
+        self.max_site_length = max(len(site) for site in variants)
+
+        promoter_checker = PromoterChecker()
+        promoter_checker.initiate()
+        self.pwm = np.array(promoter_checker.pwm)
+        self.promoter_threshold = promoter_checker.threshold
+        self.promoter_frame = promoter_checker.sliding_frame
+
+    def run(self, transcript: Transcript, time_budget: float = None) -> Transcript:
+        """
+        Returns a refined copy of the transcript with the same RBS and protein.
+
+        Parameters:
+            transcript (Transcript): A complete design, e.g. from TranscriptDesigner.run.
+            time_budget (float | None): Seconds to spend; defaults to self.time_budget. Zero returns
+                the transcript unchanged.
+        """
+        if time_budget is None:
+            time_budget = self.time_budget
+        codons = list(transcript.codons)
+        if time_budget <= 0 or len(codons) < 3:
+            self.last_stats = {'iterations': 0, 'accepted': 0, 'improved': 0}
+            return transcript
+
+        with self.profiler.stage('refinement'):
+            state = _RefineState(self, transcript.rbs.utr.upper(), codons)
+            codons = self._anneal(state, time_budget)
+        return Transcript(transcript.rbs, transcript.peptide, codons)
+
+    def _anneal(self, state, time_budget):
+        # The start codon and stop codon stay fixed
+        positions = [i for i in range(1, len(state.codons) - 1) if self.synonyms.get(state.codons[i])]
+        initial_score = best_score = state.score()
+        initial_violations = state.violations()
+        best_codons = list(state.codons)
+        stats = {'iterations': 0, 'accepted': 0, 'improved': 0}
+
+        if positions:
+            rng = self.rng
+            cooling = math.log(self.final_temperature / self.initial_temperature)
+            start = time.perf_counter()
+            current_score = initial_score
+            while True:
+                elapsed = time.perf_counter() - start
+                if elapsed >= time_budget:
+                    break
+                if self.max_iterations is not None and stats['iterations'] >= self.max_iterations:
+                    break
+                if self.should_stop is not None and self.should_stop():
+                    break
+                progress = elapsed / time_budget
+                if self.max_iterations is not None:
+                    progress = max(progress, stats['iterations'] / self.max_iterations)
+                temperature = self.initial_temperature * math.exp(cooling * progress)
+
+                index = positions[int(rng.integers(len(positions)))]
+                options = self.synonyms[state.codons[index]]
+                new_codon = options[int(rng.integers(len(options)))]
+                old_codon = state.codons[index]
+
+                undo = state.swap(index, new_codon)
+                new_score = state.score()
+                delta = new_score - current_score
+                stats['iterations'] += 1
+                if delta >= 0 or rng.random() < math.exp(delta / temperature):
+                    current_score = new_score
+                    stats['accepted'] += 1
+                    if new_score > best_score + 1e-12:
+                        best_score = new_score
+                        best_codons = list(state.codons)
+                        stats['improved'] += 1
+                else:
+                    state.restore(index, old_codon, undo)
+
+        self.profiler.count('refine.iterations', stats['iterations'])
+        self.profiler.count('refine.accepted', stats['accepted'])
+        if best_codons != state.codons:
+            state = _RefineState(self, state.utr, best_codons)
+        stats.update({
+            'initial_score': initial_score,
+            'final_score': best_score,
+            'initial_violations': initial_violations,
+            'final_violations': state.violations(),
+        })
+        self.last_stats = stats
+        return best_codons
+
+    def forbidden_count(self, seq: str) -> int:
+        """
+        Counts forbidden site occurrences on either strand of `seq`.
+        """
+        return sum(1 for _ in self.forbidden_pattern.finditer(seq))
+
+    def promoter_windows(self, seq: str) -> tuple[int, float]:
+        """
+        Scores every promoter window of `seq` on both strands. Returns the number of windows at or above
+        the threshold and the summed excess over (threshold - margin of the 'promoter_excess' term). The
+        excess is 0 when the objective has no 'promoter_excess' term, since nothing would score it.
+        """
+        frame = self.promoter_frame
+        if len(seq) < frame:
+            return 0, 0.0
+        term = self.objective.find_term('promoter_excess')
+        floor = self.promoter_threshold - term.margin if term is not None else None
+        columns = np.arange(frame)
+        hits = 0
+        excess = 0.0
+        for strand in (seq, reverse_complement(seq)):
+            codes = np.frombuffer(encode_sequence(strand), dtype=np.uint8)
+            scores = self.pwm[sliding_window_view(codes, frame), columns].sum(axis=1)
+            hits += int(np.count_nonzero(scores >= self.promoter_threshold))
+            if floor is not None:
+                excess += float(np.clip(scores - floor, 0.0, None).sum())
+        return hits, excess
+
+class _RefineState:
+    """
+    The transcript being refined and the running totals of every score component.
+    """
+
+    def __init__(self, refiner: AnnealingRefiner, utr: str, codons: list[str]):
+        self.refiner = refiner
+        self.utr = utr
+        self.codons = codons
+        self.offset = len(utr)
+        self.seq = bytearray((utr + ''.join(codons)).upper(), 'ascii')
+        text = self.text(0, len(self.seq))
+
+        frequencies = refiner.codon_frequencies
+        self.log_cai_sum = sum(math.log(frequencies.get(codon, 0.01)) for codon in codons)
+        self.gc_count = sum(self.seq[self.offset:].count(base) for base in b'GC')
+        self.codon_counts = {}
+        for codon in codons:
+            self.codon_counts[codon] = self.codon_counts.get(codon, 0) + 1
+        self.rare_count = sum(1 for codon in codons if codon in refiner.rare_codons)
+        self.rnase_sites = refiner.objective.rnase_checker.count(text)
+        self.forbidden = refiner.forbidden_count(text)
+        self.promoter_hits, self.promoter_excess = refiner.promoter_windows(text)
+        self.chunk_starts = list(range(0, len(self.seq) - hairpin.CHUNK_SIZE + 1, hairpin.OVERLAP))
+        self.hairpin_counts = [self.chunk_count(start) for start in self.chunk_starts]
+        self.hairpin_excess = sum(max(0, count - hairpin.MAX_HAIRPINS) for count in self.hairpin_counts)
+        self.hairpin_failures = sum(1 for count in self.hairpin_counts if count > hairpin.MAX_HAIRPINS)
+
+    def text(self, start: int, end: int) -> str:
+        return self.seq[max(0, start):min(end, len(self.seq))].decode('ascii')
+
+    def chunk_count(self, start: int) -> int:
+        chunk = self.text(start, start + hairpin.CHUNK_SIZE)
+        return hairpin_counter(chunk, hairpin.MIN_STEM, hairpin.MIN_LOOP, hairpin.MAX_LOOP)[0]
+
+    def violations(self) -> int:
+        return (self.forbidden + self.promoter_hits + self.hairpin_failures
+                + max(0, self.rare_count - RARE_CODON_LIMIT)
+                + max(0, MIN_DISTINCT_CODONS - len(self.codon_counts)))
+
+    def measurements(self) -> Measurements:
+        n_codons = len(self.codons)
+        return Measurements(
+            cai=math.exp(self.log_cai_sum / n_codons),
+            gc_content=self.gc_count / (3 * n_codons),
+            hairpin_excess=self.hairpin_excess,
+            promoter_excess=self.promoter_excess,
+            rnase_sites=self.rnase_sites,
+            length=len(self.seq),
+        )
+
+    def score(self) -> float:
+        refiner = self.refiner
+        return refiner.objective.score(self.measurements()) - refiner.violation_weight * self.violations()
+
+    def _local(self, q: int) -> tuple:
+        """
+        Measures the position-additive components over the bases that can overlap the codon at q.
+        """
+        refiner = self.refiner
+        site_reach = refiner.max_site_length - 1
+        frame_reach = refiner.promoter_frame - 1
+        rnase_reach = refiner.objective.rnase_checker.max_motif_length - 1
+        forbidden = refiner.forbidden_count(self.text(q - site_reach, q + 3 + site_reach))
+        promoter_hits, promoter_excess = refiner.promoter_windows(self.text(q - frame_reach, q + 3 + frame_reach))
+        rnase = refiner.objective.rnase_checker.count(self.text(q - rnase_reach, q + 3 + rnase_reach))
+        return forbidden, promoter_hits, promoter_excess, rnase
+
+    def _affected_chunks(self, q: int) -> range:
+        """
+        Indices of the hairpin chunks overlapping the codon at q.
+        """
+        first = max(0, (q - hairpin.CHUNK_SIZE) // hairpin.OVERLAP + 1)
+        last = min(len(self.chunk_starts) - 1, (q + 2) // hairpin.OVERLAP)
+        return range(first, last + 1)
+
+    def swap(self, index: int, new_codon: str) -> tuple:
+        """
+        Replaces one codon and updates every total from the bases around it. Returns the data
+        restore() needs to undo the swap.
+        """
+        q = self.offset + 3 * index
+        old_codon = self.codons[index]
+        before = self._local(q)
+        chunks = self._affected_chunks(q)
+        old_chunks = [self.hairpin_counts[k] for k in chunks]
+
+        self._set_codon(index, q, old_codon, new_codon)
+        after = self._local(q)
+        self._apply_local(before, after)
+        for k in chunks:
+            self._set_chunk(k, self.chunk_count(self.chunk_starts[k]))
+        return before, after, chunks, old_chunks
+
+    def restore(self, index: int, old_codon: str, undo: tuple) -> None:
+        before, after, chunks, old_chunks = undo
+        q = self.offset + 3 * index
+        self._set_codon(index, q, self.codons[index], old_codon)
+        self._apply_local(after, before)
+        for k, count in zip(chunks, old_chunks):
+            self._set_chunk(k, count)
+
+    def _set_codon(self, index, q, old_codon, new_codon):
+        frequencies = self.refiner.codon_frequencies
+        rare_codons = self.refiner.rare_codons
+        self.log_cai_sum += math.log(frequencies.get(new_codon, 0.01)) - math.log(frequencies.get(old_codon, 0.01))
+        self.gc_count += sum(new_codon.count(base) for base in 'GC') - sum(old_codon.count(base) for base in 'GC')
+        self.rare_count += (new_codon in rare_codons) - (old_codon in rare_codons)
+        self.codon_counts[old_codon] -= 1
+        if not self.codon_counts[old_codon]:
+            del self.codon_counts[old_codon]
+        self.codon_counts[new_codon] = self.codon_counts.get(new_codon, 0) + 1
+        self.codons[index] = new_codon
+        self.seq[q:q + 3] = new_codon.encode('ascii')
+
+    def _apply_local(self, before, after):
+        self.forbidden += after[0] - before[0]
+        self.promoter_hits += after[1] - before[1]
+        self.promoter_excess += after[2] - before[2]
+        self.rnase_sites += after[3] - before[3]
+
+    def _set_chunk(self, k, count):
+        old = self.hairpin_counts[k]
+        limit = hairpin.MAX_HAIRPINS
+        self.hairpin_excess += max(0, count - limit) - max(0, old - limit)
+        self.hairpin_failures += (count > limit) - (old > limit)
+        self.hairpin_counts[k] = count
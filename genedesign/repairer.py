@@ -0,0 +1,325 @@
+import math
+from dataclasses import dataclass, field
+from typing import Optional
+from genedesign.models.transcript import Transcript
+from genedesign.models.violation import Violation
+from genedesign.refiner import AnnealingRefiner, _RefineState, MIN_DISTINCT_CODONS
+from genedesign.checkers import hairpin_checker as hairpin
+from genedesign.checkers.forbidden_sequence_checker import ForbiddenSequenceChecker
+from genedesign.checkers.internal_promoter_checker import PromoterChecker
+from genedesign.checkers.codon_checker import CodonChecker, RARE_CODON_LIMIT, CAI_THRESHOLD
+from genedesign.checkers.gc_content_checker import GC_LOWER_BOUND, GC_UPPER_BOUND, locate_gc
+from genedesign.seq_utils.hairpin_counter import hairpin_sites
+from genedesign.profiler import Profiler
+
+@dataclass
+class RepairResult:
+    """
+    The outcome of repairing an existing CDS.
+
+    Attributes:
+        codons (list[str]): The repaired codons; identical to the input where no edit was made.
+        edits (list[tuple[int, str, str]]): (codon index, original codon, new codon) for every changed
+            position, sorted by index.
+        violations (list[Violation]): What still fails after the repair, in transcript (UTR + CDS)
+            coordinates. Empty when the repair succeeded.
+        transcript (Transcript | None): The repaired transcript when an RBS was given.
+    """
+    codons: list
+    edits: list = field(default_factory=list)
+    violations: list = field(default_factory=list)
+    transcript: Optional[Transcript] = None
+
+    @property
+    def passed(self) -> bool:
+        return not self.violations
+
+class CDSRepairer:
+    """
+    Repairs an existing CDS with as few synonymous codon substitutions as it can find, instead of
+    redesigning the protein from scratch.
+
+    The transcript (UTR + CDS, as the benchmark validator sees it) is checked once to locate every
+    violation: forbidden sites and promoters on either strand, hairpins in overfull 50 bp chunks, and
+    the global codon usage (rare codons, diversity, CAI) and GC content limits. The repair then works
+    greedily, one violation at a time from the 5' end: each step tries every synonym at the codons
+    overlapping the violation and keeps the substitution that lowers the violation count the most,
+    preferring positions that were already edited and then the better overall score. When no single
+    substitution helps, pairs of substitutions within the violation are tried; if those fail too the
+    violation is set aside. Global violations are handled the same way once no located one is left,
+    over a bounded set of promising positions.
+
+    Hairpins count by their excess over MAX_HAIRPINS per chunk rather than by failing chunk, so breaking
+    one hairpin of a crowded chunk already counts as progress.
+
+    Every trial substitution is measured with the AnnealingRefiner's incremental state, which only
+    rescans the bases that can see the changed codon, and after each accepted substitution only the
+    surrounding region is re-located. The cost therefore grows with the number of violations and not
+    with the length of the sequence (apart from the initial and final scans).
+
+    The start and stop codons are kept.
+
+    The repair is best-effort: a violation that no single or paired substitution improves is left in
+    place and reported in RepairResult.violations. That happens mostly for chunks crowded with more
+    hairpins than two edits can break, and always for violations inside the UTR. GC content is checked
+    over the whole CDS, as the validator does, not per 50 bp window as CheckSequence does during design.
+
+    Attributes:
+        max_edits (int | None): Most codons changed per repair; None for no limit.
+        max_pair_positions (int): Most codons of a violation combined in the pairwise fallback.
+        max_global_candidates (int): Most positions tried per step for a global (codon usage or GC) violation.
+        last_stats (dict): Counters describing the most recent run.
+    """
+
+    def __init__(self) -> None:
+        self.refiner = None
+        self.profiler = Profiler()
+        self.forbidden_checker = None
+        self.promoter_checker = None
+        self.codon_checker = None
+        self.max_edits = None
+        self.max_pair_positions = 8
+        self.max_global_candidates = 48
+        self.last_stats = None
+
+    def initiate(self) -> None:
+        # The refiner's tables and incremental state do the local re-checking
+        if self.refiner is None:
+            self.refiner = AnnealingRefiner()
+            self.refiner.initiate()
+        self.forbidden_checker = ForbiddenSequenceChecker()
+        self.forbidden_checker.initiate()
+        self.promoter_checker = PromoterChecker()
+        self.promoter_checker.initiate()
+        self.codon_checker = CodonChecker()
+        self.codon_checker.initiate()
+
+    def run(self, codons: list[str], utr: str = '', max_edits: int = None, regions: list[tuple[int, int]] = None) -> RepairResult:
+        """
+        Returns a repaired copy of `codons`.
+
+        Parameters:
+            codons (list[str]): The CDS to repair, start codon to stop codon.
+            utr (str): The 5' UTR the CDS will follow; sequence checks see the junction.
+            max_edits (int | None): Overrides self.max_edits for this call.
+            regions (list[tuple[int, int]] | None): Transcript intervals to repair. Only the violations
+                overlapping them are targeted and global violations are left alone; substitutions are
+                still only kept if they lower the violation count of the whole transcript.
+        """
+        if max_edits is None:
+            max_edits = self.max_edits
+        codons = [codon.upper() for codon in codons]
+        original = list(codons)
+        stats = {'steps': 0, 'trials': 0, 'pair_steps': 0}
+
+        with self.profiler.stage('repair'):
+            state = _RefineState(self.refiner, utr.upper(), list(codons))
+            if regions is None:
+                located = set(self._locate(state, 0, len(state.seq)))
+            else:
+                located = {v for start, end in regions for v in self._locate(state, start, end)}
+            current = self.violation_count(state)
+            stats['initial_violations'] = current
+            stuck = set()  # Violations no single or paired substitution improved
+
+            while current > 0:
+                n_edits = sum(1 for a, b in zip(state.codons, original) if a != b)
+                if max_edits is not None and n_edits >= max_edits:
+                    break
+                targets = sorted(located - stuck, key=lambda v: (v.start, v.end, v.check))
+                target = targets[0] if targets else None
+                if target is not None:
+                    positions = self._violation_positions(state, target)
+                elif regions is not None:
+                    break
+                else:
+                    positions = self._global_positions(state)
+                    if not positions:
+                        break
+
+                best = self._best_single(state, positions, original, stats)
+                if best is not None and best[0] < current:
+                    changes = [best[1:]]
+                else:
+                    best = self._best_pair(state, positions, current, stats) if target is not None else None
+                    if best is None:
+                        if target is None:
+                            break
+                        stuck.add(target)
+                        continue
+                    changes = best[1]
+                    stats['pair_steps'] += 1
+                for index, codon in changes:
+                    state.swap(index, codon)
+                    q = state.offset + 3 * index
+                    region = (q - hairpin.CHUNK_SIZE, q + 3 + hairpin.CHUNK_SIZE)
+                    located = {v for v in located if not v.overlaps(*region)}
+                    located.update(v for v in self._locate(state, *region)
+                                   if regions is None or any(v.overlaps(*r) for r in regions))
+                current = self.violation_count(state)
+                stats['steps'] += 1
+
+        codons = state.codons
+        edits = [(i, before, after) for i, (before, after) in enumerate(zip(original, codons)) if before != after]
+        stats['edits'] = len(edits)
+        stats['final_violations'] = current
+        self.profiler.count('repair.edits', len(edits))
+        self.last_stats = stats
+        return RepairResult(codons=codons, edits=edits, violations=self.violations(codons, utr))
+
+    def violation_count(self, state) -> int:
+        """
+        Counts the violations of a refine state: the refiner's hard violations with hairpins counted by
+        excess per chunk, plus a CAI below the threshold and the number of bases the CDS GC content is
+        outside its bounds.
+        """
+        count = state.violations() - state.hairpin_failures + state.hairpin_excess
+        n_codons = len(state.codons)
+        if math.exp(state.log_cai_sum / n_codons) < CAI_THRESHOLD:
+            count += 1
+        cds_length = 3 * n_codons
+        count += max(0, math.ceil(GC_LOWER_BOUND * cds_length - state.gc_count - 1e-9))
+        count += max(0, math.ceil(state.gc_count - GC_UPPER_BOUND * cds_length - 1e-9))
+        return count
+
+    def violations(self, codons: list[str], utr: str = '') -> list[Violation]:
+        """
+        Locates everything the validator and the CDS-level GC check would reject, in transcript coordinates.
+        """
+        utr = utr.upper()
+        transcript_dna = utr + ''.join(codons)
+        offset = len(utr)
+        found = self.forbidden_checker.locate(transcript_dna)
+        found.extend(self.promoter_checker.locate(transcript_dna))
+        found.extend(hairpin.locate_hairpins(transcript_dna))
+        found.extend(Violation(v.check, v.start + offset, v.end + offset, v.detail) for v in self.codon_checker.locate(codons))
+        if codons:
+            found.extend(Violation(v.check, v.start + offset, v.end + offset, v.detail) for v in locate_gc(''.join(codons)))
+        return found
+
+    def _locate(self, state, start: int, end: int) -> list[Violation]:
+        """
+        Locates the sequence violations (forbidden sites, promoters, hairpins) overlapping [start, end)
+        by scanning only the bases around it.
+        """
+        n = len(state.seq)
+        start, end = max(0, start), min(n, end)
+        found = []
+
+        reach = self.refiner.max_site_length - 1
+        low = max(0, start - reach)
+        for v in self.forbidden_checker.locate(state.text(low, end + reach)):
+            if v.overlaps(start - low, end - low):
+                found.append(Violation(v.check, v.start + low, v.end + low, v.detail))
+
+        # Windows spanning the strand separator only exist at the real 3' end; in a slice they all
+        # cover its last base, and any real window overlapping [start, end) stops short of it
+        frame = self.refiner.promoter_frame
+        low, high = max(0, start - frame), min(n, end + frame)
+        for v in self.promoter_checker.locate(state.text(low, high)):
+            if v.end == high - low and high < n:
+                continue
+            if v.overlaps(start - low, end - low):
+                found.append(Violation(v.check, v.start + low, v.end + low, v.detail))
+
+        for k, chunk_start in enumerate(state.chunk_starts):
+            if state.hairpin_counts[k] <= hairpin.MAX_HAIRPINS:
+                continue
+            if chunk_start >= end or chunk_start + hairpin.CHUNK_SIZE <= start:
+                continue
+            chunk = state.text(chunk_start, chunk_start + hairpin.CHUNK_SIZE)
+            for site_start, site_end in hairpin_sites(chunk, hairpin.MIN_STEM, hairpin.MIN_LOOP, hairpin.MAX_LOOP):
+                found.append(Violation('hairpin', chunk_start + site_start, chunk_start + site_end))
+        return found
+
+    def _editable(self, state) -> range:
+        # The start and stop codons stay fixed
+        return range(1, len(state.codons) - 1)
+
+    def _violation_positions(self, state, violation) -> list[int]:
+        """
+        The editable codon indices overlapping a located violation.
+        """
+        editable = self._editable(state)
+        synonyms = self.refiner.synonyms
+        return [i for i in violation.codons(state.offset) if i in editable and synonyms.get(state.codons[i])]
+
+    def _global_positions(self, state) -> list[int]:
+        """
+        The most promising codon indices for each global (codon usage or GC) violation.
+        """
+        editable = self._editable(state)
+        synonyms = self.refiner.synonyms
+        refiner = self.refiner
+        frequencies = refiner.codon_frequencies
+        limit = self.max_global_candidates
+        n_codons = len(state.codons)
+        cds_length = 3 * n_codons
+        codons = state.codons
+        positions = set()
+        if state.rare_count > RARE_CODON_LIMIT:
+            positions.update([i for i in editable if codons[i] in refiner.rare_codons][:limit])
+        if len(state.codon_counts) < MIN_DISTINCT_CODONS:
+            # Repeated codons with a synonym that is not used yet
+            positions.update([i for i in editable if state.codon_counts[codons[i]] > 1
+                              and any(s not in state.codon_counts for s in synonyms.get(codons[i], ()))][:limit])
+        if math.exp(state.log_cai_sum / n_codons) < CAI_THRESHOLD:
+            gains = sorted(((max((frequencies.get(s, 0.01) for s in synonyms.get(codons[i], ())), default=0.0)
+                             / frequencies.get(codons[i], 0.01), i) for i in editable), reverse=True)
+            positions.update(i for gain, i in gains[:limit] if gain > 1)
+        gc = state.gc_count
+        if gc < GC_LOWER_BOUND * cds_length or gc > GC_UPPER_BOUND * cds_length:
+            sign = 1 if gc < GC_LOWER_BOUND * cds_length else -1
+            positions.update([i for i in editable if any(sign * (_gc(s) - _gc(codons[i])) > 0 for s in synonyms.get(codons[i], ()))][:limit])
+        return sorted(positions)
+
+    def _trial_key(self, state, index, codon, original):
+        """
+        Ranks a trial substitution: fewer violations, then fewer edited positions, then a better score.
+        """
+        edited = (codon != original[index]) - (state.codons[index] != original[index])
+        return self.violation_count(state), edited, -state.score()
+
+    def _best_single(self, state, positions, original, stats):
+        best = None
+        for index in positions:
+            old = state.codons[index]
+            for codon in self.refiner.synonyms.get(old, ()):
+                undo = state.swap(index, codon)
+                key = self._trial_key(state, index, codon, original)
+                state.restore(index, old, undo)
+                stats['trials'] += 1
+                if best is None or key < best[0]:
+                    best = (key, index, codon)
+        if best is None:
+            return None
+        return best[0][0], best[1], best[2]
+
+    def _best_pair(self, state, positions, current, stats):
+        """
+        Tries every pair of substitutions among `positions` (the codons of one violation).
+        Returns (violations, [(index, codon), (index, codon)]) for the best improving pair, or None.
+        """
+        synonyms = self.refiner.synonyms
+        positions = positions[:self.max_pair_positions]
+        best = None
+        for a, i in enumerate(positions):
+            old_i = state.codons[i]
+            for codon_i in synonyms[old_i]:
+                undo_i = state.swap(i, codon_i)
+                for j in positions[a + 1:]:
+                    old_j = state.codons[j]
+                    for codon_j in synonyms[old_j]:
+                        undo_j = state.swap(j, codon_j)
+                        key = (self.violation_count(state), -state.score())
+                        state.restore(j, old_j, undo_j)
+                        stats['trials'] += 1
+                        if key[0] < current and (best is None or key < best[0]):
+                            best = (key, [(i, codon_i), (j, codon_j)])
+                state.restore(i, old_i, undo_i)
+        if best is None:
+            return None
+        return best[0][0], best[1]
+
+def _gc(codon: str) -> int:
+    return codon.count('G') + codon.count('C')
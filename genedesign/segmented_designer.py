@@ -0,0 +1,212 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from genedesign.models.transcript import Transcript
+from genedesign.checkers import hairpin_checker as hairpin
+from genedesign.transcript_designer import TranscriptDesigner
+
+# Number of rare codon sections CheckSequence.rare_codon_limit divides a CDS into
+RARE_CODON_SECTIONS = 3
+
+# Per-process state of a segment worker, filled in by _init_worker
+_worker = {}
+
+def default_designer_factory():
+    """
+    Builds and initiates the TranscriptDesigner each segment worker keeps.
+    """
+    designer = TranscriptDesigner()
+    designer.initiate()
+    return designer
+
+def _init_worker(designer_factory):
+    """
+    Runs once in every worker process so segments only pay for the design itself.
+    """
+    _worker['designer'] = designer_factory()
+
+def _ping():
+    return True
+
+def design_segment(designer, job: dict) -> dict:
+    """
+    Designs one segment on an initiated TranscriptDesigner and returns its RBS (None unless the segment
+    starts the CDS), codons and design time.
+    """
+    start = time.perf_counter()
+    rbs, codons = designer.search_algorithm.run_segment(
+        job['residues'], job['ignores'], job['len_peptide'], job['codon_offset'], job['rare_offset'])
+    return {'rbs': rbs, 'codons': codons, 'seconds': time.perf_counter() - start}
+
+def _design_segment(job: dict) -> dict:
+    return design_segment(_worker['designer'], job)
+
+class SegmentedDesigner:
+    """
+    Designs very long proteins (e.g. multi-thousand-residue NRPS modules) by splitting the peptide into
+    overlapping segments that are designed in parallel worker processes, then stitching them together.
+
+    - Segments: the peptide (stop included) is cut into n_segments cores of equal length. Every segment
+      after the first is designed from `overlap` residues before its core, so at each junction both
+      neighbours have designed the overlap. Junctions are moved off the rare codon section boundaries
+      so each overlap lies within one section.
+    - Global constraints: each segment's codon checks are placed at its position in the CDS with the
+      rare codon allowance of everything before it (MonteCarlo.run_segment), so the cumulative rare
+      codon budget holds for the joined CDS. Diversity and CAI are checked per segment, which keeps the
+      joined CDS above both thresholds.
+    - Stitching: for each junction the cut inside the overlap (left codons before it, right codons from
+      it) with the fewest forbidden sites, promoters and hairpins around the junction is kept, and any
+      violation left around the junction is repaired with CDSRepairer restricted to that region.
+
+    Workers are started and warmed in initiate(), like DesignService. With workers <= 1 the segments are
+    designed one after another in this process, which gives the same result shape for testing. Peptides
+    shorter than n_segments * min_segment_length use fewer segments, down to the plain TranscriptDesigner.
+
+    Usage:
+        designer = SegmentedDesigner()
+        designer.initiate()
+        transcript = designer.run(peptide, ignores)
+        designer.close()
+
+    Attributes:
+        workers (int): Worker processes; defaults to the CPU count.
+        n_segments (int | None): Segments per design; None uses one per worker.
+        min_segment_length (int): Fewest residues in a segment core.
+        overlap (int): Residues designed by both neighbours at each junction.
+        last_stats (dict): Segment timings and junction counters of the most recent run.
+    """
+
+    def __init__(self):
+        self.workers = os.cpu_count() or 1
+        self.n_segments = None
+        self.min_segment_length = 150
+        self.overlap = 12
+        self.designer_factory = default_designer_factory
+        self.designer = None
+        self.pool = None
+        self.last_stats = None
+
+    def initiate(self) -> None:
+        """
+        Initiates the local designer (short peptides, stitching and repair) and, with more than one
+        worker, starts the worker processes and waits until every one has initiated its designer.
+        """
+        self.designer = self.designer_factory()
+        if self.workers > 1:
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.designer_factory,),
+            )
+            for future in [self.pool.submit(_ping) for _ in range(self.workers)]:
+                future.result()
+
+    def close(self) -> None:
+        """
+        Shuts the worker processes down.
+        """
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+
+    def plan(self, len_peptide: int) -> list[tuple[int, int]]:
+        """
+        Returns the segment cores as (start, end) codon ranges tiling [0, len_peptide).
+        """
+        n_segments = self.n_segments or max(1, self.workers)
+        n_segments = max(1, min(n_segments, len_peptide // self.min_segment_length))
+        section_length = len_peptide // RARE_CODON_SECTIONS
+        junctions = []
+        for i in range(1, n_segments):
+            junction = round(i * len_peptide / n_segments)
+            # Keep the overlap (junction - overlap, junction] inside one rare codon section
+            for k in range(1, RARE_CODON_SECTIONS):
+                boundary = k * section_length
+                if junction - self.overlap + 1 < boundary <= junction:
+                    junction = boundary - 1
+            junctions.append(junction)
+        bounds = [0] + junctions + [len_peptide]
+        return list(zip(bounds, bounds[1:]))
+
+    def run(self, peptide: str, ignores: set) -> Transcript:
+        """
+        Designs a transcript for the peptide, segmenting it when it is long enough.
+        """
+        if not peptide:
+            raise ValueError("Peptide needs to be a non-empty string.")
+        full_peptide = peptide + '*'
+        len_peptide = len(full_peptide)
+        cores = self.plan(len_peptide)
+        if len(cores) == 1:
+            self.last_stats = {'segments': 1}
+            return self.designer.run(peptide, ignores)
+
+        checker = self.designer.search_algorithm.checker
+        jobs = []
+        for start, end in cores:
+            design_start = max(0, start - self.overlap)
+            jobs.append({
+                'residues': full_peptide[design_start:end],
+                'ignores': ignores,
+                'len_peptide': len_peptide,
+                'codon_offset': design_start,
+                # Everything before the core may have used its full allowance
+                'rare_offset': checker.rare_codon_limit(start, len_peptide, RARE_CODON_SECTIONS) if start else 0,
+            })
+
+        design_start_time = time.perf_counter()
+        if self.pool is not None:
+            segments = list(self.pool.map(_design_segment, jobs))
+        else:
+            segments = [design_segment(self.designer, job) for job in jobs]
+        design_seconds = time.perf_counter() - design_start_time
+
+        stitch_start_time = time.perf_counter()
+        rbs = segments[0]['rbs']
+        codons = list(segments[0]['codons'])
+        regions = []
+        junction_violations = 0
+        for (start, _), job, segment in zip(cores[1:], jobs[1:], segments[1:]):
+            cut, violations = self._choose_cut(codons, segment['codons'], job['codon_offset'], start)
+            junction_violations += violations
+            codons = codons[:cut] + segment['codons'][cut - job['codon_offset']:]
+            offset = len(rbs.utr)
+            regions.append((offset + 3 * job['codon_offset'] - hairpin.CHUNK_SIZE, offset + 3 * start + hairpin.CHUNK_SIZE))
+
+        repaired = self.designer.repairer.run(codons, rbs.utr, regions=regions)
+        codons = repaired.codons
+        self.last_stats = {
+            'segments': len(cores),
+            'segment_seconds': [segment['seconds'] for segment in segments],
+            'design_seconds': design_seconds,
+            'junction_violations': junction_violations,
+            'junction_edits': len(repaired.edits),
+            'stitch_seconds': time.perf_counter() - stitch_start_time,
+        }
+        return self.designer.refine(Transcript(rbs, peptide, codons))
+
+    def _choose_cut(self, left: list[str], right: list[str], right_start: int, junction: int) -> tuple[int, int]:
+        """
+        Picks where to switch from the left codons (CDS codons 0..junction) to the right segment's codons
+        (from right_start = junction - overlap). Every cut in (right_start, junction] is scored by the
+        forbidden sites, promoters and hairpins in the joined sequence around the overlap; the first codon
+        of the right segment is never kept, as it was designed without any sequence before it.
+
+        Returns:
+            tuple[int, int]: The cut (index of the first right codon in the CDS) and its violation count.
+        """
+        repairer = self.designer.repairer
+        flank = hairpin.CHUNK_SIZE // 3 + 1
+        low = max(0, right_start - flank)
+        high = min(right_start + len(right), junction + flank)
+        middle = (right_start + junction + 1) / 2
+        best = None
+        for cut in range(right_start + 1, junction + 1):
+            joined = ''.join(left[low:cut] + right[cut - right_start:high - right_start])
+            violations = (len(repairer.forbidden_checker.locate(joined))
+                          + len(repairer.promoter_checker.locate(joined))
+                          + len(hairpin.locate_hairpins(joined)))
+            key = (violations, abs(cut - middle))
+            if best is None or key < best[0]:
+                best = (key, cut)
+        return best[1], best[0][0]
@@ -1,59 +1,282 @@
+import time
+import hashlib
 from collections import Counter
 from genedesign.checkers.forbidden_sequence_checker import ForbiddenSequenceChecker
 from genedesign.checkers.internal_promoter_checker import PromoterChecker
-from genedesign.checkers.codon_checker import CodonChecker
-from genedesign.checkers.hairpin_checker import hairpin_checker
+from genedesign.checkers.codon_checker import CodonChecker, DIVERSITY_THRESHOLD, RARE_CODON_LIMIT, CAI_THRESHOLD
+from genedesign.checkers.hairpin_checker import hairpin_checker, locate_hairpins, CHUNK_SIZE, MIN_STEM, MIN_LOOP, MAX_LOOP, MAX_HAIRPINS
 from genedesign.models.rbs_option import RBSOption
-from genedesign.checkers.gc_content_checker import gc_checker
+from genedesign.checkers.gc_content_checker import gc_checker, locate_gc, GC_LOWER_BOUND, GC_UPPER_BOUND
+from genedesign.checkers.rnase_e_checker import RNaseEChecker
+from genedesign.seq_utils.fused_check import FusedSequenceChecker
+from genedesign.profiler import Profiler
+from genedesign.objective import Objective, Measurements
+from genedesign.seq_utils.sequence_context import SequenceContext
+from genedesign.models.violation import Violation
 
 class CheckSequence:
+    """
+    Runs every design constraint on a candidate window and combines them into a pass/fail verdict and a
+    score (higher is better) that the search backends use to rank failed candidates.
+
+    Two evaluation modes are available:
+    - full (default): every check runs and the score is the shared Objective evaluated on everything
+      measured: pass fraction, CAI, hairpin excess, promoter margin, GC deviation and RNase E sites.
+      Used for final validation and reporting.
+    - short_circuit: two stages, the codon check and the fused sequence checks (forbidden sites,
+      promoters, hairpins and GC in one pass), run cheapest-per-rejection first, and evaluation stops
+      at the first stage that rejects. Checks of a stage that was not reached count as failed, CAI
+      only contributes once the codon check has run and the hairpin, promoter and GC terms once the
+      sequence stage has run. RNase E sites are only counted for accepted candidates, so accepted
+      candidates get exactly the full-mode score. Used inside the Monte Carlo retry loop where most
+      candidates are rejected.
+
+    The short-circuit order comes from measured statistics: each stage's mean run time divided by its
+    observed rejection rate, i.e. the expected time spent per rejection it produces.
+
+    Predicted RNase E sites do not affect the verdict; their density is subtracted from the score
+    (scaled by the objective's 'rnase' weight) so the search prefers candidates with fewer cleavage sites.
+    The objective can be shared with other components by assigning it before initiate().
+
+    Sequence checks run on a 50 bp window made of the most recent committed sequence (UTR tail and
+    accepted codons) followed by the candidate codons, taken from a SequenceContext. Searches keep one
+    context per design and commit accepted codons to it, so building the window and the codon usage
+    statistics costs O(window) per attempt. Without a context one is built from `codons` on the fly.
+
+    locate() reports where a rejected candidate fails, as Violation intervals in the check window, and
+    violating_codons() maps them to the candidate codons a targeted repair should resample.
+    """
+
+    # Short-circuit stages in the order used before any statistics are collected, cheapest first
+    DEFAULT_CHECK_ORDER = ['codons', 'sequence']
+    # Checks the fused sequence stage decides, as reported to the profiler
+    SEQUENCE_CHECKS = ['forbidden', 'promoter', 'hairpin', 'gc']
+    # Number of short-circuit runs between re-sorting the check order
+    REORDER_INTERVAL = 64
 
     def __init__(self) -> None:
         self.codon_checker = None
         self.forbidden_checker = None
         self.promoter_checker = None
+        self.fused_checker = None
+        self.rnase_checker = None
+        self.objective = None
+        self.check_stats = None
+        self.check_order = None
+        self.runs_since_reorder = 0
+        self.profiler = Profiler()
         
     def initiate(self) -> None:
         self.forbidden_checker = ForbiddenSequenceChecker()
         self.promoter_checker = PromoterChecker()
         self.codon_checker = CodonChecker()
+        self.fused_checker = FusedSequenceChecker()
+        self.rnase_checker = RNaseEChecker()
         
         self.forbidden_checker.initiate()
         self.promoter_checker.initiate()
         self.codon_checker.initiate()
+        self.fused_checker.initiate()
+        self.rnase_checker.initiate()
+        if self.objective is None:
+            self.objective = Objective()
+            self.objective.initiate()
+
+        self.reset_check_order()
+
+    def reset_check_order(self) -> None:
+        """
+        Forgets the short-circuit statistics and returns to the default order. The learned order changes
+        which checks a rejected candidate is scored on, so reproducible runs start from here.
+        """
+        self.check_stats = {name: {'calls': 0, 'passes': 0, 'time': 0.0} for name in self.DEFAULT_CHECK_ORDER}
+        self.check_order = list(self.DEFAULT_CHECK_ORDER)
+        self.runs_since_reorder = 0
+
+    def new_context(self, utr: str, codons: list[str] = ()) -> SequenceContext:
+        """
+        Returns a SequenceContext for a design behind the given UTR with `codons` already committed.
+        """
+        context = SequenceContext()
+        context.initiate(self.codon_checker.codon_frequencies, self.codon_checker.rare_codons)
+        context.reset(utr)
+        context.commit(codons)
+        return context
+
+    def constraint_key(self, window_size: int) -> str:
+        """
+        Returns a short fingerprint of the sequence constraints (forbidden sites, promoter model, hairpin
+        and GC limits) for check windows of `window_size` nucleotides. Two checkers with the same key
+        give the same sequence verdict on the same window, which is what WindowCache relies on.
+        """
+        spec = repr((
+            sorted(self.forbidden_checker.forbidden),
+            self.promoter_checker.pwm,
+            self.promoter_checker.threshold,
+            self.promoter_checker.sliding_frame,
+            (CHUNK_SIZE, MIN_STEM, MIN_LOOP, MAX_LOOP, MAX_HAIRPINS),
+            (GC_LOWER_BOUND, GC_UPPER_BOUND),
+            window_size,
+        ))
+        return hashlib.sha1(spec.encode('ascii')).hexdigest()[:16]
+
+    def run(self, generated_codons: list[str], codons: list[str], rbs: RBSOption, len_peptide, short_circuit: bool = False, context: SequenceContext = None) -> tuple[bool, float]:
+        if context is None:
+            context = self.new_context(rbs.utr, codons)
+        if short_circuit:
+            return self.run_short_circuit(generated_codons, context, len_peptide)
 
-    def run(self, generated_codons: list[str], codons: list[str], rbs: RBSOption, len_peptide) -> tuple[bool, float]:
         results = []
         
-        all_codons = codons + generated_codons
-        good_codons, cai = self.check_codons(all_codons, len_peptide)
+        with self.profiler.stage('check.codons'):
+            good_codons, cai = self.check_context_codons(context, generated_codons, len_peptide)
         results.append(good_codons)
 
-        #only want 25 bp into the rbs utr
-        # 50 - (25 + 18, already generated) = 7, so window size should be 3? This is perfect
-        
-        dna_seq = ''.join(codons)
-        full_seq = self.combine_sequences(rbs.utr, dna_seq)
+        # Latest committed sequence (reaching into the UTR early on) followed by the candidate
+        full_seq = context.window(generated_codons)
 
-        results.append(self.forbidden_checker.run(full_seq)[0])
-        results.append(self.promoter_checker.run(full_seq)[0])
-        results.append(hairpin_checker(full_seq)[0])
-        results.append(gc_checker(full_seq)[0])
-        # results.append(rnase_checker(full_seq))
+        # Forbidden sites, promoters, hairpins and GC content in a single pass
+        with self.profiler.stage('check.sequence'):
+            sequence_result = self.fused_checker.run(full_seq)
+        results.append(sequence_result.passes_forbidden)
+        results.append(sequence_result.passes_promoter)
+        results.append(sequence_result.passes_hairpin)
+        results.append(sequence_result.passes_gc)
 
-        num_true = sum(results)
-        result = all(results)
+        if self.profiler.enabled:
+            for name, passed in zip(['codons', 'forbidden', 'promoter', 'hairpin', 'gc'], results):
+                self.profiler.record_check(name, passed)
 
-        normalized_num_true = num_true / len(results)
+        result = all(results)
 
         # Higher is better
-        score = normalized_num_true + cai
+        score = self.objective.score(Measurements(
+            checks_passed=sum(results),
+            checks_total=len(results),
+            cai=cai,
+            hairpin_counts=sequence_result.hairpin_counts,
+            promoter_max_score=sequence_result.promoter_max_score,
+            gc_content=sequence_result.gc_content,
+            rnase_sites=self.rnase_checker.count(full_seq),
+            length=len(full_seq),
+        ))
         
         if not result:
             return False, score
         
         return True, score
     
+    def run_short_circuit(self, generated_codons: list[str], context: SequenceContext, len_peptide) -> tuple[bool, float]:
+        """
+        Evaluates the codon check and the fused sequence checks in cost-per-rejection order and stops at
+        the first stage that rejects. Returns the same verdict as the full mode; the score only covers
+        what was measured before the verdict was known.
+        """
+        full_seq = context.window(generated_codons)
+
+        num_true = 0
+        cai = None
+        sequence_result = None
+        passed = True
+        for name in self.check_order:
+            start = time.perf_counter()
+            if name == 'codons':
+                passed, cai = self.check_context_codons(context, generated_codons, len_peptide)
+                self.profiler.record_check(name, passed)
+                num_true += passed
+            else:
+                sequence_result = self.fused_checker.run(full_seq)
+                verdicts = [sequence_result.passes_forbidden, sequence_result.passes_promoter,
+                            sequence_result.passes_hairpin, sequence_result.passes_gc]
+                for check_name, verdict in zip(self.SEQUENCE_CHECKS, verdicts):
+                    self.profiler.record_check(check_name, verdict)
+                num_true += sum(verdicts)
+                passed = all(verdicts)
+
+            elapsed = time.perf_counter() - start
+            stats = self.check_stats[name]
+            stats['time'] += elapsed
+            stats['calls'] += 1
+            self.profiler.add_time(f'check.{name}', elapsed)
+            if not passed:
+                break
+            stats['passes'] += 1
+
+        self.runs_since_reorder += 1
+        if self.runs_since_reorder >= self.REORDER_INTERVAL:
+            self.reorder_checks()
+
+        # Higher is better; a rejected candidate is not worth counting RNase E sites for
+        score = self.objective.score(Measurements(
+            checks_passed=num_true,
+            checks_total=1 + len(self.SEQUENCE_CHECKS),
+            cai=cai,
+            hairpin_counts=sequence_result.hairpin_counts if sequence_result is not None else None,
+            promoter_max_score=sequence_result.promoter_max_score if sequence_result is not None else None,
+            gc_content=sequence_result.gc_content if sequence_result is not None else None,
+            rnase_sites=self.rnase_checker.count(full_seq) if passed else None,
+            length=len(full_seq),
+        ))
+        return passed, score
+
+    def locate(self, generated_codons: list[str], context: SequenceContext, len_peptide) -> list[Violation]:
+        """
+        Returns the violations of a candidate in coordinates of its check window, context.window(generated_codons).
+        The list is empty exactly when run() accepts the candidate.
+
+        A failed codon check is reported as the candidate's rare codons when the rare codon limit is
+        exceeded, otherwise (diversity or CAI, or a limit already exceeded by the committed codons
+        alone) as the whole candidate.
+        """
+        full_seq = context.window(generated_codons)
+        offset = len(full_seq) - 3 * len(generated_codons)
+        violations = []
+
+        good_codons, _ = self.check_context_codons(context, generated_codons, len_peptide)
+        if not good_codons:
+            num_codons, _, rare_codon_count, _ = context.codon_stats(generated_codons)
+            if rare_codon_count + context.rare_offset > self.rare_codon_limit(context.codon_offset + num_codons, len_peptide, 3):
+                rare_codons = self.codon_checker.rare_codons
+                rare = [Violation('codons', offset + 3 * i, offset + 3 * i + 3, codon)
+                        for i, codon in enumerate(generated_codons) if codon in rare_codons]
+                violations.extend(rare or [Violation('codons', offset, len(full_seq), 'rare codons before the candidate')])
+            else:
+                violations.append(Violation('codons', offset, len(full_seq), 'diversity or CAI'))
+
+        violations.extend(self.forbidden_checker.locate(full_seq))
+        violations.extend(self.promoter_checker.locate(full_seq))
+        violations.extend(locate_hairpins(full_seq))
+        violations.extend(locate_gc(full_seq))
+        return violations
+
+    def violating_codons(self, generated_codons: list[str], context: SequenceContext, len_peptide) -> list[int]:
+        """
+        Returns the sorted indices of the candidate codons that overlap a violation. Violations lying
+        entirely in the committed history cannot be repaired by the candidate and are ignored.
+        """
+        violations = self.locate(generated_codons, context, len_peptide)
+        offset = len(context.window(generated_codons)) - 3 * len(generated_codons)
+        indices = set()
+        for violation in violations:
+            indices.update(i for i in violation.codons(offset) if 0 <= i < len(generated_codons))
+        return sorted(indices)
+
+    def reorder_checks(self) -> None:
+        """
+        Sorts the checks by expected time per rejection (mean time / rejection rate), ascending.
+        Checks that have not run yet keep their default position ahead of measured ones.
+        """
+        def expected_cost(name):
+            stats = self.check_stats[name]
+            if stats['calls'] == 0:
+                return (0, self.DEFAULT_CHECK_ORDER.index(name))
+            mean_time = stats['time'] / stats['calls']
+            rejection_rate = 1 - stats['passes'] / stats['calls']
+            return (1, mean_time / max(rejection_rate, 1e-3))
+
+        self.check_order.sort(key=expected_cost)
+        self.runs_since_reorder = 0
+
     def combine_sequences(self, utr, cds):
         max_window_size = 50  # Desired total length of the output string
         max_chars_utr = 25  # Maximum characters to take from utr
@@ -90,13 +313,29 @@ class CheckSequence:
         # cai_weight = 1
         # rare_weight = 1
 
-        diversity_threshold = 0.5
-        global_rare_codon_limit = 3
-        cai_threshold = 0.2
-
         _, codon_diversity, rare_codon_count, cai_value = self.codon_checker.run(codons)
+        return self.codon_verdict(len(codons), codon_diversity, rare_codon_count, cai_value, len_peptide)
+
+    def check_context_codons(self, context: SequenceContext, generated_codons, len_peptide):
+        """
+        Same verdict as check_codons(committed + generated_codons), computed from the context's running
+        codon statistics in O(len(generated_codons)). A context placed inside a longer CDS
+        (SequenceContext.place) is held to the rare codon limit at its position, counting the allowance
+        of the codons before it.
+        """
+        num_codons, distinct_codons, rare_codon_count, cai_value = context.codon_stats(generated_codons)
+        if not num_codons:
+            return False, 0.0
+        return self.codon_verdict(num_codons, distinct_codons / 62, rare_codon_count + context.rare_offset, cai_value, len_peptide,
+                                  position=context.codon_offset + num_codons)
+
+    def codon_verdict(self, num_codons, codon_diversity, rare_codon_count, cai_value, len_peptide, position=None):
+        diversity_threshold = DIVERSITY_THRESHOLD
+        global_rare_codon_limit = RARE_CODON_LIMIT
+        cai_threshold = CAI_THRESHOLD
 
-        num_codons = len(codons)
+        if not num_codons:
+            return False, cai_value
 
         # Codon diversity
         if num_codons < 62:
@@ -107,7 +346,8 @@ class CheckSequence:
         
         # Finding the rare codon limit by location in the peptide
         # Divides the protein into 3 sequences, where += 1 rare codon can be used.
-        rare_codon_limit = self.rare_codon_limit(num_codons, len_peptide, global_rare_codon_limit)
+        # `position` is the codon count of the whole CDS up to here when only a segment is checked
+        rare_codon_limit = self.rare_codon_limit(num_codons if position is None else position, len_peptide, global_rare_codon_limit)
 
         good_seq = (actual_codon_diversity >= diversity_threshold and
                     rare_codon_count <= rare_codon_limit and
@@ -0,0 +1,227 @@
+from collections import deque
+import numpy as np
+from genedesign.checkers.forbidden_sequence_checker import ForbiddenSequenceChecker
+from genedesign.seq_utils.reverse_complement import reverse_complement
+from genedesign.seq_utils.sample_codon import SampleCodon
+
+DEAD = -1  # Transition target for a codon that would complete a forbidden site
+
+class ForbiddenSiteAutomaton:
+    """
+    An Aho-Corasick automaton over A/C/G/T that recognises every forbidden site and its reverse
+    complement, so scanning the forward strand finds sites on both strands.
+
+    Nucleotide transitions are compiled into a codon transition table: codon_next[state, codon]
+    is the state after reading the codon's three bases, or DEAD if any of them ends a forbidden site.
+
+    Attributes:
+        sites (list[str]): The patterns recognised (forbidden sites and their reverse complements).
+        max_site_length (int): Length of the longest pattern; the last max_site_length - 1 bases of a
+            sequence determine its state.
+        n_states (int): Number of automaton states (state 0 is the root).
+    """
+
+    def __init__(self):
+        self.sites = None
+        self.max_site_length = None
+        self.n_states = None
+        self.goto = None
+        self.terminal = None
+        self.codons = None
+        self.codon_index = None
+        self.codon_next = None
+
+    def initiate(self, sites: list[str], codons: list[str]) -> None:
+        """
+        Builds the automaton for the given sites and the codon transition table for the given codons.
+        """
+        self.sites = sorted(set(sites) | {reverse_complement(site) for site in sites})
+        self.max_site_length = max(len(site) for site in self.sites)
+
+        # Trie
+        children = [{}]
+        terminal = [False]
+        for site in self.sites:
+            node = 0
+            for base in site:
+                if base not in children[node]:
+                    children[node][base] = len(children)
+                    children.append({})
+                    terminal.append(False)
+                node = children[node][base]
+            terminal[node] = True
+
+        # Failure links by breadth-first search, folded into a complete goto table
+        n = len(children)
+        goto = [[0] * 4 for _ in range(n)]
+        fail = [0] * n
+        queue = deque()
+        for b, base in enumerate('ACGT'):
+            child = children[0].get(base)
+            if child is not None:
+                goto[0][b] = child
+                queue.append(child)
+        while queue:
+            node = queue.popleft()
+            terminal[node] = terminal[node] or terminal[fail[node]]
+            for b, base in enumerate('ACGT'):
+                child = children[node].get(base)
+                if child is not None:
+                    fail[child] = goto[fail[node]][b]
+                    goto[node][b] = child
+                    queue.append(child)
+                else:
+                    goto[node][b] = goto[fail[node]][b]
+
+        self.n_states = n
+        self.goto = goto
+        self.terminal = terminal
+
+        self.codons = list(codons)
+        self.codon_index = {codon: i for i, codon in enumerate(self.codons)}
+        self.codon_next = np.full((n, len(self.codons)), DEAD, dtype=np.int64)
+        for state in range(n):
+            for c, codon in enumerate(self.codons):
+                self.codon_next[state, c] = self.advance(state, codon)
+
+    def advance(self, state: int, seq: str) -> int:
+        """
+        Reads `seq` from `state`. Returns DEAD if a forbidden site ends anywhere in it.
+        """
+        for base in seq:
+            state = self.goto[state]['ACGT'.index(base)]
+            if self.terminal[state]:
+                return DEAD
+        return state
+
+    def state_after(self, history: str) -> int:
+        """
+        Returns the state after reading the tail of `history`. Sites already in the history are
+        ignored: only the state that later bases continue from matters.
+        """
+        state = 0
+        for base in history[-(self.max_site_length - 1):].upper():
+            state = self.goto[state]['ACGT'.index(base)]
+        return state
+
+class ConstrainedSampler:
+    """
+    Samples codons for a window of amino acids so the result (together with the preceding sequence)
+    contains no forbidden site on either strand, while keeping SampleCodon's codon probabilities.
+
+    The draw is exact: it follows the product of ForbiddenSiteAutomaton and the per-residue codon
+    choices. A backward pass computes, for every position and automaton state, the total probability
+    mass of site-free completions, W[i][s] = sum_c p(c) * W[i+1][next(s, c)]. Codons are then drawn
+    forwards with probability proportional to p(c) * W[i+1][next(s, c)]. This is the independent
+    SampleCodon distribution conditioned on the window being site-free, so no draw is wasted on a
+    forbidden junction. The backward tables depend only on the window's residues and are cached.
+
+    Attributes:
+        seed (int | None): Seed for the sampler's random generator.
+        cache_size (int): Most windows whose backward tables are kept.
+    """
+
+    def __init__(self) -> None:
+        self.seed = None
+        self.cache_size = 4096
+        self.rng = None
+        self.automaton = None
+        self.options = None
+        self.option_lists = None
+        self.next_lists = None
+        self.tables = None
+
+    def initiate(self) -> None:
+        self.rng = np.random.default_rng(self.seed)
+        sampler = SampleCodon()
+        sampler.initiate()
+        codons = [str(codon) for aa in sampler.amino_acids for codon in sampler.get_codons(aa)]
+
+        forbidden_checker = ForbiddenSequenceChecker()
+        forbidden_checker.initiate()
+        self.automaton = ForbiddenSiteAutomaton()
+        self.automaton.initiate(forbidden_checker.forbidden, codons)
+
+        # Per residue: codon indices into the automaton table and their sampling probabilities
+        self.options = {}
+        for aa in sampler.amino_acids:
+            aa_codons, probabilities = sampler.get_data(aa)
+            indices = np.array([self.automaton.codon_index[str(codon)] for codon in aa_codons], dtype=np.int64)
+            self.options[str(aa)] = (indices, np.asarray(probabilities, dtype=float))
+        # Plain-list copies for the short per-draw loop, where numpy call overhead dominates
+        self.option_lists = {aa: (indices.tolist(), probabilities.tolist()) for aa, (indices, probabilities) in self.options.items()}
+        self.next_lists = self.automaton.codon_next.tolist()
+        self.tables = {}
+
+    def _backward(self, residues: str) -> list:
+        """
+        Returns W for every position of the window; W[i] is a vector over automaton states.
+        """
+        tables = self.tables.get(residues)
+        if tables is not None:
+            return tables
+
+        n_states = self.automaton.n_states
+        codon_next = self.automaton.codon_next
+        tables = [None] * (len(residues) + 1)
+        tables[-1] = np.ones(n_states)
+        for i in range(len(residues) - 1, -1, -1):
+            indices, probabilities = self.options[residues[i]]
+            following = np.append(tables[i + 1], 0.0)  # DEAD (-1) indexes the trailing zero
+            tables[i] = following[codon_next[:, indices]] @ probabilities
+        # Lists with a trailing zero so DEAD (-1) indexes it directly
+        tables = [table.tolist() + [0.0] for table in tables]
+
+        if len(self.tables) >= self.cache_size:
+            self.tables.pop(next(iter(self.tables)))
+        self.tables[residues] = tables
+        return tables
+
+    def run(self, window: str, history: str = '', fixed_first: str = None):
+        """
+        Draws codons for every residue of `window` after `history`.
+
+        Parameters:
+            window (str): Amino acids to encode.
+            history (str): The sequence the codons will follow (only its last few bases are read).
+            fixed_first (str | None): A codon forced at the first position, e.g. a start codon.
+
+        Returns:
+            list[str] | None: The codons, or None when every encoding would contain a forbidden site.
+        """
+        automaton = self.automaton
+        state = automaton.state_after(history)
+        codons = []
+        residues = window
+        if fixed_first is not None:
+            state = automaton.advance(state, fixed_first)
+            if state == DEAD:
+                return None
+            codons.append(fixed_first)
+            residues = window[1:]
+
+        for aa in residues:
+            if aa not in self.options:
+                raise ValueError(f"Invalid amino acid: {aa}.")
+        tables = self._backward(residues)
+        if tables[0][state] <= 0:
+            return None
+
+        next_lists = self.next_lists
+        draws = self.rng.random(len(residues)).tolist()
+        for i, aa in enumerate(residues):
+            indices, probabilities = self.option_lists[aa]
+            following = tables[i + 1]
+            row = next_lists[state]
+            weights = [p * following[row[c]] for c, p in zip(indices, probabilities)]
+            target = draws[i] * sum(weights)
+            codon_id = None
+            for c, weight in zip(indices, weights):
+                if weight > 0:
+                    codon_id = c  # Falls through to the last allowed codon if rounding overshoots
+                    if target < weight:
+                        break
+                target -= weight
+            codons.append(automaton.codons[codon_id])
+            state = row[codon_id]
+        return codons
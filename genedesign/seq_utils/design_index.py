@@ -0,0 +1,184 @@
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class SharedSegment:
+    """
+    A stretch a query peptide shares exactly with an earlier design.
+
+    Attributes:
+        start (int): First residue of the stretch in the query.
+        end (int): One past its last residue in the query.
+        design_id (int): The earlier design, a key of DesignIndex.peptides.
+        design_start (int): Where the stretch starts in the earlier design.
+    """
+    start: int
+    end: int
+    design_id: int
+    design_start: int
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+def minimizers(peptide: str, k: int, w: int) -> list[tuple[int, str]]:
+    """
+    Returns the (position, k-mer) minimizers of a peptide: for every run of w consecutive k-mers, the
+    one with the smallest hash, each reported once. Two peptides that share a stretch of at least
+    w + k - 1 residues share at least one minimizer inside it.
+    """
+    n_kmers = len(peptide) - k + 1
+    if n_kmers <= 0:
+        return []
+    hashes = [zlib.crc32(peptide[i:i + k].encode('ascii')) for i in range(n_kmers)]
+    picked = []
+    last = -1
+    for start in range(max(1, n_kmers - w + 1)):
+        window = range(start, min(start + w, n_kmers))
+        best = min(window, key=lambda i: (hashes[i], i))
+        if best != last:
+            picked.append((best, peptide[best:best + k]))
+            last = best
+    return picked
+
+class DesignIndex:
+    """
+    A minimizer index over the peptides designed so far, used to warm-start new designs from earlier
+    ones that share long identical stretches (paralogs, shared domains, tags).
+
+    Every added design is filed under the minimizers of its peptide (stop included). A query looks up
+    its own minimizers, extends every seed hit to the maximal exact match on its diagonal, and keeps the
+    longest non-overlapping matches of at least min_shared residues. With k-mers of k residues and
+    windows of w k-mers, every shared stretch of w + k - 1 residues or more is found, while only about
+    2 / (w + 1) of the k-mers are stored. Residues in a few very common k-mers (low-complexity repeats)
+    are skipped past max_postings designs. Once max_designs designs are held, adding one evicts the
+    oldest, so long-lived designers keep a bounded index.
+
+    template() turns the matches into one codon (or None) per residue, which MonteCarlo.run uses as the
+    first proposal of each window, so the earlier codons are re-checked in their new context rather
+    than trusted.
+
+    Usage:
+        index = DesignIndex()
+        index.initiate()
+        template = index.template(peptide + '*')
+        ...design with the template...
+        index.add(peptide + '*', codons)  # validated codons only
+
+    Attributes:
+        k (int): Residues per indexed k-mer.
+        w (int): K-mers per minimizer window.
+        min_shared (int): Shortest shared stretch reused.
+        max_postings (int): Most designs filed under one minimizer.
+        max_designs (int): Most designs kept.
+        peptides (OrderedDict[int, str]): The designed peptides by design ID, oldest first.
+        codons (dict[int, list[str]]): The codons of every design by design ID.
+    """
+
+    def __init__(self):
+        self.k = 8
+        self.w = 8
+        self.min_shared = 15
+        self.max_postings = 64
+        self.max_designs = 10000
+        self.peptides = None
+        self.codons = None
+        self.postings = None
+        self.next_id = 0
+
+    def initiate(self) -> None:
+        self.peptides = OrderedDict()
+        self.codons = {}
+        self.postings = {}
+        self.next_id = 0
+
+    def add(self, peptide: str, codons: list[str]) -> int:
+        """
+        Files a finished design and returns its ID, evicting the oldest design when the index is full.
+        `peptide` has one residue per codon, so include the stop ('*') when the codons end with a stop
+        codon. Only add codons that passed every check: later designs propose them as they are.
+        """
+        if len(peptide) != len(codons):
+            raise ValueError("The design needs one codon per residue.")
+        design_id = self.next_id
+        self.next_id += 1
+        self.peptides[design_id] = peptide
+        self.codons[design_id] = list(codons)
+        for position, kmer in minimizers(peptide, self.k, self.w):
+            postings = self.postings.setdefault(kmer, [])
+            if len(postings) < self.max_postings:
+                postings.append((design_id, position))
+        while len(self.peptides) > self.max_designs:
+            self.remove(next(iter(self.peptides)))
+        return design_id
+
+    def remove(self, design_id: int) -> None:
+        """
+        Drops a design and its postings.
+        """
+        peptide = self.peptides.pop(design_id)
+        del self.codons[design_id]
+        for _, kmer in minimizers(peptide, self.k, self.w):
+            postings = self.postings.get(kmer)
+            if postings is None:
+                continue
+            postings[:] = [posting for posting in postings if posting[0] != design_id]
+            if not postings:
+                del self.postings[kmer]
+
+    def query(self, peptide: str) -> list[SharedSegment]:
+        """
+        Finds the stretches the peptide shares with earlier designs, sorted by position. The segments do
+        not overlap, and where several designs share a stretch the longest match is kept.
+        """
+        matches = []
+        extended = {}  # (design_id, diagonal) -> query end of the last extension on that diagonal
+        for position, kmer in minimizers(peptide, self.k, self.w):
+            for design_id, design_position in self.postings.get(kmer, ()):
+                diagonal = design_position - position
+                if extended.get((design_id, diagonal), -1) > position:
+                    continue
+                design = self.peptides[design_id]
+                start, design_start = position, design_position
+                while start > 0 and design_start > 0 and peptide[start - 1] == design[design_start - 1]:
+                    start -= 1
+                    design_start -= 1
+                end = position + self.k
+                while end < len(peptide) and end + diagonal < len(design) and peptide[end] == design[end + diagonal]:
+                    end += 1
+                extended[(design_id, diagonal)] = end
+                if end - start >= self.min_shared:
+                    matches.append(SharedSegment(start, end, design_id, design_start))
+
+        # Longest first, then trim each match to the residues no longer match has claimed
+        covered = [False] * len(peptide)
+        segments = []
+        for match in sorted(matches, key=lambda m: (-len(m), m.start, m.design_id)):
+            i = match.start
+            while i < match.end:
+                if covered[i]:
+                    i += 1
+                    continue
+                j = i
+                while j < match.end and not covered[j]:
+                    j += 1
+                if j - i >= self.min_shared:
+                    segments.append(SharedSegment(i, j, match.design_id, match.design_start + i - match.start))
+                    for position in range(i, j):
+                        covered[position] = True
+                i = j
+        return sorted(segments, key=lambda segment: segment.start)
+
+    def template(self, peptide: str) -> list:
+        """
+        Returns one entry per residue of the peptide: the codon an earlier design used for it where the
+        peptide shares a stretch with that design, None elsewhere.
+        """
+        template = [None] * len(peptide)
+        for segment in self.query(peptide):
+            codons = self.codons[segment.design_id]
+            template[segment.start:segment.end] = codons[segment.design_start:segment.design_start + len(segment)]
+        return template
+
+    def __len__(self) -> int:
+        return len(self.peptides)
@@ -0,0 +1,268 @@
+from dataclasses import dataclass
+from typing import Optional
+from genedesign.checkers.forbidden_sequence_checker import ForbiddenSequenceChecker
+from genedesign.checkers.internal_promoter_checker import PromoterChecker
+from genedesign.checkers import hairpin_checker as hairpin
+from genedesign.checkers.gc_content_checker import GC_LOWER_BOUND, GC_UPPER_BOUND
+from genedesign.seq_utils.hairpin_counter import hairpin_counter
+
+# Byte translation table: A/C/G/T (any case) -> 0/1/2/3, everything else -> 4
+SEPARATOR = 4
+_ENCODE_TABLE = bytearray([SEPARATOR] * 256)
+for _code, _bases in enumerate(("Aa", "Cc", "Gg", "Tt")):
+    for _base in _bases:
+        _ENCODE_TABLE[ord(_base)] = _code
+_ENCODE_TABLE = bytes(_ENCODE_TABLE)
+_COMPLEMENT = str.maketrans("ACGT", "TGCA")
+
+def encode_sequence(seq: str) -> bytes:
+    """
+    Encodes a DNA sequence as bytes of base codes (A=0, C=1, G=2, T=3) in a single C-level pass.
+
+    Raises:
+        ValueError: If the sequence contains characters other than A, C, G and T (in either case).
+    """
+    codes = str(seq).encode('ascii', errors='replace').translate(_ENCODE_TABLE)
+    if SEPARATOR in codes:
+        invalid_chars = {base for base, code in zip(str(seq), codes) if code == SEPARATOR}
+        raise ValueError(f"Invalid characters in sequence: {invalid_chars}")
+    return codes
+
+@dataclass(frozen=True)
+class FusedCheckResult:
+    """
+    The outcome of every sequence-level check computed in one pass.
+
+    Attributes:
+        forbidden_site (str | None): The first forbidden site (in checker list order) found on either strand.
+        promoter_sequence (str | None): The first 29 bp window scoring at or above the promoter threshold.
+        promoter_max_score (float): The highest promoter window score over both strands.
+        hairpin_counts (tuple[int, ...]): The hairpin count of every 50 bp chunk scanned by hairpin_checker.
+        hairpin_chunk (int | None): The start of the first chunk with too many hairpins.
+        gc_content (float): The GC fraction of the whole sequence.
+    """
+    forbidden_site: Optional[str]
+    promoter_sequence: Optional[str]
+    promoter_max_score: float
+    hairpin_counts: tuple
+    hairpin_chunk: Optional[int]
+    gc_content: float
+
+    @property
+    def passes_forbidden(self) -> bool:
+        return self.forbidden_site is None
+
+    @property
+    def passes_promoter(self) -> bool:
+        return self.promoter_sequence is None
+
+    @property
+    def passes_hairpin(self) -> bool:
+        return self.hairpin_chunk is None
+
+    @property
+    def passes_gc(self) -> bool:
+        return GC_LOWER_BOUND <= self.gc_content <= GC_UPPER_BOUND
+
+    @property
+    def passed(self) -> bool:
+        return self.passes_forbidden and self.passes_promoter and self.passes_hairpin and self.passes_gc
+
+class FusedSequenceChecker:
+    """
+    Runs the forbidden sequence, internal promoter, hairpin and GC content checks in a single traversal
+    of an integer-encoded sequence. The verdicts are identical to ForbiddenSequenceChecker.run,
+    PromoterChecker.run, hairpin_checker and gc_checker, but the sequence is upper-cased and encoded
+    once and the reverse strand is derived from the codes instead of being rebuilt by every checker.
+
+    Forbidden sites are matched on the forward strand only: a site occurs in the reverse complement
+    exactly when its own reverse complement occurs in the forward strand, so both orientations are
+    looked up in one table of rolling k-mer codes.
+    """
+
+    def __init__(self) -> None:
+        self.forbidden = None
+        self.site_codes = None
+        self.pwm_columns = None
+        self.sliding_frame = None
+        self.threshold = None
+
+    def initiate(self) -> None:
+        forbidden_checker = ForbiddenSequenceChecker()
+        forbidden_checker.initiate()
+        promoter_checker = PromoterChecker()
+        promoter_checker.initiate()
+
+        # Forbidden sites keyed by length, then by the base-4 integer of the site or of its reverse complement
+        self.forbidden = list(forbidden_checker.forbidden)
+        self.site_codes = {}
+        for index, site in enumerate(self.forbidden):
+            codes = encode_sequence(site)
+            rc_codes = bytes(3 - code for code in reversed(codes))
+            table = self.site_codes.setdefault(len(site), {})
+            for variant in (codes, rc_codes):
+                table.setdefault(self._kmer_int(variant), set()).add(index)
+
+        # PWM column-major with a zero weight for the strand separator
+        self.sliding_frame = promoter_checker.sliding_frame
+        self.threshold = promoter_checker.threshold
+        self.pwm_columns = [
+            [promoter_checker.pwm[y][x] for y in range(4)]
+            for x in range(self.sliding_frame)
+        ]
+
+    @staticmethod
+    def _kmer_int(codes) -> int:
+        value = 0
+        for code in codes:
+            value = value * 4 + code
+        return value
+
+    def run(self, seq: str) -> FusedCheckResult:
+        """
+        Checks the given DNA sequence against all four sequence checkers at once.
+
+        Parameters:
+            seq (str): A DNA sequence made of A, C, G and T.
+
+        Returns:
+            FusedCheckResult: The structured result of every check.
+
+        Raises:
+            ValueError: If the sequence is empty or contains invalid characters.
+        """
+        if not seq:
+            raise ValueError("The sequence is empty.")
+
+        codes = encode_sequence(seq)
+        n = len(codes)
+        # Forward strand, separator, reverse complement: the same layout PromoterChecker scans
+        combined = codes + bytes([SEPARATOR]) + bytes(3 - code for code in reversed(codes))
+        n_combined = len(combined)
+
+        # Forbidden site state
+        site_lengths = sorted(self.site_codes)
+        max_site_len = site_lengths[-1] if site_lengths else 0
+        site_masks = {length: 4 ** length - 1 for length in site_lengths}
+        rolling = 0
+        forbidden_hits = set()
+
+        # GC state
+        gc_count = 0
+
+        # Hairpin state: stems are MIN_STEM-mers, loops span MIN_LOOP..MAX_LOOP bases
+        k = hairpin.MIN_STEM
+        stem_mask = 4 ** k - 1
+        min_gap = k + hairpin.MIN_LOOP
+        max_gap = k + hairpin.MAX_LOOP
+        stems = [0] * max(n - k + 1, 0)
+        stem = 0
+        n_chunks = (n - hairpin.CHUNK_SIZE) // hairpin.OVERLAP + 1 if n >= hairpin.CHUNK_SIZE else 0
+        hairpin_counts = [0] * n_chunks
+
+        # Promoter state
+        frame = self.sliding_frame
+        pwm_columns = self.pwm_columns
+        last_window = n_combined - frame
+        promoter_start = None
+        promoter_max_score = float('-inf')
+
+        for t in range(n_combined):
+            if t < n:
+                code = combined[t]
+                if code == 1 or code == 2:
+                    gc_count += 1
+
+                # Rolling k-mer over the last max_site_len bases
+                rolling = ((rolling << 2) | code) & site_masks.get(max_site_len, 0)
+                for length in site_lengths:
+                    if t + 1 >= length:
+                        hit = self.site_codes[length].get(rolling & site_masks[length])
+                        if hit:
+                            forbidden_hits.update(hit)
+
+                # Stem ending at t starts at j = t - k + 1
+                stem = ((stem << 2) | code) & stem_mask
+                j = t - k + 1
+                if j >= 0:
+                    stems[j] = stem
+                    rc = 0
+                    s = stem
+                    for _ in range(k):
+                        rc = rc * 4 + (3 - (s & 3))
+                        s >>= 2
+                    # Pair every earlier stem i whose loop to j is within bounds
+                    for i in range(max(j - max_gap, 0), j - min_gap + 1):
+                        if stems[i] == rc:
+                            self._count_pair(hairpin_counts, i, j + k)
+
+            if t <= last_window:
+                score = 0.0
+                for x in range(frame):
+                    code = combined[t + x]
+                    if code != SEPARATOR:
+                        score += pwm_columns[x][code]
+                if score > promoter_max_score:
+                    promoter_max_score = score
+                if promoter_start is None and score >= self.threshold:
+                    promoter_start = t
+
+        forbidden_site = None
+        for index, site in enumerate(self.forbidden):
+            if index in forbidden_hits:
+                forbidden_site = site
+                break
+
+        promoter_sequence = None
+        if promoter_start is not None:
+            text = str(seq).upper()
+            strands = text + "x" + text[::-1].translate(_COMPLEMENT)
+            promoter_sequence = strands[promoter_start:promoter_start + frame]
+
+        hairpin_chunk = None
+        for chunk_index, count in enumerate(hairpin_counts):
+            if count > hairpin.MAX_HAIRPINS:
+                hairpin_chunk = chunk_index * hairpin.OVERLAP
+                break
+
+        if promoter_max_score == float('-inf'):
+            promoter_max_score = 0.0
+
+        return FusedCheckResult(
+            forbidden_site=forbidden_site,
+            promoter_sequence=promoter_sequence,
+            promoter_max_score=promoter_max_score,
+            hairpin_counts=tuple(hairpin_counts),
+            hairpin_chunk=hairpin_chunk,
+            gc_content=gc_count / n,
+        )
+
+    @staticmethod
+    def _count_pair(hairpin_counts, stem1_start, stem2_end):
+        """
+        Adds a hairpin spanning [stem1_start, stem2_end) to every chunk that fully contains it.
+        """
+        chunk_size = hairpin.CHUNK_SIZE
+        overlap = hairpin.OVERLAP
+        first = max(0, -(-(stem2_end - chunk_size) // overlap))
+        last = min(stem1_start // overlap, len(hairpin_counts) - 1)
+        for chunk_index in range(first, last + 1):
+            hairpin_counts[chunk_index] += 1
+
+    def hairpin_string(self, seq: str, result: FusedCheckResult) -> Optional[str]:
+        """
+        Rebuilds the hairpin_checker report for the first failing chunk. Only needed for reporting,
+        so it is computed on demand instead of during the scan.
+        """
+        if result.hairpin_chunk is None:
+            return None
+        chunk = str(seq)[result.hairpin_chunk:result.hairpin_chunk + hairpin.CHUNK_SIZE]
+        return hairpin_counter(chunk, hairpin.MIN_STEM, hairpin.MIN_LOOP, hairpin.MAX_LOOP)[1]
+
+if __name__ == "__main__":
+    checker = FusedSequenceChecker()
+    checker.initiate()
+
+    result = checker.run("TTGACAATTAATCATCGAACTAGTATAATGAATTCAAAAAAAACCCCAAAAAAAGGGGAAAAAAAAAAAAA")
+    print(result)
+    print(f"Passed: {result.passed}")
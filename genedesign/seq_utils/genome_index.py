@@ -0,0 +1,196 @@
+import mmap
+import os
+from Bio import SeqIO
+
+INDEX_VERSION = 1
+UTR_LENGTH = 50
+
+# Complements for every IUPAC nucleotide code, matching Bio.Seq.reverse_complement
+_COMPLEMENT = str.maketrans("ACGTMRWSYKVHDBNacgtmrwsykvhdbn", "TGCAKYWSRMBDHVNtgcakywsrmbdhvn")
+
+def _reverse_complement(seq: str) -> str:
+    return seq.translate(_COMPLEMENT)[::-1]
+
+def index_paths(genbank_file):
+    """
+    Returns the paths of the flat sequence file and the locus index stored next to a GenBank file.
+    """
+    return genbank_file + ".seq", genbank_file + ".idx"
+
+def build_genome_index(genbank_file, seq_path=None, index_path=None) -> None:
+    """
+    Parses a GenBank file once and writes two files next to it:
+        - <genbank>.seq: the sequences of all records, concatenated as plain ASCII.
+        - <genbank>.idx: a tab-separated index with one line per record and one line per gene locus,
+          holding the gene name, strand, span and CDS location parts needed to cut its UTR and CDS.
+
+    The index header records the size and modification time of the GenBank file, so a stale index
+    is detected and rebuilt automatically by GenomeIndex.
+
+    Gene selection follows extract_genes_info: every 'gene' feature whose locus_tag has a CDS is
+    indexed, the first CDS of a locus_tag is used, and later gene features overwrite earlier ones.
+    """
+    default_seq_path, default_index_path = index_paths(genbank_file)
+    seq_path = seq_path or default_seq_path
+    index_path = index_path or default_index_path
+    stat = os.stat(genbank_file)
+
+    records = []
+    loci = {}
+    offset = 0
+    with open(seq_path + ".tmp", 'w', encoding='ascii') as seq_out:
+        for record in SeqIO.parse(genbank_file, "genbank"):
+            sequence = str(record.seq)
+            seq_out.write(sequence)
+            records.append((record.id, offset, len(sequence)))
+
+            first_cds = {}
+            for feature in record.features:
+                if feature.type == "CDS":
+                    locus_tag = feature.qualifiers.get("locus_tag", [None])[0]
+                    first_cds.setdefault(locus_tag, feature)
+
+            for feature in record.features:
+                if feature.type != "gene":
+                    continue
+                locus_tag = feature.qualifiers.get("locus_tag", [None])[0]
+                cds_feature = first_cds.get(locus_tag)
+                if locus_tag is None or cds_feature is None:
+                    continue
+                location = cds_feature.location
+                parts = ','.join(f"{int(part.start)}:{int(part.end)}:{part.strand or 0}" for part in location.parts)
+                loci[locus_tag] = (
+                    feature.qualifiers.get("gene", [None])[0],
+                    len(records) - 1,
+                    location.strand or 0,
+                    int(location.start),
+                    int(location.end),
+                    parts,
+                )
+            offset += len(sequence)
+
+    with open(index_path + ".tmp", 'w') as index_out:
+        index_out.write(f"#version\t{INDEX_VERSION}\tsize\t{stat.st_size}\tmtime_ns\t{stat.st_mtime_ns}\n")
+        for record_id, record_offset, record_length in records:
+            index_out.write(f"record\t{record_id}\t{record_offset}\t{record_length}\n")
+        for locus_tag, (gene, record_index, strand, start, end, parts) in loci.items():
+            gene_field = '' if gene is None else gene
+            index_out.write(f"locus\t{locus_tag}\t{gene_field}\t{record_index}\t{strand}\t{start}\t{end}\t{parts}\n")
+
+    # Publish both files only once they are complete
+    os.replace(seq_path + ".tmp", seq_path)
+    os.replace(index_path + ".tmp", index_path)
+
+class GenomeIndex:
+    """
+    Lazy, memory-mapped access to the genes of a GenBank file.
+
+    The GenBank file is parsed only when its index is missing or stale. After that, opening the
+    index reads a small tab-separated file and memory-maps the flat genome sequence, so the genome
+    is paged in on demand and shared between processes. `get` cuts the UTR and CDS of one locus
+    straight from the mapping, with the same coordinates as extract_genes_info.
+
+    Usage:
+        index = GenomeIndex()
+        index.initiate("genedesign/data/Ecoli_sequence.gb")
+        info = index.get("b0001")  # {'gene': 'thrL', 'UTR': '...', 'CDS': 'ATG...'}
+    """
+
+    def __init__(self):
+        self.genbank_file = None
+        self.records = None
+        self.loci = None
+        self._file = None
+        self._sequence = None
+
+    def initiate(self, genbank_file, rebuild=False) -> None:
+        """
+        Opens the index for the given GenBank file, building it first if needed.
+
+        Raises:
+            FileNotFoundError: If neither the GenBank file nor a prebuilt index exists.
+        """
+        self.close()
+        self.genbank_file = genbank_file
+        seq_path, index_path = index_paths(genbank_file)
+        if rebuild or self._is_stale(genbank_file, seq_path, index_path):
+            if not os.path.exists(genbank_file):
+                raise FileNotFoundError(f"The file '{genbank_file}' does not exist or cannot be found.")
+            build_genome_index(genbank_file, seq_path, index_path)
+
+        self.records = []
+        self.loci = {}
+        with open(index_path, 'r') as f:
+            next(f)  # Header
+            for line in f:
+                fields = line.rstrip('\n').split('\t')
+                if fields[0] == "record":
+                    self.records.append((fields[1], int(fields[2]), int(fields[3])))
+                elif fields[0] == "locus":
+                    _, locus_tag, gene, record_index, strand, start, end, parts = fields
+                    self.loci[locus_tag] = (
+                        gene or None,
+                        int(record_index),
+                        int(strand),
+                        int(start),
+                        int(end),
+                        tuple(tuple(int(value) for value in part.split(':')) for part in parts.split(',')),
+                    )
+
+        self._file = open(seq_path, 'rb')
+        if os.fstat(self._file.fileno()).st_size:
+            self._sequence = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._sequence = b''
+
+    @staticmethod
+    def _is_stale(genbank_file, seq_path, index_path) -> bool:
+        if not (os.path.exists(seq_path) and os.path.exists(index_path)):
+            return True
+        if not os.path.exists(genbank_file):
+            return False  # A prebuilt index can be shipped without the GenBank file
+        stat = os.stat(genbank_file)
+        with open(index_path, 'r') as f:
+            header = f.readline().rstrip('\n').split('\t')
+        expected = ["#version", str(INDEX_VERSION), "size", str(stat.st_size), "mtime_ns", str(stat.st_mtime_ns)]
+        return header != expected
+
+    def _slice(self, record_index, start, end) -> str:
+        _, offset, length = self.records[record_index]
+        start = min(max(start, 0), length)
+        end = min(max(end, start), length)
+        return self._sequence[offset + start:offset + end].decode('ascii')
+
+    def get(self, locus_tag) -> dict:
+        """
+        Returns the gene name, 50 bp upstream UTR and CDS of a locus.
+
+        Raises:
+            KeyError: If the locus is not in the index.
+        """
+        gene, record_index, strand, start, end, parts = self.loci[locus_tag]
+        if strand == 1:
+            utr = self._slice(record_index, start - UTR_LENGTH, start)
+        else:
+            utr = _reverse_complement(self._slice(record_index, end, end + UTR_LENGTH))
+
+        pieces = []
+        for part_start, part_end, part_strand in parts:
+            piece = self._slice(record_index, part_start, part_end)
+            pieces.append(_reverse_complement(piece) if part_strand == -1 else piece)
+
+        return {"gene": gene, "UTR": utr, "CDS": ''.join(pieces)}
+
+    def __contains__(self, locus_tag) -> bool:
+        return locus_tag in self.loci
+
+    def __len__(self) -> int:
+        return len(self.loci)
+
+    def close(self) -> None:
+        if isinstance(self._sequence, mmap.mmap):
+            self._sequence.close()
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._sequence = None
@@ -1,5 +1,6 @@
 from Bio import SeqIO
 from collections import defaultdict
+from genedesign.seq_utils.genome_index import GenomeIndex
 
 # Function to extract UTR, gene, and CDS information from the GenBank file
 def extract_genes_info(genbank_file):
@@ -36,31 +37,45 @@ def extract_genes_info(genbank_file):
                     }
     return gene_dict
 
-def get_top_5_percent(file_path):
+def strip_taxon_prefix(tag):
     """
-    Extracts and returns the top 5% of tag:abundance pairs from a given text file.
+    Removes a leading NCBI taxon ID prefix such as "511145." (E. coli K-12 MG1655) or "4932."
+    (S. cerevisiae) from a protein abundance tag, returning the bare locus tag.
+    """
+    prefix, dot, locus_tag = tag.partition('.')
+    if dot and prefix.isdigit():
+        return locus_tag
+    return tag
+
+def get_top_percent(file_path, percentile=5.0):
+    """
+    Extracts and returns the top `percentile` percent of tag:abundance pairs from a given text file.
 
     This function reads a text file containing tab-delimited lines of 'tag' and 'abundance'
-    pairs. It strips the "511145." prefix from the tag and uses the remaining portion as the locus tag.
-    It sorts the pairs by abundance in descending order and extracts the top 5% of entries.
+    pairs. It strips the numeric taxon prefix (e.g. "511145.") from the tag and uses the remaining
+    portion as the locus tag. It sorts the pairs by abundance in descending order and extracts the
+    top entries.
 
     Args:
         file_path (str): The path to the input text file. The file should contain tab-delimited
-                         lines where each line consists of a 'tag' (prefixed by "511145.") and
-                         a corresponding 'abundance' value.
+                         lines where each line consists of a 'tag' (prefixed by a taxon ID such as
+                         "511145.") and a corresponding 'abundance' value.
+        percentile (float): The percentage of most abundant entries to keep, in (0, 100].
 
     Returns:
-        dict: A dictionary where the keys are the 'locus_tag' values (strings, without the "511145." prefix)
-              and the values are the corresponding 'abundance' (floats). This dictionary contains
-              only the top 5% of the highest abundance entries.
+        dict: A dictionary where the keys are the 'locus_tag' values (strings, without the taxon prefix)
+              and the values are the corresponding 'abundance' (floats), ordered by decreasing abundance.
 
     Raises:
         TypeError: If the file_path is not a string.
+        ValueError: If the percentile is not in (0, 100].
         FileNotFoundError: If the file at the specified path does not exist.
     """
 
     if not isinstance(file_path, str):
         raise TypeError("file_path must be a string representing the path to the input file.")
+    if not 0 < percentile <= 100:
+        raise ValueError(f"percentile must be in (0, 100], got {percentile}.")
 
     data = []
 
@@ -79,11 +94,7 @@ def get_top_5_percent(file_path):
                 tag, abundance = line_data
                 abundance = float(abundance)  # Convert abundance to float
 
-                # Remove "511145." prefix from the tag
-                if tag.startswith("511145."):
-                    tag = tag.split("511145.")[1]
-
-                data.append((tag, abundance))
+                data.append((strip_taxon_prefix(tag), abundance))
 
     except FileNotFoundError:
         raise FileNotFoundError(f"The file '{file_path}' does not exist or cannot be found.")
@@ -91,25 +102,31 @@ def get_top_5_percent(file_path):
     # Sort the data by abundance in descending order
     data.sort(key=lambda x: x[1], reverse=True)
 
-    # Calculate the number of entries that make up the top 5%
-    top_5_percent_count = int(len(data) * 0.05)
+    # Calculate the number of entries that make up the top percentile
+    top_count = int(len(data) * percentile / 100)
 
-    # Get the top 5% of entries
-    top_5_percent = data[:top_5_percent_count]
+    return dict(data[:top_count])
 
-    return dict(top_5_percent)
+def get_top_5_percent(file_path):
+    """
+    Extracts and returns the top 5% of tag:abundance pairs from a given text file.
+    See get_top_percent.
+    """
+    return get_top_percent(file_path, 5.0)
 
-def get_top_5_percent_utr_cds(locus_file_path, genbank_file_path):
+def get_top_percent_utr_cds(locus_file_path, genbank_file_path, percentile=5.0):
     """
-    Combines the top 5% of locus tags with their corresponding UTR, CDS, and gene name sequences.
+    Combines the top `percentile` percent of locus tags with their corresponding UTR, CDS, and gene name sequences.
 
-    This function first extracts the top 5% of locus tags based on abundance from the text file.
+    This function first extracts the top locus tags based on abundance from the text file.
     Then, it extracts the gene name, UTR (50 bp upstream), and CDS from the GenBank file for those
-    top 5% locus tags.
+    locus tags only, through a memory-mapped GenomeIndex built next to the GenBank file on
+    first use.
 
     Args:
         locus_file_path (str): Path to the text file with locus tags and abundances.
         genbank_file_path (str): Path to the GenBank file containing sequence info.
+        percentile (float): The percentage of most abundant locus tags to keep.
 
     Returns:
         dict: A dictionary where keys are locus tags, and values are dictionaries containing:
@@ -117,24 +134,31 @@ def get_top_5_percent_utr_cds(locus_file_path, genbank_file_path):
               - 'UTR': The upstream untranslated region (50 bp upstream of the CDS).
               - 'CDS': The coding sequence for that locus tag.
     """
-    # Step 1: Get the top 5% locus tags from the text file
-    top_5_percent_tags = get_top_5_percent(locus_file_path)
-
-    # Step 2: Extract all gene info from the GenBank file
-    gene_info = extract_genes_info(genbank_file_path)
-
-    # Step 3: Filter the gene info for only the top 5% locus tags
-    top_5_percent_info = {}
-    for locus_tag in top_5_percent_tags:
-        if locus_tag in gene_info:
-            # Add gene, UTR, and CDS to the result
-            top_5_percent_info[locus_tag] = {
-                "gene": gene_info[locus_tag]["gene"],
-                "UTR": gene_info[locus_tag]["UTR"],  # Using UTR (formerly "RBS")
-                "CDS": gene_info[locus_tag]["CDS"]
-            }
-
-    return top_5_percent_info
+    # Step 1: Get the top locus tags from the text file
+    top_tags = get_top_percent(locus_file_path, percentile)
+
+    # Step 2: Open the lazy genome index (parses the GenBank file only if the index is missing or stale)
+    genome = GenomeIndex()
+    genome.initiate(genbank_file_path)
+
+    # Step 3: Cut the gene info for only the top locus tags
+    top_info = {}
+    try:
+        for locus_tag in top_tags:
+            if locus_tag in genome:
+                # Add gene, UTR, and CDS to the result
+                top_info[locus_tag] = genome.get(locus_tag)  # Using UTR (formerly "RBS")
+    finally:
+        genome.close()
+
+    return top_info
+
+def get_top_5_percent_utr_cds(locus_file_path, genbank_file_path):
+    """
+    Combines the top 5% of locus tags with their corresponding UTR, CDS, and gene name sequences.
+    See get_top_percent_utr_cds.
+    """
+    return get_top_percent_utr_cds(locus_file_path, genbank_file_path, 5.0)
 
 # Example usage
 if __name__ == "__main__":
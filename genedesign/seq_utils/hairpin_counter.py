@@ -1,3 +1,4 @@
+from bisect import bisect_left, bisect_right
 from genedesign.seq_utils.reverse_complement import reverse_complement
 import numpy as np
 from numba import njit
@@ -47,6 +48,28 @@ def hairpin_counter(sequence, min_stem=3, min_loop=4, max_loop=9):
     # Return count and the formatted hairpin string, or None if no hairpins found
     return count, hairpin_string if count > 0 else None
 
+def hairpin_sites(sequence, min_stem=3, min_loop=4, max_loop=9) -> list[tuple[int, int]]:
+    """
+    Returns the extent of every hairpin hairpin_counter counts, as (start, end) intervals running from
+    the first base of the 5' stem to one past the last base of the 3' stem, in the order they are counted.
+    """
+    sites = []
+    seq_len = len(sequence)
+    # Start positions of every stem-length k-mer, so each stem only visits its actual partners
+    starts = {}
+    for j in range(seq_len - min_stem + 1):
+        starts.setdefault(sequence[j:j + min_stem], []).append(j)
+    # The reverse complement of sequence[i:i + min_stem] is a slice of the reversed strand
+    rc = reverse_complement(sequence)
+    for i in range(seq_len - min_stem - min_loop):
+        partners = starts.get(rc[seq_len - i - min_stem:seq_len - i])
+        if not partners:
+            continue
+        first = bisect_left(partners, i + min_stem + min_loop)
+        last = bisect_right(partners, i + min_stem + max_loop)
+        sites.extend((i, j + min_stem) for j in partners[first:last])
+    return sites
+
 def non_stupid_hairpin_counter(sequence, min_stem=3, min_loop=4, max_loop=9):
     """
     Counts the number of potential hairpin structures in a DNA sequence. Hairpins are common secondary structures
@@ -0,0 +1,71 @@
+from itertools import combinations
+import Levenshtein
+
+def deletion_variants(peptide: str, max_deletions: int) -> set[str]:
+    """
+    Returns every string obtained by deleting up to `max_deletions` residues from the peptide,
+    including the peptide itself.
+    """
+    variants = {peptide}
+    for n_deletions in range(1, min(max_deletions, len(peptide)) + 1):
+        for positions in combinations(range(len(peptide)), n_deletions):
+            skip = set(positions)
+            variants.add(''.join(residue for i, residue in enumerate(peptide) if i not in skip))
+    return variants
+
+class PeptideIndex:
+    """
+    A deletion-neighborhood index over short peptides (such as the first six amino acids of every
+    RBS option) that finds all peptides within a small edit distance of a query without scanning.
+
+    Two strings are within edit distance k only if deleting at most k residues from each makes them
+    equal, so every indexed peptide is filed under all of its up-to-k deletion variants. A query
+    generates its own variants, looks them up, and verifies the few hits with an exact distance.
+    For six-residue peptides and k = 2 that is 22 lookups per query regardless of the index size.
+
+    Attributes:
+        peptides (list[str]): The indexed peptides; a peptide's ID is its position in this list.
+        max_distance (int): The largest distance `query` reports.
+    """
+
+    def __init__(self):
+        self.peptides = None
+        self.max_distance = None
+        self.neighborhoods = None
+
+    def initiate(self, peptides, max_distance: int = 2) -> None:
+        self.peptides = list(peptides)
+        self.max_distance = max_distance
+        self.neighborhoods = {}
+        for peptide_id, peptide in enumerate(self.peptides):
+            for variant in deletion_variants(peptide, max_distance):
+                self.neighborhoods.setdefault(variant, []).append(peptide_id)
+
+    def query(self, peptide: str) -> dict[int, list[int]]:
+        """
+        Finds the indexed peptides within max_distance of the query.
+
+        Returns:
+            dict: {distance: [peptide IDs in increasing order]} for each distance from 0 to
+                  max_distance that has at least one match. Every peptide not listed is further
+                  than max_distance away.
+        """
+        candidates = set()
+        for variant in deletion_variants(peptide, self.max_distance):
+            candidates.update(self.neighborhoods.get(variant, ()))
+
+        groups = {}
+        for peptide_id in sorted(candidates):
+            distance = Levenshtein.distance(peptide, self.peptides[peptide_id], score_cutoff=self.max_distance)
+            if distance <= self.max_distance:
+                groups.setdefault(distance, []).append(peptide_id)
+        return dict(sorted(groups.items()))
+
+    def distance(self, peptide: str, peptide_id: int) -> int:
+        """
+        Returns the exact edit distance between the query and an indexed peptide.
+        """
+        return Levenshtein.distance(peptide, self.peptides[peptide_id])
+
+    def __len__(self) -> int:
+        return len(self.peptides)
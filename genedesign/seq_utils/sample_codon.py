@@ -19,6 +19,7 @@ class SampleCodon:
         self.codon_probabilities = None
         self.rng = None
         self.amino_acids = None
+        self.seed = None  # Set before initiate for reproducible sampling
 
     def initiate(self) -> None:
         """
@@ -34,7 +35,7 @@ class SampleCodon:
         Example:
         'A': (['GCT', 'GCC', 'GCA', 'GCG'], [0.4, 0.3, 0.2, 0.1])
         """
-        self.rng = np.random.default_rng()
+        self.rng = np.random.default_rng(self.seed)
 
         self.amino_acids = np.array([
                 'A', 'R', 'N', 'D', 'C', 
@@ -0,0 +1,133 @@
+import math
+
+class SequenceContext:
+    """
+    A fixed-size rolling view of the sequence a Monte Carlo search has committed so far, used to build
+    the window each candidate is checked in without joining or slicing the whole CDS.
+
+    The context holds the last `window_size` nucleotides of (UTR tail + committed codons) in a ring
+    buffer. `window(candidate)` overlays the candidate codons on the end of that history and returns
+    the check window: the most recent history nucleotides followed by the candidate, `window_size`
+    long in total once enough sequence exists. Building it costs O(window_size) whatever the CDS length.
+
+    Codon usage statistics for the committed codons (distinct codons, rare codon count and CAI
+    log-sum) are kept as running totals so a candidate's codon check is O(len(candidate)) as well.
+
+    Attributes:
+        window_size (int): Length of the check window in nucleotides.
+        utr_length (int): Most UTR nucleotides placed at the start of the history.
+        n_codons (int): Number of committed codons.
+    """
+
+    def __init__(self, window_size: int = 50, utr_length: int = 25):
+        self.window_size = window_size
+        self.utr_length = utr_length
+        self.codon_frequencies = None
+        self.rare_codons = None
+        self.buffer = None
+        self.head = 0
+        self.filled = 0
+        self.n_codons = 0
+        self.codon_counts = None
+        self.rare_count = 0
+        self.log_cai_sum = 0.0
+        self.codon_offset = 0
+        self.rare_offset = 0
+
+    def initiate(self, codon_frequencies: dict, rare_codons) -> None:
+        """
+        Sets the codon usage table the running codon statistics are computed against.
+        """
+        self.codon_frequencies = codon_frequencies
+        self.rare_codons = set(rare_codons)
+        self.reset()
+
+    def reset(self, utr: str = '') -> None:
+        """
+        Clears the history and starts a new design after the given UTR.
+        """
+        self.buffer = bytearray(self.window_size)
+        self.head = 0
+        self.filled = 0
+        self.n_codons = 0
+        self.codon_counts = {}
+        self.rare_count = 0
+        self.log_cai_sum = 0.0
+        self.codon_offset = 0
+        self.rare_offset = 0
+        if utr and self.utr_length:
+            self._push(utr[-self.utr_length:].encode('ascii'))
+
+    def place(self, codon_offset: int, rare_offset: int = 0) -> None:
+        """
+        Marks the context as a segment of a longer CDS: its first codon is codon `codon_offset` of the
+        CDS, and the codons before it may hold up to `rare_offset` rare codons. The codon checks then
+        apply the rare codon limit at the true position, counting that allowance against it. Diversity
+        and CAI stay local, since segments that pass them on their own also pass them when joined.
+        """
+        self.codon_offset = codon_offset
+        self.rare_offset = rare_offset
+
+    def _push(self, data: bytes) -> None:
+        size = self.window_size
+        data = data[-size:]
+        n = len(data)
+        end = self.head + n
+        if end <= size:
+            self.buffer[self.head:end] = data
+        else:
+            split = size - self.head
+            self.buffer[self.head:] = data[:split]
+            self.buffer[:n - split] = data[split:]
+        self.head = end % size
+        self.filled = min(size, self.filled + n)
+
+    def commit(self, codons: list[str]) -> None:
+        """
+        Appends accepted codons to the history and the codon statistics.
+        """
+        for codon in codons:
+            self.codon_counts[codon] = self.codon_counts.get(codon, 0) + 1
+            if codon in self.rare_codons:
+                self.rare_count += 1
+            self.log_cai_sum += math.log(self.codon_frequencies.get(codon, 0.01))
+        self.n_codons += len(codons)
+        self._push(''.join(codons).encode('ascii'))
+
+    def tail(self, length: int) -> str:
+        """
+        Returns the last `length` nucleotides of the history (fewer if less has been committed).
+        """
+        length = min(length, self.filled)
+        if length <= 0:
+            return ''
+        start = self.head - length
+        if start >= 0:
+            return self.buffer[start:self.head].decode('ascii')
+        return (self.buffer[start:] + self.buffer[:self.head]).decode('ascii')
+
+    def window(self, candidate: list[str]) -> str:
+        """
+        Returns the check window: the latest history followed by the candidate codons.
+        """
+        candidate_seq = ''.join(candidate)
+        return self.tail(self.window_size - len(candidate_seq)) + candidate_seq
+
+    def codon_stats(self, candidate: list[str]) -> tuple[int, int, int, float]:
+        """
+        Returns (number of codons, distinct codons, rare codon count, CAI) of the committed codons
+        followed by the candidate, matching CodonChecker.run on the concatenated list.
+        """
+        counts = self.codon_counts
+        new_codons = set()
+        rare_count = self.rare_count
+        log_cai_sum = self.log_cai_sum
+        for codon in candidate:
+            if codon not in counts:
+                new_codons.add(codon)
+            if codon in self.rare_codons:
+                rare_count += 1
+            log_cai_sum += math.log(self.codon_frequencies.get(codon, 0.01))
+        n = self.n_codons + len(candidate)
+        cai = math.exp(log_cai_sum / n) if n else 0.0
+        return n, len(counts) + len(new_codons), rare_count, cai
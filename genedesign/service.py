@@ -0,0 +1,470 @@
+import asyncio
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from genedesign.montecarlo import DesignCancelled
+from genedesign.operon_designer import OperonDesigner
+from genedesign.operon_to_seq import operon_to_seq
+from genedesign.models.composition import Composition
+from genedesign.transcript_designer import TranscriptDesigner
+
+# Request types understood by the service
+TRANSCRIPT = 'transcript'
+OPERON = 'operon'
+CANCEL = 'cancel'
+
+# Per-process state of a worker, filled in by _init_worker
+_worker = {}
+
+def default_designer_factory():
+    """
+    Builds and initiates the TranscriptDesigner each worker keeps warm.
+    """
+    designer = TranscriptDesigner()
+    designer.initiate()
+    return designer
+
+def _init_worker(designer_factory, cancel_flags):
+    """
+    Runs once in every worker process: pays the initiate() cost up front so requests only pay for
+    the design itself.
+    """
+    _worker['designer'] = designer_factory()
+    _worker['cancel_flags'] = cancel_flags
+
+def _ping():
+    return True
+
+def transcript_to_dict(transcript) -> dict:
+    return {
+        'gene': transcript.rbs.gene_name,
+        'utr': transcript.rbs.utr,
+        'cds': ''.join(transcript.codons),
+    }
+
+def _design_one(designer, job):
+    if job['type'] == OPERON:
+        composition = Composition(job.get('host', 'Ecoli'), job['promoter'], job['proteins'], job['terminator'])
+        operon_designer = OperonDesigner()
+        operon_designer.td = designer
+        operon = operon_designer.run(composition)
+        return {
+            'transcripts': [transcript_to_dict(mrna) for mrna in operon.transcripts],
+            'sequence': operon_to_seq(operon),
+        }
+    transcript = designer.run(job['peptide'], set())
+    return {'transcript': transcript_to_dict(transcript)}
+
+def _run_batch(jobs: list[dict]) -> list[dict]:
+    """
+    Designs a batch of jobs in a worker process, one after another on the warm designer.
+
+    Each job carries an absolute wall-clock deadline and a slot in the shared cancel flags. Both are
+    polled through the designer's stop hook between Monte Carlo windows, so an expired or cancelled
+    request stops within one window instead of running to completion.
+    """
+    designer = _worker['designer']
+    cancel_flags = _worker['cancel_flags']
+    results = []
+    for job in jobs:
+        deadline = job['deadline']
+        slot = job['slot']
+        should_stop = lambda: cancel_flags[slot] or time.time() > deadline
+        if should_stop():
+            results.append({'status': 'cancelled' if cancel_flags[slot] else 'timeout'})
+            continue
+
+        designer.set_stop_hook(should_stop)
+        start = time.perf_counter()
+        try:
+            result = _design_one(designer, job)
+            result['status'] = 'ok'
+        except DesignCancelled:
+            result = {'status': 'cancelled' if cancel_flags[slot] else 'timeout'}
+        except Exception as e:
+            result = {'status': 'error', 'error': f"Error: {str(e)}"}
+        finally:
+            designer.set_stop_hook(None)
+        result['seconds'] = time.perf_counter() - start
+        result['batch_size'] = len(jobs)
+        results.append(result)
+    return results
+
+class _Job:
+    """
+    A request waiting in, or dispatched from, the service queue.
+    """
+
+    __slots__ = ('request_id', 'payload', 'deadline', 'future', 'slot', 'state', 'waiting')
+
+    def __init__(self, request_id, payload, deadline, future, slot):
+        self.request_id = request_id
+        self.payload = payload
+        self.deadline = deadline
+        self.future = future
+        self.slot = slot
+        self.state = 'queued'   # queued -> running -> done
+        self.waiting = True     # False once submit() has returned
+
+class DesignService:
+    """
+    An asyncio front-end that serves transcript and operon designs from a pool of worker processes,
+    each holding an initiated designer.
+
+    Requests and responses are newline-delimited JSON objects over TCP:
+        {"id": 1, "type": "transcript", "peptide": "MYPF...", "deadline": 30}
+        {"id": 2, "type": "operon", "proteins": [...], "promoter": "...", "terminator": "..."}
+        {"id": 1, "type": "cancel"}
+    Every design request gets exactly one response with the same id and a status of 'ok', 'busy',
+    'timeout', 'cancelled' or 'error'. Responses on one connection may arrive out of order.
+
+    - Batching: queued jobs are grouped (up to batch_size, waiting at most batch_window seconds for a
+      batch to fill) and sent to a worker as one task, amortising the inter-process round trip.
+    - Backpressure: at most max_queue jobs wait for a worker. Further requests are answered 'busy'
+      immediately so clients can back off, and no more than one batch per worker is in flight.
+    - Deadlines: 'deadline' is seconds from receipt (default_deadline when absent). Expired jobs are
+      dropped before dispatch, and in-flight designs are stopped through the designer's stop hook.
+    - Cancellation: a cancel request or a client disconnect sets the job's slot in a shared flag
+      array, which the worker's stop hook polls between Monte Carlo windows.
+
+    Usage:
+        service = DesignService()
+        service.initiate()              # starts and warms the worker processes
+        await service.start()           # listens on host:port
+        ...
+        await service.stop()
+    """
+
+    def __init__(self):
+        self.host = '127.0.0.1'
+        self.port = 8765
+        self.workers = 2
+        self.batch_size = 4
+        self.batch_window = 0.01
+        self.max_queue = 64
+        self.default_deadline = 60.0
+        self.deadline_grace = 1.0  # Extra seconds a caller waits for a worker to report a timeout
+        self.designer_factory = default_designer_factory
+        self.pool = None
+        self.cancel_flags = None
+        self.free_slots = None
+        self.queue = None
+        self.server = None
+        self.jobs = None
+        self._dispatch_slots = None
+        self._batcher = None
+        self._inflight = None
+
+    def initiate(self) -> None:
+        """
+        Starts the worker processes and waits until every one has initiated its designer.
+        """
+        # One cancel flag per job that can exist at once: queued, being batched, or in flight
+        n_slots = self.max_queue + self.workers * self.batch_size + self.batch_size
+        self.cancel_flags = multiprocessing.RawArray('b', n_slots)
+        self.free_slots = list(range(n_slots))
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.designer_factory, self.cancel_flags),
+        )
+        for future in [self.pool.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+
+    async def start(self) -> None:
+        """
+        Starts the batcher and, if a port is set, the TCP listener. With port 0 the OS picks a free
+        port, which is written back to self.port.
+        """
+        self.queue = asyncio.Queue(self.max_queue)
+        self.jobs = {}
+        self._inflight = set()
+        self._dispatch_slots = asyncio.Semaphore(self.workers)
+        self._batcher = asyncio.create_task(self._batch_loop())
+        if self.port is not None:
+            self.server = await asyncio.start_server(self._handle_client, self.host, self.port)
+            self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """
+        Stops accepting connections, cancels all outstanding work and shuts the workers down.
+        """
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+        for job in list(self.jobs.values()):
+            self.cancel(job.request_id)
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+
+    async def submit(self, request: dict) -> dict:
+        """
+        Queues one design request and waits for its response. This is what the TCP handler calls
+        for every line, and it can be awaited directly when embedding the service.
+        """
+        request_id = request.get('id')
+        request_type = request.get('type', TRANSCRIPT)
+        if request_type not in (TRANSCRIPT, OPERON):
+            return {'id': request_id, 'status': 'error', 'error': f"Unknown request type: {request_type}"}
+        if request_type == TRANSCRIPT and not request.get('peptide'):
+            return {'id': request_id, 'status': 'error', 'error': "Transcript requests need a 'peptide'."}
+        if request_id in self.jobs:
+            return {'id': request_id, 'status': 'error', 'error': f"Request id {request_id} is already in use."}
+        if self.queue.full() or not self.free_slots:
+            return {'id': request_id, 'status': 'busy'}
+
+        deadline = time.time() + float(request.get('deadline', self.default_deadline))
+        payload = {key: value for key, value in request.items() if key not in ('id', 'deadline')}
+        payload['type'] = request_type
+        slot = self.free_slots.pop()
+        self.cancel_flags[slot] = 0
+        job = _Job(request_id, payload, deadline, asyncio.get_running_loop().create_future(), slot)
+        self.jobs[request_id] = job
+        self.queue.put_nowait(job)
+
+        try:
+            timeout = max(0.0, deadline - time.time()) + self.deadline_grace
+            result = await asyncio.wait_for(asyncio.shield(job.future), timeout)
+        except asyncio.TimeoutError:
+            self.cancel(request_id)
+            result = {'status': 'timeout'}
+        except asyncio.CancelledError:
+            self.cancel(request_id)
+            raise
+        finally:
+            self._release(job)
+        result['id'] = request_id
+        return result
+
+    def cancel(self, request_id) -> bool:
+        """
+        Cancels a queued or in-flight request. Returns False if the id is unknown.
+        """
+        job = self.jobs.get(request_id)
+        if job is None:
+            return False
+        self.cancel_flags[job.slot] = 1
+        if job.state == 'queued' and not job.future.done():
+            # Never reached a worker; the batcher will skip it
+            job.future.set_result({'status': 'cancelled'})
+        return True
+
+    def _release(self, job) -> None:
+        """
+        Called when submit() returns. The cancel flag slot is reused once no worker can read it.
+        """
+        job.waiting = False
+        if self.jobs.get(job.request_id) is job:
+            del self.jobs[job.request_id]
+        if job.state != 'running':
+            self.free_slots.append(job.slot)
+
+    async def _next_batch(self) -> list:
+        batch = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        batch_deadline = loop.time() + self.batch_window
+        while len(batch) < self.batch_size:
+            remaining = batch_deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _batch_loop(self) -> None:
+        while True:
+            await self._dispatch_slots.acquire()
+            try:
+                batch = await self._next_batch()
+            except asyncio.CancelledError:
+                self._dispatch_slots.release()
+                raise
+
+            now = time.time()
+            live = []
+            for job in batch:
+                if job.future.done():
+                    continue
+                if now > job.deadline:
+                    job.future.set_result({'status': 'timeout'})
+                    continue
+                live.append(job)
+
+            if not live:
+                self._dispatch_slots.release()
+                continue
+            task = asyncio.create_task(self._dispatch(live))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, jobs: list) -> None:
+        loop = asyncio.get_running_loop()
+        payloads = []
+        for job in jobs:
+            job.state = 'running'
+            payloads.append(dict(job.payload, deadline=job.deadline, slot=job.slot))
+        try:
+            results = await loop.run_in_executor(self.pool, _run_batch, payloads)
+        except Exception as e:
+            results = [{'status': 'error', 'error': f"Error: {str(e)}"}] * len(jobs)
+        finally:
+            self._dispatch_slots.release()
+
+        for job, result in zip(jobs, results):
+            job.state = 'done'
+            if not job.waiting:
+                # The caller gave up while the worker ran; the slot is free now
+                self.free_slots.append(job.slot)
+            elif not job.future.done():
+                job.future.set_result(dict(result))
+
+    async def _handle_client(self, reader, writer) -> None:
+        """
+        Serves one TCP connection: each line is a request, each response is written as soon as it
+        is ready. Requests still pending when the client disconnects are cancelled.
+        """
+        write_lock = asyncio.Lock()
+        pending = set()
+
+        async def respond(request):
+            response = await self.submit(request)
+            async with write_lock:
+                writer.write((json.dumps(response) + '\n').encode())
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as e:
+                    async with write_lock:
+                        writer.write((json.dumps({'id': None, 'status': 'error', 'error': f"Invalid JSON: {e}"}) + '\n').encode())
+                        await writer.drain()
+                    continue
+                if request.get('type') == CANCEL:
+                    self.cancel(request.get('id'))
+                    continue
+                task = asyncio.create_task(respond(request))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            for task in list(pending):
+                task.cancel()
+            writer.close()
+
+class DesignClient:
+    """
+    A minimal asyncio client for DesignService, used for local testing and scripting.
+
+    Usage:
+        async with DesignClient('127.0.0.1', 8765) as client:
+            response = await client.design_transcript("MYPFIRTARMTV", deadline=10)
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+        self.pending = {}
+        self.next_id = 0
+        self._reader_task = None
+
+    async def connect(self) -> None:
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self._reader_task = asyncio.create_task(self._read_responses())
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            await self.writer.wait_closed()
+            self.writer = None
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _read_responses(self) -> None:
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            response = json.loads(line)
+            future = self.pending.pop(response.get('id'), None)
+            if future is not None and not future.done():
+                future.set_result(response)
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Connection closed by the service."))
+
+    async def request(self, request: dict) -> dict:
+        """
+        Sends a request (an id is assigned if missing) and waits for its response.
+        """
+        if 'id' not in request:
+            request = dict(request, id=self.next_id)
+            self.next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request['id']] = future
+        self.writer.write((json.dumps(request) + '\n').encode())
+        await self.writer.drain()
+        return await future
+
+    async def design_transcript(self, peptide: str, deadline: float = None, request_id=None) -> dict:
+        request = {'type': TRANSCRIPT, 'peptide': peptide}
+        if deadline is not None:
+            request['deadline'] = deadline
+        if request_id is not None:
+            request['id'] = request_id
+        return await self.request(request)
+
+    async def design_operon(self, proteins: list[str], promoter: str, terminator: str, host: str = 'Ecoli', deadline: float = None) -> dict:
+        request = {'type': OPERON, 'proteins': proteins, 'promoter': promoter, 'terminator': terminator, 'host': host}
+        if deadline is not None:
+            request['deadline'] = deadline
+        return await self.request(request)
+
+    async def cancel(self, request_id) -> None:
+        self.writer.write((json.dumps({'type': CANCEL, 'id': request_id}) + '\n').encode())
+        await self.writer.drain()
+
+async def serve(service: DesignService) -> None:
+    """
+    Runs the service until the task is cancelled (e.g. by Ctrl-C under asyncio.run).
+    """
+    await service.start()
+    print(f"Design service listening on {service.host}:{service.port} with {service.workers} workers")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.stop()
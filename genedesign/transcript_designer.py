@@ -1,29 +1,242 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
 from genedesign.models.transcript import Transcript
+from genedesign.profiler import Profiler
+from genedesign.objective import Objective
+from genedesign.refiner import AnnealingRefiner
+from genedesign.repairer import CDSRepairer, RepairResult
+from genedesign.models.rbs_option import RBSOption
+from genedesign.seq_utils.Translate import Translate
+from genedesign.window_cache import WindowCache
+from genedesign.seq_utils.design_index import DesignIndex
 
 ## SEARCH ALGORITHMS
 from genedesign.montecarlo import MonteCarlo
 from genedesign.beam_search import BeamSearch
+@dataclass
+class AnytimeResult:
+    """
+    The best design found within a time budget.
+
+    Attributes:
+        transcript (Transcript): The complete design.
+        violations (list[Violation]): What the design still fails, in transcript (UTR + CDS) coordinates.
+        elapsed (float): Seconds spent on the design.
+        timed_out (bool): True if the deadline cut the search short.
+        improved (Future | None): With keep_improving, resolves to an AnytimeResult for the design
+            after a background repair pass.
+    """
+    transcript: Transcript
+    violations: list = field(default_factory=list)
+    elapsed: float = 0.0
+    timed_out: bool = False
+    improved: Optional[Future] = None
+
+    @property
+    def passed(self) -> bool:
+        return not self.violations
+
 class TranscriptDesigner:
 
     def __init__(self):
         self.search_algorithm = None
+        self.profiler = Profiler()
+        self.objective = None
+        self.refiner = None
+        self.refine_budget = 0.0  # Seconds of annealing refinement after the search; 0 disables it
+        self.repairer = None
+        self.translator = None
+        self.background_repairer = None
+        self.executor = None  # Runs background improvement, created on first use
+        self.window_cache = None  # Validated window designs shared by every run; set .path to persist them
+        self.design_index = None  # Earlier designs; new peptides sharing long stretches start from their codons
+        self.warm_start = True
 
     def initiate(self) -> None:
+        # One scoring objective for whichever search backend is used
+        if self.objective is None:
+            self.objective = Objective()
+            self.objective.initiate()
+
+        if self.window_cache is None:
+            self.window_cache = WindowCache()
+        if self.window_cache.entries is None:
+            self.window_cache.initiate()
+
+        if self.design_index is None:
+            self.design_index = DesignIndex()
+            self.design_index.initiate()
+
         # Monte Carlo Search
         self.search_algorithm = MonteCarlo()
+        self.search_algorithm.profiler = self.profiler
+        self.search_algorithm.objective = self.objective
+        self.search_algorithm.window_cache = self.window_cache
         self.search_algorithm.initiate()
 
         # Beam Search
         # self.search_algorithm = BeamSearch()
+        # self.search_algorithm.objective = self.objective
         # self.search_algorithm.initiate()
 
         # ML method??
 
-    def run(self, peptide: str, ignores: set) -> Transcript:
-        selectedRBS, codons = self.search_algorithm.run(peptide, ignores)
+        # Global refinement pass over the finished design
+        self.refiner = AnnealingRefiner()
+        self.refiner.objective = self.objective
+        self.refiner.profiler = self.profiler
+        self.refiner.initiate()
+
+        # Minimal-edit repair of existing CDSs, sharing the refiner's tables
+        self.repairer = CDSRepairer()
+        self.repairer.refiner = self.refiner
+        self.repairer.profiler = self.profiler
+        self.repairer.initiate()
+        # Background improvement gets its own repairer so it never shares the foreground profiler
+        self.background_repairer = CDSRepairer()
+        self.background_repairer.refiner = self.refiner
+        self.background_repairer.initiate()
+        self.translator = Translate()
+        self.translator.initiate()
+
+    def run(self, peptide: str, ignores: set, refine_budget: float = None, budget: float = None, deadline: float = None) -> Transcript:
+        """
+        Designs a transcript for the peptide. `refine_budget` overrides self.refine_budget for this
+        call, trading latency for fewer leftover violations.
+
+        `budget` (seconds from now) or `deadline` (a time.perf_counter() value) bounds the call: the
+        search spreads the time over its windows and returns its best complete design when it runs
+        out, and refinement only uses what is left.
+
+        With warm_start, stretches of at least design_index.min_shared residues the peptide shares with
+        an earlier design start from that design's codons (re-checked in their new context), so the
+        search mostly runs over the divergent parts and the junctions. A design is added to the index
+        (after refinement) only when every window of the search found a passing candidate in time.
+        """
+        if budget is not None:
+            deadline = time.perf_counter() + budget if deadline is None else min(deadline, time.perf_counter() + budget)
+
+        template = None
+        if self.warm_start:
+            template = self.design_index.template(peptide + '*')
+            if not any(template):
+                template = None
+
+        with self.profiler.stage('design'):
+            kwargs = {}
+            if deadline is not None:
+                kwargs['deadline'] = deadline
+            if template is not None:
+                kwargs['template'] = template
+            selectedRBS, codons = self.search_algorithm.run(peptide, ignores, **kwargs)
+
+        transcript = Transcript(selectedRBS, peptide, codons)
+        if deadline is not None:
+            if refine_budget is None:
+                refine_budget = self.refine_budget
+            refine_budget = min(refine_budget, max(0.0, deadline - time.perf_counter()))
+        transcript = self.refine(transcript, refine_budget)
+
+        # Only validated codons are worth proposing to later designs
+        if self.warm_start and not self.search_algorithm.timed_out and not self.search_algorithm.fallback_windows:
+            self.design_index.add(peptide + '*', transcript.codons)
+        return transcript
+
+    def run_anytime(self, peptide: str, ignores: set, budget: float = None, deadline: float = None,
+                    keep_improving: bool = False) -> AnytimeResult:
+        """
+        Designs a transcript within `budget` seconds (or by `deadline`) and reports what it still fails.
+
+        With keep_improving the design is also handed to a background thread that repairs the remaining
+        violations with minimal synonymous edits; result.improved resolves to the improved AnytimeResult.
+
+        Returns:
+            AnytimeResult: The best design found in time, its violations and timing.
+        """
+        start = time.perf_counter()
+        transcript = self.run(peptide, ignores, budget=budget, deadline=deadline)
+        elapsed = time.perf_counter() - start
+        violations = self.repairer.violations(transcript.codons, transcript.rbs.utr)
+        result = AnytimeResult(
+            transcript=transcript,
+            violations=violations,
+            elapsed=elapsed,
+            timed_out=bool(getattr(self.search_algorithm, 'timed_out', False)),
+        )
+        if keep_improving and violations:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=1)
+            result.improved = self.executor.submit(self._improve, transcript, start)
+        return result
+
+    def _improve(self, transcript: Transcript, start: float) -> AnytimeResult:
+        repaired = self.background_repairer.run(transcript.codons, transcript.rbs.utr)
+        improved = Transcript(transcript.rbs, transcript.peptide, repaired.codons)
+        return AnytimeResult(improved, repaired.violations, time.perf_counter() - start, False)
+
+    def refine(self, transcript: Transcript, time_budget: float = None) -> Transcript:
+        """
+        Runs the annealing refiner on a finished transcript for up to `time_budget` seconds
+        (self.refine_budget when None).
+        """
+        if time_budget is None:
+            time_budget = self.refine_budget
+        if time_budget <= 0:
+            return transcript
+        return self.refiner.run(transcript, time_budget)
+
+    def repair(self, codons: list[str], rbs: RBSOption = None, max_edits: int = None) -> RepairResult:
+        """
+        Repairs an existing CDS (e.g. from a collaborator) with a small set of synonymous substitutions
+        instead of redesigning it from the peptide. The protein is unchanged.
+
+        The repair is best-effort and the result may still fail: check result.passed and
+        result.violations. Violations the repairer cannot improve (mostly crowded hairpin chunks, and
+        anything inside the UTR) are left in place, and GC content is only checked over the whole CDS,
+        not per 50 bp window as during design.
+
+        Parameters:
+            codons (list[str]): The CDS, start codon to stop codon.
+            rbs (RBSOption | None): The RBS the CDS will follow. Its UTR is included in the sequence
+                checks, and the result carries the repaired Transcript.
+            max_edits (int | None): Most codons to change.
+
+        Returns:
+            RepairResult: The repaired codons, the edits made and any violations that remain.
+        """
+        utr = rbs.utr if rbs is not None else ''
+        result = self.repairer.run(codons, utr, max_edits)
+        if rbs is not None:
+            peptide = self.translator.run(''.join(result.codons))
+            result.transcript = Transcript(rbs, peptide, result.codons)
+        return result
+
+    def set_stop_hook(self, should_stop) -> None:
+        """
+        Installs a callable polled by the search between windows (and by the refiner between swaps).
+        When it returns True the search raises DesignCancelled and the refiner keeps its best result.
+        Pass None to remove the hook.
+        """
+        self.search_algorithm.should_stop = should_stop
+        self.refiner.should_stop = should_stop
+
+    def enable_profiling(self, enabled: bool = True) -> None:
+        """
+        Turns the pipeline instrumentation on or off. Counters are kept until reset_profile is called.
+        """
+        self.profiler.enabled = enabled
+
+    def reset_profile(self) -> None:
+        self.profiler.reset()
 
-        # Return the Transcript object
-        return Transcript(selectedRBS, peptide, codons)
+    def profile(self) -> dict:
+        """
+        Returns stage timings, Monte Carlo attempts per window and per-checker acceptance rates
+        collected since profiling was enabled.
+        """
+        return self.profiler.summary()
 
 if __name__ == "__main__":
     # Example usage of TranscriptDesigner
@@ -1,4 +1,27 @@
-from models.transcript import Transcript
+from typing import Iterator
+from genedesign.models.transcript import Transcript
+
+def transcript_parts(transcript: Transcript) -> Iterator[str]:
+    """
+    Yields the pieces of a transcript's mRNA sequence in order: the RBS in lowercase, then each codon
+    of the CDS in uppercase. Nothing is concatenated, so callers that write the pieces into a single
+    buffer or stream avoid building the CDS or a per-transcript string.
+
+    Parameters:
+        transcript (Transcript): The transcript object containing RBS, peptide, and codons.
+
+    Yields:
+        str: The lowercase RBS, followed by the uppercase codons.
+    """
+    yield transcript.rbs.utr.lower()
+    for codon in transcript.codons:
+        yield codon.upper()
+
+def transcript_length(transcript: Transcript) -> int:
+    """
+    Returns the length of the transcript's mRNA sequence without building it.
+    """
+    return len(transcript.rbs.utr) + sum(len(codon) for codon in transcript.codons)
 
 def transcript_to_seq(transcript: Transcript) -> str:
     """
@@ -10,8 +33,4 @@ def transcript_to_seq(transcript: Transcript) -> str:
     Returns:
         str: The mRNA sequence with the RBS in lowercase and the CDS in uppercase.
     """
-    # Build the mRNA sequence from the codons
-    codon_sequence = ''.join(transcript.codons)
-    
-    # Return the RBS (lowercase) concatenated with the codon sequence (uppercase)
-    return transcript.rbs.utr.lower() + codon_sequence.upper()
+    return ''.join(transcript_parts(transcript))
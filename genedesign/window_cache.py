@@ -0,0 +1,135 @@
+import os
+from collections import OrderedDict
+
+CACHE_VERSION = 1
+
+class WindowCache:
+    """
+    A bounded memo of validated window designs, so windows that come up again with the same upstream
+    sequence (linkers, His-tags, signal peptides, common motifs) cost a lookup instead of a search.
+
+    Entries map (amino-acid window, context tail, constraint key) to the codons a search accepted for
+    that window:
+    - the context tail is the last nucleotides before the window. MonteCarlo keys on only the last
+      cache_context nucleotides (6 by default), far less than its 50 bp check window sees, so hits are more
+      frequent but are not guaranteed to pass again;
+    - the constraint key identifies the constraint set (CheckSequence.constraint_key), so entries made
+      under other forbidden sites, thresholds or window sizes are never returned.
+    A hit is therefore a proposal: backends re-check it like any other candidate (sequence and codon
+    usage checks) and search as usual when it is rejected.
+
+    Entries are evicted least recently used once there are max_entries of them. With `path` set, the
+    cache is loaded in initiate() and written by save() as a tab-separated file, oldest entry first.
+
+    Usage:
+        cache = WindowCache()
+        cache.path = 'window_cache.tsv'  # optional
+        cache.initiate()
+        codons = cache.get(window, tail, constraints)
+        if codons is None:
+            codons = ...search...
+            cache.put(window, tail, constraints, codons)
+        cache.save()
+
+    Attributes:
+        max_entries (int): Most entries kept.
+        path (str | None): File the cache is loaded from and saved to.
+        hits, misses, stores, evictions (int): Counters since initiate() or reset_stats().
+    """
+
+    def __init__(self):
+        self.max_entries = 50000
+        self.path = None
+        self.entries = None
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def initiate(self) -> None:
+        self.entries = OrderedDict()
+        self.reset_stats()
+        if self.path is not None and os.path.exists(self.path):
+            self.load(self.path)
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def get(self, window: str, tail: str, constraints: str):
+        """
+        Returns the cached codons for the window after `tail` under `constraints`, or None.
+        """
+        key = (window, tail, constraints)
+        codons = self.entries.get(key)
+        if codons is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return list(codons)
+
+    def put(self, window: str, tail: str, constraints: str, codons: list[str]) -> None:
+        """
+        Stores the codons a search accepted for the window, evicting the least recently used entry
+        when the cache is full.
+        """
+        if len(codons) != len(window):
+            raise ValueError("The codons must encode the whole window.")
+        key = (window, tail, constraints)
+        self.entries[key] = tuple(codons)
+        self.entries.move_to_end(key)
+        self.stores += 1
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def save(self, path: str = None) -> None:
+        """
+        Writes the entries to `path` (self.path when None), replacing the file only once it is complete.
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path to save the window cache to.")
+        with open(path + ".tmp", 'w') as out:
+            out.write(f"#version\t{CACHE_VERSION}\n")
+            for (window, tail, constraints), codons in self.entries.items():
+                out.write(f"{constraints}\t{window}\t{tail}\t{''.join(codons)}\n")
+        os.replace(path + ".tmp", path)
+
+    def load(self, path: str) -> None:
+        """
+        Adds the entries saved in `path`, as most recently used. Files from another cache version are ignored.
+        """
+        with open(path, 'r') as f:
+            header = f.readline().rstrip('\n').split('\t')
+            if header != ['#version', str(CACHE_VERSION)]:
+                return
+            for line in f:
+                fields = line.rstrip('\n').split('\t')
+                if len(fields) != 4:
+                    continue
+                constraints, window, tail, cds = fields
+                self.entries[(window, tail, constraints)] = tuple(cds[i:i + 3] for i in range(0, len(cds), 3))
+                self.entries.move_to_end((window, tail, constraints))
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def summary(self) -> dict:
+        """
+        Returns the entry count and the lookup counters, with the hit rate over all lookups.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+        }
+
+    def __len__(self) -> int:
+        return len(self.entries)
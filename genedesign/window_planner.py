@@ -0,0 +1,85 @@
+class WindowPlanner:
+    """
+    Plans the Monte Carlo windows over a peptide adaptively, as an alternative to the fixed
+    sliding_window_generator.
+
+    Windows are yielded as index ranges (start, scope_end, end): residues [start, scope_end) are
+    committed after the window is searched, and [scope_end, end) is lookahead that is sampled and
+    checked but not committed. After searching each window the caller reports how it went through
+    record(attempts, accepted), and the next window is sized from that:
+    - accepted within `easy_attempts`: the region is easy, so the step widens by one codon (up to
+      max_in_scope) and any extra lookahead shrinks back towards n_ahead;
+    - fell back to the best candidate or needed at least `hard_attempts`: violations are clustering,
+      so the step halves (down to min_in_scope) and the lookahead grows by n_in_scope (up to
+      max_ahead) so the next windows see more of the difficult stretch before committing.
+
+    min_in_scope defaults to the fixed step: on random 250-aa proteins, steps below three codons
+    raised the number of windows and fallbacks, while the longer lookahead is what clears hard
+    stretches.
+
+    Usage:
+        planner = WindowPlanner()
+        planner.initiate()
+        for start, scope_end, end in planner.plan(len(peptide)):
+            ...search peptide[start:end], commit peptide[start:scope_end]...
+            planner.record(attempts, accepted)
+    """
+
+    def __init__(self):
+        self.n_in_scope = 3
+        self.n_ahead = 6
+        self.min_in_scope = 3
+        self.max_in_scope = 6
+        self.max_ahead = 9
+        self.easy_attempts = 1
+        self.hard_attempts = 20
+        self.scope = None
+        self.ahead = None
+        self.history = None
+
+    def initiate(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Restores the initial window size and clears the statistics, e.g. before a new peptide.
+        """
+        self.scope = self.n_in_scope
+        self.ahead = self.n_ahead
+        self.history = []
+
+    def plan(self, length: int, start: int = 0):
+        """
+        Yields (start, scope_end, end) index ranges covering [start, length). Each window is sized
+        when it is requested, so statistics recorded in between take effect immediately.
+        """
+        i = start
+        while i < length:
+            scope_end = min(length, i + self.scope)
+            end = min(length, scope_end + self.ahead)
+            yield i, scope_end, end
+            i = scope_end
+
+    def record(self, attempts: int, accepted: bool) -> None:
+        """
+        Feeds back the outcome of the window just searched and resizes the next one.
+        """
+        self.history.append((self.scope, self.ahead, attempts, accepted))
+        if not accepted or attempts >= self.hard_attempts:
+            self.scope = max(self.min_in_scope, self.scope // 2)
+            self.ahead = min(self.max_ahead, self.ahead + self.n_in_scope)
+        elif attempts <= self.easy_attempts:
+            self.scope = min(self.max_in_scope, self.scope + 1)
+            self.ahead = max(self.n_ahead, self.ahead - 1)
+
+    def summary(self) -> dict:
+        """
+        Returns window counts, total attempts and the mean step over the windows recorded since reset.
+        """
+        windows = len(self.history)
+        return {
+            'windows': windows,
+            'attempts': sum(attempts for _, _, attempts, _ in self.history),
+            'accepted': sum(1 for _, _, _, accepted in self.history if accepted),
+            'mean_in_scope': sum(scope for scope, _, _, _ in self.history) / windows if windows else 0.0,
+        }
@@ -1,4 +1,5 @@
 import csv
+import os
 import time
 import traceback
 from genedesign.checkers.codon_checker import CodonChecker
@@ -9,31 +10,30 @@ from genedesign.rbs_chooser import RBSChooser
 from genedesign.seq_utils.Translate import Translate
 from tests.benchmarking.proteome_benchmarker import generate_summary, validate_transcripts
 
-result_file_path = '/Users/ian/1 - Projects/HW/bioe134/bioe134-234-transcriptdesigner-project-3-aure-pine/tests/benchmarking/genome_benchmark_results/'
+result_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'genome_benchmark_results', '')
 
-def parse_fasta_gene_sequences(file_path):
+def iter_fasta_gene_sequences(file_path):
     """
-    Parses a FASTA file and returns a list of dictionaries with gene names and DNA sequences.
+    Lazily parses a FASTA file, yielding one dictionary with the gene name and DNA sequence per record.
 
     Args:
         file_path (str): Path to the FASTA file.
 
-    Returns:
-        list: A list of dictionaries, each with 'gene' and 'transcript' keys.
+    Yields:
+        dict: A dictionary with 'gene' and 'transcript' keys.
     """
-    gene_transcripts = []
     with open(file_path, 'r') as f:
         current_gene = None
         current_sequence = []
         for line in f:
             line = line.strip()
             if line.startswith('>'):
-                # If we have a current gene, save its sequence before moving to the next
+                # If we have a current gene, yield its sequence before moving to the next
                 if current_gene:
-                    gene_transcripts.append({
+                    yield {
                         'gene': current_gene,
                         'transcript': ''.join(current_sequence)
-                    })
+                    }
                 # Reset for the next gene
                 current_sequence = []
                 # Extract gene name from the header line using string methods
@@ -49,13 +49,24 @@ def parse_fasta_gene_sequences(file_path):
                     current_gene = None  # Handle the case where '[gene=' is missing
             else:
                 current_sequence.append(line)
-        # Save the last gene sequence after the loop ends
+        # Yield the last gene sequence after the loop ends
         if current_gene:
-            gene_transcripts.append({
+            yield {
                 'gene': current_gene,
                 'transcript': ''.join(current_sequence)
-            })
-    return gene_transcripts
+            }
+
+def parse_fasta_gene_sequences(file_path):
+    """
+    Parses a FASTA file and returns a list of dictionaries with gene names and DNA sequences.
+
+    Args:
+        file_path (str): Path to the FASTA file.
+
+    Returns:
+        list: A list of dictionaries, each with 'gene' and 'transcript' keys.
+    """
+    return list(iter_fasta_gene_sequences(file_path))
 
 # Example usage:
 # gene_list = parse_fasta_gene_sequences('path_to_your_file.txt')
@@ -94,6 +105,7 @@ def analyze_errors(error_results):
     Write the error analysis to a text file.
     """
     error_summary = {}
+    os.makedirs(result_file_path, exist_ok=True)
     with open(f'{result_file_path}error_summary.txt', 'w') as f:
         for error in error_results:
             error_message = error['error'].split("\n")[0]
@@ -181,6 +193,7 @@ def write_validation_report(validation_failures):
     """
     Writes validation results to a TSV file.
     """
+    os.makedirs(result_file_path, exist_ok=True)
     with open(f'{result_file_path}validation_failures.tsv', 'w', newline='') as f:
         writer = csv.writer(f, delimiter='\t')
         writer.writerow(['gene', 'protein', 'cds', 'site'])
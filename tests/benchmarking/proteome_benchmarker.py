@@ -5,16 +5,18 @@ import time
 from statistics import mean
 from genedesign.seq_utils.Translate import Translate
 from genedesign.transcript_designer import TranscriptDesigner
+from genedesign.models.compact_rbs_option import RBSRegistry
+from genedesign.models.compact_transcript import CompactTranscript
 from genedesign.checkers.forbidden_sequence_checker import ForbiddenSequenceChecker
 from genedesign.checkers.internal_promoter_checker import PromoterChecker
 from genedesign.checkers.hairpin_checker import hairpin_checker
 from genedesign.checkers.codon_checker import CodonChecker
 
-def parse_fasta(fasta_file):
+def iter_fasta(fasta_file):
     """
-    Parses the FASTA file to extract gene names and protein sequences.
+    Lazily parses the FASTA file, yielding (gene name, protein sequence) pairs one record at a time.
+    Only the record currently being read is held in memory.
     """
-    sequences = {}
     current_gene = None
     current_sequence = []
 
@@ -23,7 +25,7 @@ def parse_fasta(fasta_file):
             line = line.strip()
             if line.startswith(">"):
                 if current_gene:
-                    sequences[current_gene] = ''.join(current_sequence)
+                    yield current_gene, ''.join(current_sequence)
                 gene_name = None
                 parts = line.split()
                 for part in parts:
@@ -37,16 +39,25 @@ def parse_fasta(fasta_file):
             else:
                 current_sequence.append(line)
         if current_gene:
-            sequences[current_gene] = ''.join(current_sequence)
-    
-    return sequences
+            yield current_gene, ''.join(current_sequence)
+
+def parse_fasta(fasta_file):
+    """
+    Parses the FASTA file to extract gene names and protein sequences.
+    """
+    return dict(iter_fasta(fasta_file))
 
-def benchmark_proteome(fasta_file):
+def benchmark_proteome(fasta_file, designer=None, compact=True):
     """
     Benchmarks the proteome using TranscriptDesigner.
+
+    With compact=True the designed transcripts are kept as CompactTranscript objects (one byte per
+    codon, RBS referenced by ID) until validation, which keeps whole-proteome runs small in memory.
     """
-    designer = TranscriptDesigner()
-    designer.initiate()
+    if designer is None:
+        designer = TranscriptDesigner()
+        designer.initiate()
+    registry = RBSRegistry() if compact else None
 
     proteome = parse_fasta(fasta_file)
     successful_results = []
@@ -57,6 +68,8 @@ def benchmark_proteome(fasta_file):
             print(f"Processing gene: {gene} with protein sequence: {protein[:30]}...")
             ignores = set()
             transcript = designer.run(protein, ignores)
+            if registry is not None:
+                transcript = CompactTranscript.from_transcript(transcript, registry)
             successful_results.append({
                 'gene': gene,
                 'protein': protein,
@@ -84,21 +97,35 @@ def analyze_errors(error_results):
     
     return error_summary
 
-def validate_transcripts(successful_results):
+class TranscriptValidator:
     """
-    Validate the successful transcripts using various checkers, now including CodonChecker.
+    Validates one designed transcript at a time using the translation, hairpin, forbidden sequence,
+    promoter and codon usage checks. Holding the checkers in one object lets callers validate results
+    as they are produced instead of collecting them all first.
     """
-    forbidden_checker = ForbiddenSequenceChecker()
-    forbidden_checker.initiate()
-    promoter_checker = PromoterChecker()
-    promoter_checker.initiate()
-    translator = Translate()
-    translator.initiate()
-    codon_checker = CodonChecker()  # Initialize CodonChecker
-    codon_checker.initiate()  # Load the codon usage data
 
-    validation_failures = []
-    for result in successful_results:
+    def __init__(self):
+        self.forbidden_checker = None
+        self.promoter_checker = None
+        self.translator = None
+        self.codon_checker = None
+
+    def initiate(self) -> None:
+        self.forbidden_checker = ForbiddenSequenceChecker()
+        self.forbidden_checker.initiate()
+        self.promoter_checker = PromoterChecker()
+        self.promoter_checker.initiate()
+        self.translator = Translate()
+        self.translator.initiate()
+        self.codon_checker = CodonChecker()  # Initialize CodonChecker
+        self.codon_checker.initiate()  # Load the codon usage data
+
+    def run(self, result) -> list[dict]:
+        """
+        Returns the validation failures of a single successful result (a dict with 'gene', 'protein'
+        and 'transcript' keys). An empty list means the transcript passed every check.
+        """
+        validation_failures = []
         cds = ''.join(result['transcript'].codons)
         try:
             # Check if CDS length is a multiple of 3
@@ -107,7 +134,7 @@ def validate_transcripts(successful_results):
 
             # Verify that the translated protein matches the original protein
             original_protein = result['protein']
-            translated_protein = translator.run(cds)
+            translated_protein = self.translator.run(cds)
             if original_protein != translated_protein:
                 raise ValueError(f"Translation mismatch: Original {original_protein}, Translated {translated_protein}")
 
@@ -121,7 +148,7 @@ def validate_transcripts(successful_results):
                 'cds': cds,
                 'site': f"Translation or completeness error: {str(e)}"
             })
-            continue
+            return validation_failures
 
         # Validate against hairpins, forbidden sequences, and internal promoters
         transcript_dna = result['transcript'].rbs.utr.upper() + cds
@@ -135,7 +162,7 @@ def validate_transcripts(successful_results):
                 'site': f"Hairpin detected: {formatted_hairpin}"
             })
 
-        passed_forbidden, forbidden_site = forbidden_checker.run(transcript_dna)
+        passed_forbidden, forbidden_site = self.forbidden_checker.run(transcript_dna)
         if not passed_forbidden:
             validation_failures.append({
                 'gene': result['gene'],
@@ -144,7 +171,7 @@ def validate_transcripts(successful_results):
                 'site': f"Forbidden sequence: {forbidden_site}"
             })
 
-        passed_promoter, found_promoter = promoter_checker.run(transcript_dna)
+        passed_promoter, found_promoter = self.promoter_checker.run(transcript_dna)
         if not passed_promoter:
             validation_failures.append({
                 'gene': result['gene'],
@@ -153,7 +180,7 @@ def validate_transcripts(successful_results):
                 'site': f"Constitutive promoter detected: {found_promoter}" if found_promoter else "Constitutive promoter detected"
             })
 
-        codons_above_board, codon_diversity, rare_codon_count, cai_value = codon_checker.run(result['transcript'].codons)
+        codons_above_board, codon_diversity, rare_codon_count, cai_value = self.codon_checker.run(result['transcript'].codons)
         if not codons_above_board:
             validation_failures.append({
                 'gene': result['gene'],
@@ -161,6 +188,19 @@ def validate_transcripts(successful_results):
                 'cds': cds,
                 'site': f"Codon usage check failed: Diversity={codon_diversity}, Rare Codons={rare_codon_count}, CAI={cai_value}"
             })
+
+        return validation_failures
+
+def validate_transcripts(successful_results):
+    """
+    Validate the successful transcripts using various checkers, now including CodonChecker.
+    """
+    validator = TranscriptValidator()
+    validator.initiate()
+
+    validation_failures = []
+    for result in successful_results:
+        validation_failures.extend(validator.run(result))
     
     return validation_failures
 
@@ -174,6 +214,30 @@ def write_validation_report(validation_failures):
         for failure in validation_failures:
             writer.writerow([failure['gene'], failure['protein'], failure['cds'], failure['site']])
 
+CHECKER_CATEGORIES = [
+    'Forbidden Sequence Checker',
+    'Hairpin Checker',
+    'Codon Usage Checker',
+    'Promoter Checker',
+    'Translation/Completeness Checker',
+]
+
+def categorize_failure(site):
+    """
+    Maps a validation failure site message to the name of the checker that produced it, or None if unknown.
+    """
+    if "Forbidden sequence" in site:
+        return 'Forbidden Sequence Checker'
+    elif "Hairpin detected" in site:
+        return 'Hairpin Checker'
+    elif "Codon usage check failed" in site:
+        return 'Codon Usage Checker'
+    elif "Constitutive promoter detected" in site:
+        return 'Promoter Checker'
+    elif "Translation or completeness error" in site:
+        return 'Translation/Completeness Checker'
+    return None
+
 def generate_summary(total_genes, parsing_time, execution_time, errors_summary, validation_failures):
     """
     Generates a streamlined summary report categorizing validation failures by checker.
@@ -181,27 +245,13 @@ def generate_summary(total_genes, parsing_time, execution_time, errors_summary,
     total_validation_failures = len(validation_failures)
     
     # Categorize failures by checker type
-    checker_failures = {
-        'Forbidden Sequence Checker': 0,
-        'Hairpin Checker': 0,
-        'Codon Usage Checker': 0,
-        'Promoter Checker': 0,
-        'Translation/Completeness Checker': 0
-    }
+    checker_failures = {checker: 0 for checker in CHECKER_CATEGORIES}
 
     # Increment the appropriate checker category based on the failure site
     for failure in validation_failures:
-        site = failure['site']
-        if "Forbidden sequence" in site:
-            checker_failures['Forbidden Sequence Checker'] += 1
-        elif "Hairpin detected" in site:
-            checker_failures['Hairpin Checker'] += 1
-        elif "Codon usage check failed" in site:
-            checker_failures['Codon Usage Checker'] += 1
-        elif "Constitutive promoter detected" in site:
-            checker_failures['Promoter Checker'] += 1
-        elif "Translation or completeness error" in site:
-            checker_failures['Translation/Completeness Checker'] += 1
+        checker = categorize_failure(failure['site'])
+        if checker:
+            checker_failures[checker] += 1
 
     # Generate the summary report
     with open('summary_report.txt', 'w') as f:
@@ -224,15 +274,28 @@ def generate_summary(total_genes, parsing_time, execution_time, errors_summary,
         for checker, count in checker_failures.items():
             f.write(f"- {checker}: {count} occurrences\n")
 
+def write_profile_summary(designer, profile_path='profile_summary.txt'):
+    """
+    Writes the designer's stage timings, Monte Carlo attempts and checker acceptance rates to a text file.
+    """
+    report = designer.profiler.report()
+    with open(profile_path, 'w') as f:
+        f.write(report + "\n")
+    return report
+
 def run_benchmark(fasta_file):
     """
     Runs the complete benchmark process: parsing, running TranscriptDesigner, validating, and generating reports.
     """
     start_time = time.time()
+
+    designer = TranscriptDesigner()
+    designer.initiate()
+    designer.enable_profiling()
     
     # Benchmark the proteome
     parsing_start = time.time()
-    successful_results, error_results = benchmark_proteome(fasta_file)
+    successful_results, error_results = benchmark_proteome(fasta_file, designer)
     parsing_time = time.time() - parsing_start
     
     # Analyze and log errors
@@ -250,6 +313,9 @@ def run_benchmark(fasta_file):
     total_genes = len(successful_results) + len(error_results)
     generate_summary(total_genes, parsing_time, execution_time, errors_summary, validation_failures)
 
+    # Report where the design time went
+    print(write_profile_summary(designer))
+
 if __name__ == "__main__":
     fasta_file = "tests/benchmarking/uniprotkb_proteome_UP000054015_2024_09_24.fasta"
     run_benchmark(fasta_file)
@@ -0,0 +1,136 @@
+import argparse
+import time
+import tracemalloc
+import numpy as np
+from genedesign.transcript_designer import TranscriptDesigner
+from tests.benchmarking.synthetic_inputs import random_protein, synthetic_rbs_library
+
+DEFAULT_LENGTHS = [50, 100, 200, 500, 1000, 2000, 5000]
+DEFAULT_SEED = 134
+
+def build_designer(seed=DEFAULT_SEED):
+    """
+    Builds a TranscriptDesigner with a seeded codon sampler, the synthetic RBS library and profiling
+    enabled. Warm starts from earlier designs are off, so repeated proteins are designed from scratch.
+    """
+    with synthetic_rbs_library():
+        designer = TranscriptDesigner()
+        designer.warm_start = False
+        designer.initiate()
+    designer.enable_profiling()
+    reseed(designer, seed)
+    return designer
+
+def reseed(designer, seed):
+    """
+    Reseeds both codon samplers of the designer's search, resets its learned check order and empties
+    its window cache and design index, so a design depends only on the seed and measures a cold search,
+    however many designs the designer ran before.
+    """
+    search = designer.search_algorithm
+    search.sampler.rng = np.random.default_rng(seed)
+    search.constrained_sampler.rng = np.random.default_rng(seed)
+    search.checker.reset_check_order()
+    designer.window_cache.initiate()
+    designer.design_index.initiate()
+
+def measure_length(designer, length, seed=DEFAULT_SEED, track_memory=True):
+    """
+    Designs one synthetic protein of the given length and returns its cost.
+
+    Time and attempts come from an untraced run. Peak memory comes from a second run of the same
+    seeded design under tracemalloc, because tracing slows allocation-heavy code several fold.
+
+    Returns:
+        dict: length, seconds, attempts (Monte Carlo candidates sampled), windows and peak_bytes.
+    """
+    protein = random_protein(length, seed=seed + length)
+
+    reseed(designer, seed + length)
+    designer.reset_profile()
+    start_time = time.perf_counter()
+    designer.run(protein, set())
+    seconds = time.perf_counter() - start_time
+    windows = designer.profile()['windows']
+
+    peak_bytes = None
+    if track_memory:
+        reseed(designer, seed + length)
+        tracemalloc.start()
+        try:
+            designer.run(protein, set())
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'length': length,
+        'seconds': seconds,
+        'attempts': windows['attempts'],
+        'windows': windows['total'],
+        'peak_bytes': peak_bytes,
+    }
+
+def fit_exponent(lengths, values) -> float:
+    """
+    Fits values ~ c * length^k by least squares in log-log space and returns k.
+    An exponent near 1 means linear scaling; near 2 means quadratic.
+    """
+    points = [(n, v) for n, v in zip(lengths, values) if v is not None and v > 0]
+    if len(points) < 2:
+        return float('nan')
+    log_n = np.log([n for n, _ in points])
+    log_v = np.log([v for _, v in points])
+    slope, _ = np.polyfit(log_n, log_v, 1)
+    return float(slope)
+
+def run_scaling_benchmark(lengths=DEFAULT_LENGTHS, seed=DEFAULT_SEED, track_memory=True, designer=None):
+    """
+    Measures design cost across protein lengths and fits the empirical complexity of each metric.
+
+    Returns:
+        dict: 'rows' with one measurement per length and 'exponents' with the fitted exponent
+              for seconds, attempts and peak_bytes.
+    """
+    if designer is None:
+        designer = build_designer(seed)
+
+    rows = []
+    for length in lengths:
+        row = measure_length(designer, length, seed, track_memory)
+        print(f"{length} aa: {row['seconds']:.2f} s, {row['attempts']} attempts")
+        rows.append(row)
+
+    lengths = [row['length'] for row in rows]
+    exponents = {
+        metric: fit_exponent(lengths, [row[metric] for row in rows])
+        for metric in ('seconds', 'attempts', 'peak_bytes')
+    }
+    return {'rows': rows, 'exponents': exponents}
+
+def format_scaling_report(result) -> str:
+    lines = [f"{'length (aa)':>12}{'seconds':>12}{'us/aa':>10}{'attempts':>10}{'att/window':>12}{'peak MiB':>10}"]
+    for row in result['rows']:
+        peak = f"{row['peak_bytes'] / 2 ** 20:10.2f}" if row['peak_bytes'] is not None else f"{'-':>10}"
+        per_window = row['attempts'] / row['windows'] if row['windows'] else 0.0
+        lines.append(f"{row['length']:>12}{row['seconds']:>12.3f}{row['seconds'] / row['length'] * 1e6:>10.0f}"
+                     f"{row['attempts']:>10}{per_window:>12.2f}{peak}")
+
+    lines.append("\nEmpirical complexity (cost ~ length^k):")
+    for metric, exponent in result['exponents'].items():
+        lines.append(f"- {metric}: k = {exponent:.2f}")
+    return '\n'.join(lines)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report designer cost versus protein length.")
+    parser.add_argument('--lengths', type=int, nargs='+', default=DEFAULT_LENGTHS)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--no-memory', action='store_true', help="Skip the tracemalloc pass.")
+    parser.add_argument('--output', default='scaling_report.txt')
+    args = parser.parse_args()
+
+    result = run_scaling_benchmark(args.lengths, args.seed, track_memory=not args.no_memory)
+    report = format_scaling_report(result)
+    with open(args.output, 'w') as f:
+        f.write(report + '\n')
+    print(report)
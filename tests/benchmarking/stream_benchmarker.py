@@ -0,0 +1,254 @@
+import csv
+import json
+import os
+import time
+from genedesign.transcript_designer import TranscriptDesigner
+from tests.benchmarking.proteome_benchmarker import iter_fasta, TranscriptValidator, CHECKER_CATEGORIES, categorize_failure, write_profile_summary
+
+# Columns written for every processed record, in order
+RESULT_FIELDS = ['record', 'gene', 'protein', 'status', 'utr', 'cds', 'failures', 'error']
+
+def iter_records(fasta_file, skip=0):
+    """
+    Yields (record index, gene, protein) for every FASTA record, skipping the first `skip` records.
+    Records are numbered by their position in the file, so duplicated gene names stay distinct.
+    """
+    for index, (gene, protein) in enumerate(iter_fasta(fasta_file)):
+        if index < skip:
+            continue
+        yield index, gene, protein
+
+def design_stream(designer, records):
+    """
+    Designs one transcript per record as the records are pulled, yielding a result dict per record.
+    Failed designs yield a dict with an 'error' key instead of a 'transcript' key.
+    """
+    for index, gene, protein in records:
+        try:
+            transcript = designer.run(protein, set())
+            yield {'record': index, 'gene': gene, 'protein': protein, 'transcript': transcript}
+        except Exception as e:
+            yield {'record': index, 'gene': gene, 'protein': protein, 'error': f"Error: {str(e)}"}
+
+def validate_stream(results, validator):
+    """
+    Validates each designed result as it arrives and yields a flat row ready to be written out.
+    """
+    for result in results:
+        row = {
+            'record': result['record'],
+            'gene': result['gene'],
+            'protein': result['protein'],
+            'status': 'error',
+            'utr': '',
+            'cds': '',
+            'failures': [],
+            'error': result.get('error', ''),
+        }
+        if 'transcript' in result:
+            transcript = result['transcript']
+            failures = validator.run(result)
+            row['status'] = 'failed' if failures else 'passed'
+            row['utr'] = transcript.rbs.utr
+            row['cds'] = ''.join(transcript.codons)
+            row['failures'] = [failure['site'] for failure in failures]
+        yield row
+
+class ResultWriter:
+    """
+    Appends one row per finished record to a TSV or JSONL file, flushing after every row so a crash
+    loses at most the record in flight. Opening an existing file in resume mode drops any partially
+    written trailing line and reports how many records were already completed.
+
+    Attributes:
+        path (str): The output file.
+        fmt (str): Either 'tsv' or 'jsonl'. Inferred from the file extension when not given.
+        completed (int): Number of records already present in the file (the next record index to process).
+    """
+
+    def __init__(self, path, fmt=None, fsync=False):
+        if fmt is None:
+            fmt = 'jsonl' if path.endswith(('.jsonl', '.json')) else 'tsv'
+        if fmt not in ('tsv', 'jsonl'):
+            raise ValueError(f"Unsupported result format: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self.fsync = fsync
+        self.completed = 0
+        self._file = None
+        self._writer = None
+
+    def open(self, resume=True) -> int:
+        """
+        Opens the output file for appending. Returns the number of records already completed.
+        """
+        if resume and os.path.exists(self.path):
+            self.completed = self._recover()
+        else:
+            self.completed = 0
+            with open(self.path, 'w', newline='') as f:
+                if self.fmt == 'tsv':
+                    f.write('\t'.join(RESULT_FIELDS) + '\n')
+
+        self._file = open(self.path, 'a', newline='')
+        if self.fmt == 'tsv':
+            self._writer = csv.writer(self._file, delimiter='\t', lineterminator='\n')
+        return self.completed
+
+    def _recover(self) -> int:
+        """
+        Truncates the file after its last complete line and returns the index following the last
+        completed record.
+        """
+        last_complete_line = None
+        good_length = 0
+        with open(self.path, 'rb') as f:
+            offset = 0
+            for line in f:
+                offset += len(line)
+                if line.endswith(b'\n'):
+                    good_length = offset
+                    last_complete_line = line
+        with open(self.path, 'rb+') as f:
+            f.truncate(good_length)
+
+        if last_complete_line is None:
+            # Nothing usable survived; start over with a fresh header
+            with open(self.path, 'w', newline='') as f:
+                if self.fmt == 'tsv':
+                    f.write('\t'.join(RESULT_FIELDS) + '\n')
+            return 0
+
+        text = last_complete_line.decode('utf-8').rstrip('\n')
+        if self.fmt == 'jsonl':
+            return json.loads(text)['record'] + 1
+        first_field = text.split('\t', 1)[0]
+        return int(first_field) + 1 if first_field != 'record' else 0
+
+    def write(self, row) -> None:
+        """
+        Writes a single result row and flushes it to disk.
+        """
+        if self.fmt == 'jsonl':
+            self._file.write(json.dumps({field: row[field] for field in RESULT_FIELDS}) + '\n')
+        else:
+            values = []
+            for field in RESULT_FIELDS:
+                value = row[field]
+                if isinstance(value, list):
+                    value = ' | '.join(value)
+                values.append(str(value).replace('\t', ' ').replace('\n', ' '))
+            self._writer.writerow(values)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.completed = row['record'] + 1
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def iter_result_rows(path, fmt=None):
+    """
+    Reads a result file written by ResultWriter back one row at a time.
+    """
+    if fmt is None:
+        fmt = 'jsonl' if path.endswith(('.jsonl', '.json')) else 'tsv'
+    with open(path, 'r', newline='') as f:
+        if fmt == 'jsonl':
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            for row in csv.DictReader(f, delimiter='\t'):
+                row['record'] = int(row['record'])
+                row['failures'] = row['failures'].split(' | ') if row['failures'] else []
+                yield row
+
+def summarize_results(path, fmt=None):
+    """
+    Streams over a result file and tallies records, exceptions and validation failures by checker.
+    Only the counters are kept in memory.
+    """
+    summary = {
+        'total': 0,
+        'errors': {},
+        'validation_failures': 0,
+        'checker_failures': {checker: 0 for checker in CHECKER_CATEGORIES},
+    }
+    for row in iter_result_rows(path, fmt):
+        summary['total'] += 1
+        if row['status'] == 'error':
+            message = row['error'].split("\n")[0]
+            summary['errors'][message] = summary['errors'].get(message, 0) + 1
+        for site in row['failures']:
+            summary['validation_failures'] += 1
+            checker = categorize_failure(site)
+            if checker:
+                summary['checker_failures'][checker] += 1
+    return summary
+
+def write_stream_summary(summary, runtime, summary_path='summary_report.txt'):
+    """
+    Writes the summary in the same layout as the in-memory proteome benchmark report.
+    """
+    with open(summary_path, 'w') as f:
+        f.write(f"Total genes processed: {summary['total']}\n")
+        f.write(f"Streaming runtime: {runtime:.2f} seconds\n")
+        f.write(f"Total exceptions: {sum(summary['errors'].values())}\n")
+
+        if summary['errors']:
+            f.write(f"\nTop 3 most common exceptions:\n")
+            for error, count in sorted(summary['errors'].items(), key=lambda x: x[1], reverse=True)[:3]:
+                f.write(f"- {error}: {count} occurrences\n")
+        else:
+            f.write("No exceptions encountered.\n")
+
+        f.write(f"\nTotal validation failures: {summary['validation_failures']}\n")
+
+        f.write("\nValidation Failures by Checker:\n")
+        for checker, count in summary['checker_failures'].items():
+            f.write(f"- {checker}: {count} occurrences\n")
+
+def run_stream_benchmark(fasta_file, output_path, fmt=None, resume=True, designer=None, validator=None, summary_path='summary_report.txt'):
+    """
+    Runs the read -> design -> validate -> write pipeline with bounded memory. Each protein is written
+    to `output_path` as soon as it is validated, and a rerun with resume=True continues after the last
+    completed record.
+
+    Returns:
+        dict: The summary tallied from the complete output file.
+    """
+    if designer is None:
+        designer = TranscriptDesigner()
+        designer.initiate()
+        designer.enable_profiling()
+    if validator is None:
+        validator = TranscriptValidator()
+        validator.initiate()
+
+    start_time = time.time()
+    with ResultWriter(output_path, fmt) as writer:
+        completed = writer.open(resume=resume)
+        records = iter_records(fasta_file, skip=completed)
+        for row in validate_stream(design_stream(designer, records), validator):
+            writer.write(row)
+    runtime = time.time() - start_time
+
+    summary = summarize_results(output_path, fmt)
+    write_stream_summary(summary, runtime, summary_path)
+    profiler = getattr(designer, 'profiler', None)
+    if profiler is not None and profiler.enabled:
+        print(write_profile_summary(designer))
+    return summary
+
+if __name__ == "__main__":
+    fasta_file = "tests/benchmarking/uniprotkb_proteome_UP000054015_2024_09_24.fasta"
+    run_stream_benchmark(fasta_file, "proteome_results.tsv")
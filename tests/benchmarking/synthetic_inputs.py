@@ -0,0 +1,65 @@
+import numpy as np
+from unittest.mock import patch
+from genedesign.models.rbs_option import RBSOption
+from genedesign.rbs_chooser import RBSChooser
+from genedesign.seq_utils.Translate import Translate
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+NUCLEOTIDES = "ACGT"
+SENSE_CODONS = [a + b + c for a in NUCLEOTIDES for b in NUCLEOTIDES for c in NUCLEOTIDES if a + b + c not in ("TAA", "TAG", "TGA")]
+
+def random_dna(length, seed=0):
+    """
+    Returns a reproducible uniformly random DNA sequence.
+    """
+    rng = np.random.default_rng(seed)
+    return ''.join(rng.choice(list(NUCLEOTIDES), size=length))
+
+def random_codons(n_codons, seed=0):
+    """
+    Returns a reproducible list of random sense codons.
+    """
+    rng = np.random.default_rng(seed)
+    return [SENSE_CODONS[i] for i in rng.integers(0, len(SENSE_CODONS), size=n_codons)]
+
+def random_protein(length, seed=0):
+    """
+    Returns a reproducible random protein starting with methionine, without a stop symbol.
+    """
+    rng = np.random.default_rng(seed)
+    return 'M' + ''.join(rng.choice(list(AMINO_ACIDS), size=length - 1))
+
+class SyntheticRBSChooser(RBSChooser):
+    """
+    An RBSChooser whose library is generated from a seed instead of being read from the E. coli
+    GenBank file, so search benchmarks run anywhere and always see the same options. The default
+    size matches the top 5% of E. coli genes the real chooser keeps.
+    """
+    n_options = 215
+    utr_length = 33
+    seed = 0
+
+    def initiate(self) -> None:
+        self.translator = Translate()
+        self.translator.initiate()
+        self.rbs_options = []
+        for index in range(self.n_options):
+            utr = random_dna(self.utr_length, seed=(self.seed, index, 0))
+            cds = 'ATG' + ''.join(random_codons(59, seed=(self.seed, index, 1))) + 'TAA'
+            self.rbs_options.append(RBSOption(
+                utr=utr,
+                cds=cds,
+                gene_name=f"synthetic{index}",
+                first_six_aas=self.translator.run(cds[:18]),
+            ))
+
+def synthetic_rbs_library():
+    """
+    Returns a patcher that makes every designer built while it is active use SyntheticRBSChooser.
+
+    Usage:
+        with synthetic_rbs_library():
+            designer = TranscriptDesigner()
+            designer.initiate()
+    """
+    return patch('genedesign.montecarlo.RBSChooser', SyntheticRBSChooser)
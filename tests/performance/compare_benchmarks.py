@@ -0,0 +1,103 @@
+import argparse
+import json
+import sys
+
+DEFAULT_BASELINE = "tests/performance/baseline.json"
+DEFAULT_THRESHOLD = 0.25  # Fractional slowdown of the median that counts as a regression
+
+def load_medians(benchmark_json):
+    """
+    Reads a pytest-benchmark JSON report (or a baseline written by `save`) into {test name: stats}.
+    """
+    with open(benchmark_json, 'r') as f:
+        data = json.load(f)
+    if 'benchmarks' in data and isinstance(data['benchmarks'], list):
+        return {
+            bench['fullname']: {
+                'median': bench['stats']['median'],
+                'min': bench['stats']['min'],
+                'rounds': bench['stats']['rounds'],
+            }
+            for bench in data['benchmarks']
+        }
+    return data['benchmarks']
+
+def save_baseline(benchmark_json, baseline_path=DEFAULT_BASELINE):
+    """
+    Stores the medians of a pytest-benchmark run as the new baseline.
+    """
+    with open(benchmark_json, 'r') as f:
+        machine = json.load(f).get('machine_info', {})
+    baseline = {
+        'machine': {key: machine.get(key) for key in ('processor', 'python_version', 'system')},
+        'benchmarks': load_medians(benchmark_json),
+    }
+    with open(baseline_path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares current medians against the baseline.
+
+    Returns:
+        list: One dict per benchmark with 'name', 'baseline', 'current', 'ratio' and 'status', where
+              status is 'regression', 'improvement', 'ok', 'new' or 'missing'.
+    """
+    rows = []
+    for name in sorted(set(current) | set(baseline)):
+        if name not in baseline:
+            rows.append({'name': name, 'baseline': None, 'current': current[name]['median'], 'ratio': None, 'status': 'new'})
+            continue
+        if name not in current:
+            rows.append({'name': name, 'baseline': baseline[name]['median'], 'current': None, 'ratio': None, 'status': 'missing'})
+            continue
+        ratio = current[name]['median'] / baseline[name]['median']
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 / (1 + threshold):
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append({'name': name, 'baseline': baseline[name]['median'], 'current': current[name]['median'], 'ratio': ratio, 'status': status})
+    return rows
+
+def format_report(rows):
+    def fmt_time(seconds):
+        return f"{seconds * 1e3:10.3f} ms" if seconds is not None else f"{'-':>13}"
+
+    lines = [f"{'status':<12}{'baseline':>13}{'current':>13}{'ratio':>8}  benchmark"]
+    for row in rows:
+        ratio = f"{row['ratio']:.2f}x" if row['ratio'] is not None else '-'
+        lines.append(f"{row['status']:<12}{fmt_time(row['baseline'])}{fmt_time(row['current'])}{ratio:>8}  {row['name']}")
+    regressions = sum(row['status'] == 'regression' for row in rows)
+    lines.append(f"\n{regressions} regression(s) out of {len(rows)} benchmarks")
+    return '\n'.join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Save or compare pytest-benchmark results against a stored baseline.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    save_parser = subparsers.add_parser('save', help="Store a benchmark run as the baseline.")
+    save_parser.add_argument('benchmark_json')
+    save_parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+
+    compare_parser = subparsers.add_parser('compare', help="Compare a benchmark run against the baseline.")
+    compare_parser.add_argument('benchmark_json')
+    compare_parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+
+    args = parser.parse_args(argv)
+    if args.command == 'save':
+        save_baseline(args.benchmark_json, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    rows = compare(load_medians(args.benchmark_json), load_medians(args.baseline), args.threshold)
+    print(format_report(rows))
+    return 1 if any(row['status'] == 'regression' for row in rows) else 0
+
+if __name__ == "__main__":
+    # GENEDESIGN_PERF=1 python -m pytest tests/performance --benchmark-json=benchmark.json
+    # python tests/performance/compare_benchmarks.py compare benchmark.json
+    sys.exit(main())
@@ -0,0 +1,32 @@
+import os
+import pytest
+from tests.benchmarking.synthetic_inputs import SyntheticRBSChooser, random_codons, random_dna, random_protein
+
+# The performance suite is slow and timing based, so it only runs when explicitly requested:
+#   GENEDESIGN_PERF=1 python -m pytest tests/performance --benchmark-json=benchmark.json
+if not os.environ.get('GENEDESIGN_PERF'):
+    collect_ignore_glob = ['test_*.py']
+
+# Input sizes shared by every benchmark (nucleotides for DNA, amino acids for proteins)
+DNA_LENGTHS = [100, 1000, 5000]
+PROTEIN_LENGTHS = [50, 200, 500]
+
+@pytest.fixture(params=DNA_LENGTHS, ids=lambda n: f"{n}nt")
+def dna(request):
+    return random_dna(request.param, seed=request.param)
+
+@pytest.fixture(params=DNA_LENGTHS, ids=lambda n: f"{n // 3}codons")
+def codons(request):
+    return ['ATG'] + random_codons(request.param // 3 - 2, seed=request.param) + ['TAA']
+
+@pytest.fixture(params=PROTEIN_LENGTHS, ids=lambda n: f"{n}aa")
+def protein(request):
+    return random_protein(request.param, seed=request.param)
+
+@pytest.fixture
+def synthetic_chooser(monkeypatch):
+    """
+    Makes every MonteCarlo built in the test use the seeded SyntheticRBSChooser library.
+    """
+    monkeypatch.setattr('genedesign.montecarlo.RBSChooser', SyntheticRBSChooser)
+    return SyntheticRBSChooser
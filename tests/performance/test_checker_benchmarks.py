@@ -0,0 +1,74 @@
+import pytest
+from genedesign.checkers.codon_checker import CodonChecker
+from genedesign.checkers.forbidden_sequence_checker import ForbiddenSequenceChecker
+from genedesign.checkers.gc_content_checker import gc_checker
+from genedesign.checkers.hairpin_checker import hairpin_checker
+from genedesign.checkers.internal_promoter_checker import PromoterChecker
+from genedesign.checkers.rnase_e_checker import RNaseEChecker
+from genedesign.seq_utils.fused_check import FusedSequenceChecker
+from genedesign.seq_utils import hairpin_counter as counters
+
+pytest.importorskip("pytest_benchmark")
+
+@pytest.fixture(scope="module")
+def promoter_checker():
+    checker = PromoterChecker()
+    checker.initiate()
+    return checker
+
+@pytest.fixture(scope="module")
+def forbidden_checker():
+    checker = ForbiddenSequenceChecker()
+    checker.initiate()
+    return checker
+
+@pytest.fixture(scope="module")
+def codon_checker():
+    checker = CodonChecker()
+    checker.initiate()
+    return checker
+
+@pytest.fixture(scope="module")
+def rnase_checker():
+    checker = RNaseEChecker()
+    checker.initiate()
+    return checker
+
+@pytest.fixture(scope="module")
+def fused_checker():
+    checker = FusedSequenceChecker()
+    checker.initiate()
+    return checker
+
+@pytest.mark.parametrize("counter", [
+    counters.hairpin_counter,
+    counters.non_stupid_hairpin_counter,
+    counters.optimized_hairpin_counter,
+    counters.optimized_non_stupid_hairpin_counter,
+], ids=lambda counter: counter.__name__)
+def test_hairpin_counter(benchmark, counter, dna):
+    # Warm up numba-compiled variants outside the measurement
+    counter(dna[:50])
+    benchmark.group = f"hairpin_counter-{len(dna)}nt"
+    benchmark(counter, dna)
+
+def test_hairpin_checker(benchmark, dna):
+    benchmark(hairpin_checker, dna)
+
+def test_promoter_checker(benchmark, promoter_checker, dna):
+    benchmark(promoter_checker.run, dna)
+
+def test_forbidden_sequence_checker(benchmark, forbidden_checker, dna):
+    benchmark(forbidden_checker.run, dna)
+
+def test_gc_checker(benchmark, dna):
+    benchmark(gc_checker, dna)
+
+def test_rnase_e_checker(benchmark, rnase_checker, dna):
+    benchmark(rnase_checker.run, dna)
+
+def test_fused_sequence_checker(benchmark, fused_checker, dna):
+    benchmark(fused_checker.run, dna)
+
+def test_codon_checker(benchmark, codon_checker, codons):
+    benchmark(codon_checker.run, codons)
@@ -0,0 +1,48 @@
+import pytest
+from genedesign.models.composition import Composition
+from genedesign.montecarlo import MonteCarlo
+from genedesign.operon_designer import OperonDesigner
+from tests.benchmarking.scaling_benchmarker import reseed
+from tests.benchmarking.synthetic_inputs import SyntheticRBSChooser, random_codons, random_protein
+
+pytest.importorskip("pytest_benchmark")
+
+SEED = 2024
+
+@pytest.fixture
+def rbs_chooser():
+    chooser = SyntheticRBSChooser()
+    chooser.initiate()
+    return chooser
+
+@pytest.fixture
+def montecarlo(synthetic_chooser):
+    search = MonteCarlo()
+    search.seed = SEED
+    search.initiate()
+    return search
+
+@pytest.mark.parametrize("n_codons", [6, 100, 1000])
+def test_rbs_chooser_optimized_run(benchmark, rbs_chooser, n_codons):
+    cds = ''.join(['ATG'] + random_codons(n_codons - 1, seed=n_codons))
+    benchmark(rbs_chooser.optimized_run, cds, set())
+
+def test_montecarlo_run(benchmark, montecarlo, protein):
+    # Whole designs take seconds, so a few rounds are enough for a stable median
+    benchmark.pedantic(montecarlo.run, args=(protein, set()), rounds=3, iterations=1, warmup_rounds=1)
+
+def test_operon_designer_run(benchmark, synthetic_chooser):
+    designer = OperonDesigner()
+    designer.initiate()
+    designer.td.warm_start = False
+    promoter = "TTGACAGCTAGCTCAGTCCTAGGTATAATGCTAGC"
+    terminator = "CCAGGCATCAAATAAAACGAAAGGCTCAGTCGAAAGACTGGGCCTTTCGTTTTAT"
+    proteins = [random_protein(200, seed=SEED + i) for i in range(3)]
+    comp = Composition("Ecoli", promoter, proteins, terminator)
+
+    def cold_start():
+        # Every round designs from scratch instead of reusing the previous round's cached windows or designs
+        reseed(designer.td, SEED)
+        return (comp,), {}
+
+    benchmark.pedantic(designer.run, setup=cold_start, rounds=3, iterations=1)
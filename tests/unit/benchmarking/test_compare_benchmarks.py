@@ -0,0 +1,32 @@
+import json
+import pytest
+from tests.performance.compare_benchmarks import compare, load_medians, main, save_baseline
+
+def write_report(path, medians):
+    report = {
+        'machine_info': {'python_version': '3.11', 'system': 'Linux', 'processor': ''},
+        'benchmarks': [
+            {'fullname': name, 'stats': {'median': median, 'min': median, 'rounds': 10}}
+            for name, median in medians.items()
+        ],
+    }
+    path.write_text(json.dumps(report))
+    return str(path)
+
+@pytest.fixture
+def baseline(tmp_path):
+    report = write_report(tmp_path / "base.json", {'fast': 1.0, 'slow': 2.0, 'gone': 1.0})
+    baseline_path = str(tmp_path / "baseline.json")
+    save_baseline(report, baseline_path)
+    return baseline_path
+
+def test_compare_flags_regressions(baseline):
+    current = {'fast': {'median': 0.5}, 'slow': {'median': 3.0}, 'added': {'median': 1.0}}
+    statuses = {row['name']: row['status'] for row in compare(current, load_medians(baseline), threshold=0.25)}
+    assert statuses == {'fast': 'improvement', 'slow': 'regression', 'added': 'new', 'gone': 'missing'}
+
+def test_main_exit_code(tmp_path, baseline):
+    within_noise = write_report(tmp_path / "ok.json", {'fast': 1.1, 'slow': 2.1, 'gone': 1.0})
+    slower = write_report(tmp_path / "slow.json", {'fast': 1.5, 'slow': 2.0, 'gone': 1.0})
+    assert main(['compare', within_noise, '--baseline', baseline]) == 0
+    assert main(['compare', slower, '--baseline', baseline]) == 1
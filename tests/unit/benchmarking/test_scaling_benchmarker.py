@@ -0,0 +1,26 @@
+import math
+import pytest
+from tests.benchmarking.scaling_benchmarker import build_designer, fit_exponent, format_scaling_report, run_scaling_benchmark
+
+def test_fit_exponent_recovers_power_law():
+    lengths = [50, 100, 200, 400]
+    assert fit_exponent(lengths, [3 * n for n in lengths]) == pytest.approx(1.0)
+    assert fit_exponent(lengths, [0.5 * n ** 2 for n in lengths]) == pytest.approx(2.0)
+
+def test_fit_exponent_needs_two_points():
+    assert math.isnan(fit_exponent([50], [1.0]))
+    assert math.isnan(fit_exponent([50, 100], [None, 0]))
+
+def test_run_scaling_benchmark_is_reproducible():
+    designer = build_designer(seed=1)
+    first = run_scaling_benchmark([10, 50], seed=1, track_memory=False, designer=designer)
+    second = run_scaling_benchmark([10, 50], seed=1, track_memory=False, designer=designer)
+
+    assert [row['length'] for row in first['rows']] == [10, 50]
+    assert all(row['attempts'] >= row['windows'] > 0 for row in first['rows'])
+    assert all(row['peak_bytes'] is None for row in first['rows'])
+    assert set(first['exponents']) == {'seconds', 'attempts', 'peak_bytes'}
+    assert "Empirical complexity" in format_scaling_report(first)
+    # The same seed designs the same proteins, so the sampled windows match
+    assert [row['windows'] for row in first['rows']] == [row['windows'] for row in second['rows']]
+    assert [row['attempts'] for row in first['rows']] == [row['attempts'] for row in second['rows']]
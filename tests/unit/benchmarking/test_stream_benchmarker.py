@@ -0,0 +1,85 @@
+import pytest
+from genedesign.models.rbs_option import RBSOption
+from genedesign.models.transcript import Transcript
+from tests.benchmarking.stream_benchmarker import ResultWriter, iter_records, iter_result_rows, run_stream_benchmark
+
+FASTA = """>tr|A0A001|A0A001_TEST Protein one OS=Test GN=geneA PE=3 SV=1
+MKTAYIAKQR
+QISFVKSHFS
+>tr|A0A002|A0A002_TEST Protein two OS=Test GN=geneB PE=3 SV=1
+MSKGEELFTG
+>tr|A0A003|A0A003_TEST Protein three OS=Test GN=geneA PE=3 SV=1
+MALWTRLLPL
+"""
+
+# One fixed codon per amino acid is enough for a deterministic stand-in designer
+BACK_TRANSLATION = {
+    'A': 'GCG', 'R': 'CGT', 'N': 'AAC', 'D': 'GAT', 'C': 'TGC', 'Q': 'CAG', 'E': 'GAA', 'G': 'GGC',
+    'H': 'CAT', 'I': 'ATT', 'L': 'CTG', 'K': 'AAA', 'M': 'ATG', 'F': 'TTT', 'P': 'CCG', 'S': 'AGC',
+    'T': 'ACC', 'W': 'TGG', 'Y': 'TAT', 'V': 'GTG',
+}
+
+class FakeDesigner:
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.calls = []
+        self.rbs = RBSOption(utr="AAAGAGGAGAAATACTAG", cds="ATGTAA", gene_name="fake", first_six_aas="M")
+
+    def run(self, peptide, ignores):
+        self.calls.append(peptide)
+        if peptide == self.fail_on:
+            raise ValueError("designer failure")
+        codons = [BACK_TRANSLATION[aa] for aa in peptide] + ['TAA']
+        return Transcript(self.rbs, peptide, codons)
+
+@pytest.fixture
+def fasta_file(tmp_path):
+    path = tmp_path / "proteome.fasta"
+    path.write_text(FASTA)
+    return str(path)
+
+def test_iter_records_keeps_duplicate_genes(fasta_file):
+    records = list(iter_records(fasta_file))
+    assert [(index, gene) for index, gene, _ in records] == [(0, 'geneA'), (1, 'geneB'), (2, 'geneA')]
+    assert records[0][2] == "MKTAYIAKQRQISFVKSHFS"
+    assert list(iter_records(fasta_file, skip=2))[0][0] == 2
+
+@pytest.mark.parametrize("suffix", ["tsv", "jsonl"])
+def test_stream_writes_every_record(fasta_file, tmp_path, suffix):
+    output = str(tmp_path / f"results.{suffix}")
+    designer = FakeDesigner(fail_on="MSKGEELFTG")
+    summary = run_stream_benchmark(fasta_file, output, designer=designer, summary_path=str(tmp_path / "summary.txt"))
+
+    rows = list(iter_result_rows(output))
+    assert [row['record'] for row in rows] == [0, 1, 2]
+    assert rows[1]['status'] == 'error'
+    assert rows[0]['cds'].startswith('ATG') and rows[0]['cds'].endswith('TAA')
+    assert summary['total'] == 3
+    assert sum(summary['errors'].values()) == 1
+
+@pytest.mark.parametrize("suffix", ["tsv", "jsonl"])
+def test_resume_after_crash(fasta_file, tmp_path, suffix):
+    output = str(tmp_path / f"results.{suffix}")
+    run_stream_benchmark(fasta_file, output, designer=FakeDesigner(), summary_path=str(tmp_path / "summary.txt"))
+
+    # Simulate a crash halfway through writing the last record
+    with open(output) as f:
+        lines = f.readlines()
+    with open(output, 'w') as f:
+        f.writelines(lines[:-1])
+        f.write(lines[-1][:10])
+
+    designer = FakeDesigner()
+    summary = run_stream_benchmark(fasta_file, output, designer=designer, summary_path=str(tmp_path / "summary.txt"))
+
+    assert designer.calls == ["MALWTRLLPL"]
+    assert [row['record'] for row in iter_result_rows(output)] == [0, 1, 2]
+    assert summary['total'] == 3
+
+def test_writer_without_resume_starts_over(tmp_path):
+    output = str(tmp_path / "results.tsv")
+    with open(output, 'w') as f:
+        f.write("stale\n")
+    with ResultWriter(output) as writer:
+        assert writer.open(resume=False) == 0
+    assert list(iter_result_rows(output)) == []
@@ -238,4 +238,16 @@ def test_varied_cds(codon_checker):
         my_run_output = codon_checker.my_run(cds, len_peptide)
 
         assert run_output == expected_output, f"run method failed on test case: {description}"
-        assert my_run_output == expected_output, f"my_run method failed on test case: {description}"
\ No newline at end of file
+        assert my_run_output == expected_output, f"my_run method failed on test case: {description}"
+
+def test_locate_rare_codons(codon_checker):
+    """
+    Too many rare codons are reported one by one at their nucleotide positions; low diversity is
+    reported once over the whole CDS.
+    """
+    common = ['ATG', 'AAC', 'GAC', 'TGC', 'TAC', 'CAC', 'TTC', 'ATC', 'AAG', 'GAG', 'CAG', 'GGC', 'CTG', 'GCG']
+    cds = common[:5] + ['AGG', 'AGA'] + common[5:] + ['CTA', 'ATA', 'TAA']
+    violations = codon_checker.locate(cds)
+
+    assert violations[0].start == 0 and violations[0].end == 3 * len(cds)
+    assert [(v.start, v.end, v.detail) for v in violations[1:]] == [(15, 18, 'AGG'), (18, 21, 'AGA'), (48, 51, 'CTA'), (51, 54, 'ATA')]
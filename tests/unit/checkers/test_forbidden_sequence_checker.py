@@ -52,3 +52,10 @@ def test_allowed_sites(checker):
         result, site = checker.run(seq)
         print(f"result: {result} on {seq}")
         assert result == True
+
+def test_locate_reports_every_site_on_both_strands(checker):
+    # EcoRI (palindrome) at 3, BsaI at 12 and its reverse complement GAGACC at 21
+    seq = "CCCGAATTCCCCGGTCTCCCCGAGACCAA"
+    violations = checker.locate(seq)
+    assert [(v.start, v.end, v.detail) for v in violations] == [(3, 9, "GAATTC"), (12, 18, "GGTCTC"), (21, 27, "GGTCTC")]
+    assert checker.locate("AAACTGTAATCCACCACAAGTCAAGCCAT") == []
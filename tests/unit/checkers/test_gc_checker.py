@@ -1,5 +1,5 @@
 import pytest
-from genedesign.checkers.gc_content_checker import gc_checker
+from genedesign.checkers.gc_content_checker import gc_checker, locate_gc
 
 # Test cases
 def test_gc_content_exact_40_percent():
@@ -106,4 +106,9 @@ def test_gc_content_just_above_60_percent():
     sequence = "G" * 301 + "C" * 300 + "A" * 199 + "T" * 200
     in_range, gc_content = gc_checker(sequence)
     assert in_range == False
-    assert gc_content == pytest.approx(0.601, 0.0001)
\ No newline at end of file
+    assert gc_content == pytest.approx(0.601, 0.0001)
+
+def test_locate_gc_covers_the_whole_sequence():
+    assert locate_gc("AGCTAGCTAGCTAGCT") == []
+    violations = locate_gc("ATATATATGC")
+    assert [(v.check, v.start, v.end) for v in violations] == [("gc", 0, 10)]
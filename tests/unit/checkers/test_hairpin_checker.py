@@ -0,0 +1,31 @@
+import random
+import pytest
+from genedesign.checkers.hairpin_checker import hairpin_checker, locate_hairpins
+from genedesign.seq_utils.hairpin_counter import hairpin_counter, hairpin_sites
+
+def test_hairpin_sites_match_counter():
+    rng = random.Random(3)
+    for _ in range(300):
+        seq = ''.join(rng.choice('ACGT') for _ in range(rng.randint(0, 80)))
+        assert len(hairpin_sites(seq)) == hairpin_counter(seq)[0]
+
+def test_hairpin_site_extent():
+    # CCC and GGG with a 9-base loop
+    assert hairpin_sites("AAAAACCCAAAAAAAAAGGGAAAAAA") == [(5, 20)]
+
+def test_locate_only_reports_crowded_chunks():
+    single = "A" * 20 + "CCCAAAAAAAGGG" + "A" * 20
+    assert hairpin_checker(single)[0] == True
+    assert locate_hairpins(single) == []
+
+    crowded = "A" * 10 + "CCCAAAAAAAGGG" + "A" * 5 + "CTCAAAAAAAGAG" + "A" * 10
+    assert hairpin_checker(crowded)[0] == False
+    violations = locate_hairpins(crowded)
+    assert [(v.start, v.end) for v in violations] == [(10, 23), (28, 41)]
+    assert violations[0].detail == "CCC(AAAAAAA)GGG"
+
+def test_locate_agrees_with_checker():
+    rng = random.Random(11)
+    for _ in range(200):
+        seq = ''.join(rng.choice('ACGT') for _ in range(rng.randint(50, 120)))
+        assert (locate_hairpins(seq) == []) == hairpin_checker(seq)[0]
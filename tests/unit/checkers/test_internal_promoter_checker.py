@@ -1,5 +1,7 @@
+import random
 import pytest
 from genedesign.checkers.internal_promoter_checker import PromoterChecker
+from genedesign.seq_utils.reverse_complement import reverse_complement
 
 @pytest.fixture
 def promoter_checker():
@@ -75,3 +77,19 @@ def test_j23119_promoters(promoter_checker):
         result, promoter = promoter_checker.run(seq)
         print(f"Sequence: {seq}, Expected: {expected}, Got: {result}, Promoter: {promoter}")
         assert result == expected, f"Test failed for sequence: {seq}. Expected {expected} but got {result}."
+
+def test_locate_maps_both_strands(promoter_checker):
+    promoter = "TTGACAATTAATCATCGAACTAGTATAAT"
+
+    forward = promoter_checker.locate("GCGC" + promoter + "GCGC")
+    assert [(v.start, v.end) for v in forward] == [(4, 33)]
+
+    reverse = promoter_checker.locate("GCGC" + reverse_complement(promoter) + "GCGC")
+    assert [(v.start, v.end) for v in reverse] == [(4, 33)]
+    assert reverse[0].detail == promoter
+
+def test_locate_agrees_with_run(promoter_checker):
+    rng = random.Random(7)
+    for _ in range(200):
+        seq = ''.join(rng.choice('AT' * 3 + 'GC') for _ in range(60))
+        assert (promoter_checker.locate(seq) == []) == promoter_checker.run(seq)[0]
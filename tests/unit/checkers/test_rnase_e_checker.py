@@ -0,0 +1,51 @@
+import random
+import re
+import pytest
+from genedesign.checkers.rnase_e_checker import RNaseEChecker
+
+@pytest.fixture
+def rnase_checker():
+    checker = RNaseEChecker()
+    checker.initiate()
+    return checker
+
+def naive_count(seq):
+    """
+    Reference count of overlapping RN^WUU sites, one position at a time.
+    """
+    return sum(1 for i in range(len(seq) - 4) if re.fullmatch("[AG][ACGT][AT]TT", seq[i:i + 5]))
+
+def test_no_sites(rnase_checker):
+    result, count = rnase_checker.run("GCGCGCGCGCGCGCGCGCGC")
+    assert result == True
+    assert count == 0
+
+def test_overlapping_sites(rnase_checker):
+    # GAATT and AATTT overlap; the second needs the lookahead to be found
+    assert rnase_checker.sites("GAATTT") == [0, 1]
+    assert rnase_checker.count("gaattt") == 2
+
+def test_dense_sites_fail(rnase_checker):
+    result, count = rnase_checker.run("AAATTGAATTAGATTGCATT")
+    assert result == False
+    assert count == 4
+
+def test_matches_reference(rnase_checker):
+    rng = random.Random(3)
+    for _ in range(200):
+        seq = ''.join(rng.choices('ACGT', weights=[3, 1, 1, 3], k=rng.randint(0, 120)))
+        assert rnase_checker.count(seq) == naive_count(seq)
+
+def test_incremental_count(rnase_checker):
+    rng = random.Random(5)
+    for _ in range(200):
+        seq = ''.join(rng.choices('ACGT', weights=[3, 1, 1, 3], k=rng.randint(0, 80)))
+        start = rng.randint(0, len(seq))
+        assert rnase_checker.count(seq[:start]) + rnase_checker.count(seq, start) == rnase_checker.count(seq)
+
+def test_locate_only_reports_dense_sites(rnase_checker):
+    assert rnase_checker.locate("GCGCGCGCGCAATTGCGCGCGCGCGCGCGCGCGCGCGCGCGCGCGCGCGCGCGCGCGCGCGCGCGCGCGC") == []
+    seq = "ACATTTGAATTAGCATTGCAATTT"
+    violations = rnase_checker.locate(seq)
+    assert [v.start for v in violations] == rnase_checker.sites(seq)
+    assert all(v.end - v.start == 5 for v in violations)
@@ -0,0 +1,55 @@
+import pytest
+from genedesign.models.rbs_option import RBSOption
+from genedesign.seq_utils.sample_codon import SampleCodon
+from tests.benchmarking.synthetic_inputs import random_protein
+
+UTR = "GATTTAACTTTAAGAAGGAGATATACATATG"
+
+class StubRBSChooser:
+    """
+    Stands in for RBSChooser so designers can run without the E. coli GenBank data.
+    """
+    def __init__(self):
+        self.rbs = RBSOption(utr=UTR, cds="ATGTAA", gene_name="stub", first_six_aas="M")
+
+    def initiate(self):
+        pass
+
+    def optimized_run(self, cds, ignores):
+        return self.rbs
+
+@pytest.fixture
+def stub_rbs_chooser(monkeypatch):
+    """
+    Replaces the RBSChooser used by MonteCarlo with StubRBSChooser.
+    """
+    monkeypatch.setattr('genedesign.montecarlo.RBSChooser', StubRBSChooser)
+    return StubRBSChooser
+
+@pytest.fixture
+def utr():
+    """
+    The 5' UTR the designer tests place their CDSs behind.
+    """
+    return UTR
+
+@pytest.fixture
+def sample_codons():
+    """
+    Returns a function that samples a CDS for a peptide (starting with Met) with a seeded SampleCodon,
+    keeping ATG as the start codon and ending on a stop codon.
+    """
+    def sample(peptide, seed):
+        sampler = SampleCodon()
+        sampler.seed = seed
+        sampler.initiate()
+        return ['ATG'] + [str(sampler.run(aa)) for aa in peptide[1:] + '*']
+    return sample
+
+@pytest.fixture
+def codons(sample_codons):
+    """
+    A sampled 151-residue CDS with the forbidden sites, hairpins and codon usage problems of an
+    unchecked design.
+    """
+    return sample_codons('M' + random_protein(150, 5), 4)
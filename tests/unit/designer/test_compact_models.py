@@ -0,0 +1,75 @@
+import gc
+import sys
+import weakref
+import pytest
+from genedesign.models.compact_rbs_option import CompactRBSOption, RBSRegistry
+from genedesign.models.compact_transcript import CompactTranscript, decode_codons, encode_codons
+from genedesign.models.rbs_option import RBSOption
+from genedesign.models.transcript import Transcript
+
+@pytest.fixture
+def rbs():
+    return RBSOption(utr="GATTTAACTTTAAGAAGGAGATATACATATG", cds="ATGAAAGCATAA", gene_name="geneA", first_six_aas="MKA")
+
+@pytest.fixture
+def transcript(rbs):
+    return Transcript(rbs, "MKAY", ["ATG", "AAA", "GCA", "TAC", "TAA"])
+
+def test_codon_round_trip():
+    codons = ["ATG", "GGC", "TTT", "TAA"]
+    assert len(encode_codons(codons)) == len(codons)
+    assert decode_codons(encode_codons(codons)) == codons
+
+def test_encode_rejects_invalid_codon():
+    with pytest.raises(ValueError):
+        encode_codons(["ATG", "NNN"])
+
+def test_registry_deduplicates(rbs):
+    registry = RBSRegistry()
+    other = RBSOption(utr="AAAA", cds="ATGTAA", gene_name="geneB", first_six_aas="M")
+    assert registry.register(rbs) == 0
+    assert registry.register(other) == 1
+    assert registry.register(rbs) == 0
+    assert len(registry) == 2
+    assert registry.get(1) == other
+
+def test_registry_does_not_keep_options_alive():
+    registry = RBSRegistry()
+    option = RBSOption(utr="AAAA", cds="ATGTAA", gene_name="geneB", first_six_aas="M")
+    ref = weakref.ref(option)
+    rbs_id = registry.register(option)
+    del option
+    gc.collect()
+    assert ref() is None
+    assert registry.get(rbs_id).gene_name == "geneB"
+
+def test_compact_rbs_option_properties(rbs):
+    compact = RBSRegistry().compact(rbs)
+    assert isinstance(compact, CompactRBSOption)
+    assert (compact.utr, compact.cds, compact.gene_name, compact.first_six_aas) == (rbs.utr, rbs.cds, rbs.gene_name, rbs.first_six_aas)
+    assert compact.to_rbs_option() == rbs
+
+def test_compact_transcript_matches_transcript(transcript):
+    registry = RBSRegistry()
+    compact = CompactTranscript.from_transcript(transcript, registry)
+
+    assert compact.peptide == transcript.peptide
+    assert compact.codons == transcript.codons
+    assert compact.cds == ''.join(transcript.codons)
+    assert compact.rbs.utr == transcript.rbs.utr
+    assert compact.to_transcript() == transcript
+
+def test_compact_transcript_is_frozen_and_slotted(transcript):
+    compact = CompactTranscript.from_transcript(transcript, RBSRegistry())
+    assert not hasattr(compact, '__dict__')
+    with pytest.raises(AttributeError):
+        compact.peptide = "M"
+
+def test_compact_transcript_is_smaller(rbs):
+    # Distinct string objects, as the codon sampler produces
+    codons = [''.join(list(codon)) for codon in ["ATG"] + ["GCA"] * 300 + ["TAA"]]
+    transcript = Transcript(rbs, "M" + "A" * 300, codons)
+    compact = CompactTranscript.from_transcript(transcript, RBSRegistry())
+
+    list_size = sys.getsizeof(transcript.codons) + sum(sys.getsizeof(codon) for codon in transcript.codons)
+    assert sys.getsizeof(compact.codon_ids) * 10 < list_size
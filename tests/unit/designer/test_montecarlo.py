@@ -115,4 +115,138 @@ def test_find_codons_failure(monte_carlo):
     monte_carlo.checker.run.return_value = (False, 0.5)
 
     with pytest.raises(Exception, match="No valid window sequence found after"):
-        monte_carlo._MonteCarlo__find_codons(window, codons, selected_rbs, len_peptide)
\ No newline at end of file
+        monte_carlo._MonteCarlo__find_codons(window, codons, selected_rbs, len_peptide)
+
+def test_lookahead_seeds_next_window(stub_rbs_chooser):
+    """
+    Every accepted window's lookahead codons are the first proposal for the next window.
+    """
+    mc = MonteCarlo()
+    mc.seed = 3
+    mc.initiate()
+    proposals = []
+
+    def accept_all(generated_codons, codons, rbs, len_peptide, short_circuit=False, context=None):
+        proposals.append(list(generated_codons))
+        return True, 1.0
+
+    mc.checker.run = accept_all
+    _, codons = mc.run('MKTIIALSYIFCLVFADYKDDDDK', set())
+
+    scopes = [scope for scope, _, _, _ in mc.planner.history]
+    for previous, current, scope in zip(proposals, proposals[1:], scopes):
+        lookahead = previous[scope:]
+        assert current[:len(lookahead)] == lookahead
+    assert len(codons) == len('MKTIIALSYIFCLVFADYKDDDDK') + 1
+
+def test_rejected_seed_is_partially_resampled(stub_rbs_chooser):
+    """
+    After a rejection the next proposal keeps n_codons_in_scope fewer seed codons.
+    """
+    mc = MonteCarlo()
+    mc.seed = 3
+    mc.initiate()
+    mc.targeted_repair = False
+    proposals = []
+
+    def reject_first_two(generated_codons, codons, rbs, len_peptide, short_circuit=False, context=None):
+        proposals.append(list(generated_codons))
+        return len(proposals) > 2, 0.0
+
+    mc.checker.run = reject_first_two
+    context = mc.checker.new_context("GATTTAACTTTAAGAAGGAGATATACATATG", ['ATG'])
+    seed = ['AAA', 'ACC', 'ATT', 'ATT', 'GCG', 'CTG']
+    window_codons = mc._MonteCarlo__find_codons('KTIIALSYI', ['ATG'], None, 30, context, seed)
+
+    assert proposals[0][:6] == seed
+    assert proposals[1][:3] == seed[:3]
+    assert window_codons == proposals[2][:3]
+    assert mc.last_lookahead == proposals[2][3:]
+
+def test_targeted_repair_keeps_clean_codons(stub_rbs_chooser):
+    """
+    After a rejection only the codons overlapping a violation are resampled.
+    """
+    mc = MonteCarlo()
+    mc.seed = 3
+    mc.initiate()
+    proposals = []
+
+    def reject_first(generated_codons, codons, rbs, len_peptide, short_circuit=False, context=None):
+        proposals.append(list(generated_codons))
+        return len(proposals) > 1, 0.0
+
+    mc.checker.run = reject_first
+    mc.checker.violating_codons = lambda generated_codons, context, len_peptide: [2, 3]
+    context = mc.checker.new_context("GATTTAACTTTAAGAAGGAGATATACATATG", ['ATG'])
+    window_codons = mc._MonteCarlo__find_codons('KTIIALSYI', ['ATG'], None, 30, context)
+
+    assert len(proposals) == 2
+    assert proposals[1][:2] == proposals[0][:2]
+    assert proposals[1][4:] == proposals[0][4:]
+    assert window_codons == proposals[1][:3]
+
+def test_deadline_fills_the_rest_in_one_draw(stub_rbs_chooser):
+    import time
+    mc = MonteCarlo()
+    mc.seed = 3
+    mc.initiate()
+    peptide = 'MKTIIALSYIFCLVFADYKDDDDK'
+
+    _, codons = mc.run(peptide, set(), deadline=time.perf_counter())
+
+    assert mc.timed_out
+    assert len(codons) == len(peptide) + 1
+    assert codons[-1] in ('TAA', 'TAG', 'TGA')
+
+def test_cached_window_is_the_first_proposal(stub_rbs_chooser):
+    """
+    A window solved before after the same last nucleotides is proposed from the cache, and accepted
+    windows are stored.
+    """
+    from genedesign.window_cache import WindowCache
+    mc = MonteCarlo()
+    mc.seed = 3
+    mc.window_cache = WindowCache()
+    mc.window_cache.initiate()
+    mc.initiate()
+    mc.cache_constraints = 'test'
+    proposals = []
+
+    def accept_all(generated_codons, codons, rbs, len_peptide, short_circuit=False, context=None):
+        proposals.append(list(generated_codons))
+        return True, 1.0
+
+    mc.checker.run = accept_all
+    context = mc.checker.new_context("GATTTAACTTTAAGAAGGAGATATACATATG", ['ATG'])
+    cached = ['AAG', 'ACC', 'ATC', 'ATC', 'GCG', 'CTG', 'TCT', 'TAC', 'ATC']
+    mc.window_cache.put('KTIIALSYI', 'ATGATG', 'test', cached)
+
+    assert mc._MonteCarlo__find_codons('KTIIALSYI', ['ATG'], None, 30, context) == cached[:3]
+    assert proposals == [cached]
+    assert mc.window_cache.hits == 1
+
+    window_codons = mc._MonteCarlo__find_codons('FCLVFADYK', ['ATG'], None, 30, context)
+    assert mc.window_cache.get('FCLVFADYK', 'ATGATG', 'test')[:3] == window_codons
+
+def test_template_codons_are_the_first_proposal(stub_rbs_chooser):
+    """
+    Window residues covered by the template keep its codons in the first proposal; the rest are sampled.
+    """
+    mc = MonteCarlo()
+    mc.seed = 3
+    mc.initiate()
+    proposals = []
+
+    def accept_all(generated_codons, codons, rbs, len_peptide, short_circuit=False, context=None):
+        proposals.append(list(generated_codons))
+        return True, 1.0
+
+    mc.checker.run = accept_all
+    context = mc.checker.new_context("GATTTAACTTTAAGAAGGAGATATACATATG", ['ATG'])
+    template = ['AAG', 'ACC', None, 'ATC', 'GCG', None, 'TCT', 'TAC', 'ATC']
+
+    assert mc._MonteCarlo__find_codons('KTIIALSYI', ['ATG'], None, 30, context, template=template) == proposals[0][:3]
+    assert len(proposals) == 1
+    assert [codon for codon, kept in zip(proposals[0], template) if kept] == [codon for codon in template if codon]
+    assert proposals[0][2] in ('ATT', 'ATC', 'ATA') and proposals[0][5] in ('CTG', 'CTC', 'CTA', 'CTT', 'TTA', 'TTG')
@@ -0,0 +1,69 @@
+import io
+import pytest
+from genedesign.models.operon import Operon
+from genedesign.models.rbs_option import RBSOption
+from genedesign.models.transcript import Transcript
+from genedesign.operon_to_seq import operon_length, operon_to_seq, write_operon
+from genedesign.operon_writer import iter_chunks, operon_features, write_fasta, write_genbank
+from genedesign.transcript_to_seq import transcript_parts, transcript_to_seq
+
+@pytest.fixture
+def operon():
+    rbs1 = RBSOption(utr="GATTTAACTTTAAGAAGGAGATATACAT", cds="ATGTAA", gene_name="geneA", first_six_aas="M")
+    rbs2 = RBSOption(utr="AAAGAGGAGAAATACTAG", cds="ATGTAA", gene_name="geneB", first_six_aas="M")
+    transcripts = [
+        Transcript(rbs1, "MKA", ["ATG", "AAA", "GCA", "TAA"]),
+        Transcript(rbs2, "MW", ["atg", "tgg", "tga"]),
+    ]
+    return Operon(transcripts, "TTGACAATTAATCATCGGCTCGTATAATG", "CCAGGCATCAAATAAAACGAAAGGCTCAGTCGAAAGACTGGGCCTTTCGTTTTAT")
+
+def test_operon_to_seq_layout(operon):
+    seq = operon_to_seq(operon)
+    expected = (operon.promoter
+                + "gatttaactttaagaaggagatatacat" + "ATGAAAGCATAA"
+                + "aaagaggagaaatactag" + "ATGTGGTGA"
+                + operon.terminator)
+    assert seq == expected
+    assert operon_length(operon) == len(seq)
+    assert transcript_to_seq(operon.transcripts[1]) == "aaagaggagaaatactagATGTGGTGA"
+    assert list(transcript_parts(operon.transcripts[1])) == ["aaagaggagaaatactag", "ATG", "TGG", "TGA"]
+
+def test_write_operon_matches(operon):
+    out = io.StringIO()
+    assert write_operon(operon, out) == operon_length(operon)
+    assert out.getvalue() == operon_to_seq(operon)
+
+def test_iter_chunks():
+    chunks = list(iter_chunks(["ABCDE", "", "FG", "HIJKLMNOPQRST", "U"], 4))
+    assert chunks == ["ABCD", "EFGH", "IJKL", "MNOP", "QRST", "U"]
+    assert list(iter_chunks([], 4)) == []
+
+def test_write_fasta(operon):
+    out = io.StringIO()
+    assert write_fasta([("construct1", operon), ("construct2", operon)], out, line_width=50) == 2
+
+    records = out.getvalue().split('>')[1:]
+    assert len(records) == 2
+    header, *lines = records[0].strip().split('\n')
+    assert header == "construct1"
+    assert all(len(line) == 50 for line in lines[:-1])
+    assert ''.join(lines) == operon_to_seq(operon)
+
+def test_operon_features(operon):
+    features = operon_features(operon)
+    assert [key for key, *_ in features] == ['promoter', "5'UTR", 'CDS', "5'UTR", 'CDS', 'terminator']
+    seq = operon_to_seq(operon)
+    _, start, end, qualifiers = features[2]
+    assert seq[start - 1:end] == "ATGAAAGCATAA"
+    assert qualifiers['translation'] == "MKA"
+    assert features[-1][2] == len(seq)
+
+def test_write_genbank_parses(operon, tmp_path):
+    SeqIO = pytest.importorskip("Bio.SeqIO")
+    path = str(tmp_path / "constructs.gb")
+    assert write_genbank([("construct1", operon)], path, date="01-JAN-2025") == 1
+
+    record = SeqIO.read(path, "genbank")
+    assert str(record.seq) == operon_to_seq(operon).upper()
+    cds = [feature for feature in record.features if feature.type == "CDS"]
+    assert [str(feature.extract(record.seq).translate(to_stop=True)) for feature in cds] == ["MKA", "MW"]
@@ -0,0 +1,53 @@
+import pytest
+from genedesign.profiler import Profiler
+from genedesign.transcript_designer import TranscriptDesigner
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    with profiler.stage('design'):
+        pass
+    profiler.count('attempts')
+    profiler.record_window(3, True)
+    profiler.record_check('gc', False)
+
+    summary = profiler.summary()
+    assert summary['stages'] == {}
+    assert summary['counters'] == {}
+    assert summary['windows']['total'] == 0
+    assert summary['checks'] == {}
+
+def test_enabled_profiler_collects_counters():
+    profiler = Profiler(enabled=True)
+    for _ in range(3):
+        with profiler.stage('design'):
+            pass
+    profiler.record_window(1, True)
+    profiler.record_window(4, True)
+    profiler.record_window(100, False)
+    profiler.record_check('gc', True)
+    profiler.record_check('gc', False)
+
+    summary = profiler.summary()
+    assert summary['stages']['design']['calls'] == 3
+    assert summary['windows'] == {
+        'total': 3, 'accepted': 2, 'fallback': 1, 'attempts': 105, 'mean_attempts': 35.0,
+        'attempt_histogram': {1: 1, 4: 1, 100: 1},
+    }
+    assert summary['checks']['gc']['acceptance_rate'] == 0.5
+    assert "Checker acceptance" in profiler.report()
+
+def test_transcript_designer_exposes_profile(stub_rbs_chooser):
+    designer = TranscriptDesigner()
+    designer.initiate()
+    designer.enable_profiling()
+    designer.run("MKTAYIAKQRQISFVKSHFSRQLEERLGLIEVQ", set())
+
+    profile = designer.profile()
+    assert profile['stages']['design']['calls'] == 1
+    assert profile['stages']['rbs_selection']['calls'] == 1
+    assert profile['windows']['total'] > 0
+    assert profile['windows']['attempts'] >= profile['windows']['total']
+    assert set(profile['checks']) <= {'codons', 'forbidden', 'promoter', 'hairpin', 'gc'}
+
+    designer.reset_profile()
+    assert designer.profile()['windows']['total'] == 0
@@ -0,0 +1,117 @@
+import random
+import Levenshtein
+import pytest
+from Bio import SeqIO
+from Bio.Seq import Seq
+from Bio.SeqFeature import FeatureLocation, SeqFeature
+from Bio.SeqRecord import SeqRecord
+from genedesign import rbs_library
+from genedesign.models.host import Host
+from genedesign.models.rbs_option import RBSOption
+from genedesign.rbs_chooser import RBSChooser
+from genedesign.seq_utils.hairpin_counter import optimized_non_stupid_hairpin_counter
+from tests.benchmarking.synthetic_inputs import SyntheticRBSChooser, random_codons, random_dna
+
+def full_scan(chooser, cds, ignores):
+    """
+    The original optimized_run: score every option and keep the first lowest score.
+    """
+    input_peptide = chooser.translator.run(cds[:18])
+    best_score, best_option = float('inf'), None
+    for rbs_option in chooser.rbs_options:
+        if rbs_option in ignores:
+            continue
+        hairpin_score = optimized_non_stupid_hairpin_counter(rbs_option.utr + cds, min_stem=4, min_loop=3, max_loop=8)
+        score = hairpin_score * 0.5 + Levenshtein.distance(input_peptide, rbs_option.first_six_aas) * 0.5
+        if score < best_score:
+            best_score, best_option = score, rbs_option
+    return best_option
+
+@pytest.fixture
+def chooser():
+    chooser = SyntheticRBSChooser()
+    chooser.initiate()
+    # Reuse a few prefixes so several options share a bucket
+    options = chooser.rbs_options
+    chooser.rbs_options = options[:150] + [
+        RBSOption(utr=option.utr, cds=options[i % 5].cds, gene_name=option.gene_name, first_six_aas=options[i % 5].first_six_aas)
+        for i, option in enumerate(options[150:])
+    ]
+    return chooser
+
+def test_optimized_run_matches_full_scan(chooser):
+    rng = random.Random(3)
+    for trial in range(40):
+        cds = ''.join(['ATG'] + random_codons(rng.randint(5, 60), seed=trial))
+        if trial % 4 == 0:
+            # Start from an existing option's CDS so a distance-0 bucket exists
+            cds = chooser.rbs_options[trial].cds[:18] + cds[18:]
+        ignores = set(rng.sample(chooser.rbs_options, rng.randint(0, 20)))
+        assert chooser.optimized_run(cds, ignores) == full_scan(chooser, cds, ignores)
+
+def test_optimized_run_reindexes_replaced_options(chooser):
+    cds = chooser.rbs_options[0].cds[:30]
+    chooser.optimized_run(cds, set())
+    chooser.rbs_options = chooser.rbs_options[1:]
+    assert chooser.optimized_run(cds, set()) == full_scan(chooser, cds, set())
+
+def test_short_utrs_are_indexed(chooser):
+    options = chooser.rbs_options
+    chooser.rbs_options = [RBSOption(utr=utr, cds=option.cds, gene_name=option.gene_name, first_six_aas=option.first_six_aas)
+                           for utr, option in zip(['', 'ACG'], options)] + options[2:]
+    chooser.index_options()
+    assert chooser.utr_hairpins[:2] == [0, 0]
+    cds = options[0].cds[:30]
+    assert chooser.optimized_run(cds, set()) == full_scan(chooser, cds, set())
+
+def test_optimized_run_all_ignored(chooser):
+    with pytest.raises(ValueError):
+        chooser.optimized_run("ATGAAAGCA", set(chooser.rbs_options))
+
+@pytest.fixture
+def library_sources(tmp_path, monkeypatch):
+    # Twenty 60 bp genes (ATG + 19 sense codons) separated by 40 bp of random intergenic sequence
+    genome = ''.join(random_dna(40, seed=number) + 'ATG' + ''.join(random_codons(19, seed=number)) for number in range(1, 21))
+    record = SeqRecord(Seq(genome + random_dna(40)), id="TEST02", name="TEST02", annotations={"molecule_type": "DNA"})
+    for number in range(1, 21):
+        start = 100 * (number - 1) + 40
+        location = FeatureLocation(start, start + 60, strand=1)
+        qualifiers = {"locus_tag": [f"b{number:04d}"], "gene": [f"gen{number}"]}
+        record.features.append(SeqFeature(location, type="gene", qualifiers=qualifiers))
+        record.features.append(SeqFeature(location, type="CDS", qualifiers=qualifiers))
+    genbank_file = str(tmp_path / "genome.gb")
+    SeqIO.write(record, genbank_file, "genbank")
+
+    abundance_file = tmp_path / "abundance.txt"
+    abundance_file.write_text("\n".join(f"4932.b{number:04d}\t{100 - number}" for number in range(1, 21)) + "\n")
+
+    monkeypatch.setattr(rbs_library, 'LIBRARY_DIR', str(tmp_path))
+    monkeypatch.setattr(rbs_library, 'RBS_LIBRARY_SOURCES', {})
+    monkeypatch.setattr(rbs_library, '_libraries', {})
+    rbs_library.register_rbs_library_source(Host.Scerevisiae, str(abundance_file), genbank_file)
+    return tmp_path
+
+def test_library_is_compiled_once_and_shared(library_sources, monkeypatch):
+    library = rbs_library.get_rbs_library("Scerevisiae", 10)
+    assert len(library) == 2
+    assert [option.gene_name for option in library.options] == ["gen1", "gen2"]
+    assert all(len(option.first_six_aas) <= 6 for option in library.options)
+    assert rbs_library.get_rbs_library(Host.Scerevisiae, 10.0) is library
+    assert len(rbs_library.get_rbs_library(Host.Scerevisiae, 50)) == 10
+
+    # A fresh process loads the compiled file without touching the sources
+    monkeypatch.setattr(rbs_library, '_libraries', {})
+    monkeypatch.setattr(rbs_library, 'get_top_percent_utr_cds', None)
+    assert rbs_library.get_rbs_library(Host.Scerevisiae, 10).options == library.options
+
+def test_chooser_uses_host_library(library_sources):
+    chooser = RBSChooser()
+    chooser.host = Host.Scerevisiae
+    chooser.percentile = 25
+    chooser.initiate()
+    assert len(chooser.rbs_options) == 5
+    assert chooser.optimized_run(chooser.rbs_options[0].cds, set()) in chooser.rbs_options
+
+def test_unregistered_host(library_sources):
+    with pytest.raises(ValueError):
+        rbs_library.get_rbs_library(Host.Ecoli)
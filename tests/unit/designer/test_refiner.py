@@ -0,0 +1,112 @@
+import pytest
+from genedesign.refiner import AnnealingRefiner, _RefineState
+from genedesign.objective import Objective, CAITerm, GCTerm
+from genedesign.models.rbs_option import RBSOption
+from genedesign.models.transcript import Transcript
+from genedesign.seq_utils.Translate import Translate
+from genedesign.checkers.forbidden_sequence_checker import ForbiddenSequenceChecker
+from genedesign.transcript_designer import TranscriptDesigner
+from tests.benchmarking.synthetic_inputs import random_protein
+
+
+@pytest.fixture
+def refiner():
+    r = AnnealingRefiner()
+    r.seed = 1
+    r.initiate()
+    return r
+
+
+@pytest.fixture
+def transcript(utr, sample_codons):
+    peptide = 'M' + random_protein(120, 3)
+    codons = sample_codons(peptide, 2)
+    rbs = RBSOption(utr=utr, cds="ATGTAA", gene_name="test", first_six_aas="M")
+    return Transcript(rbs, peptide, codons)
+
+
+def test_incremental_totals_match_rescan(refiner, transcript, utr):
+    """
+    After any sequence of swaps and undos the running totals equal a fresh scan.
+    """
+    state = _RefineState(refiner, utr.upper(), list(transcript.codons))
+    for step, index in enumerate(range(1, len(transcript.codons) - 1, 7)):
+        old_codon = state.codons[index]
+        options = refiner.synonyms[old_codon]
+        if not options:
+            continue
+        undo = state.swap(index, options[step % len(options)])
+        if step % 3 == 0:
+            state.restore(index, old_codon, undo)
+
+    fresh = _RefineState(refiner, utr.upper(), list(state.codons))
+    assert state.score() == pytest.approx(fresh.score())
+    assert state.violations() == fresh.violations()
+    assert state.hairpin_counts == fresh.hairpin_counts
+
+
+def test_refinement_keeps_protein_and_improves_score(refiner, transcript):
+    refiner.max_iterations = 400
+    refined = refiner.run(transcript, time_budget=10.0)
+
+    translator = Translate()
+    translator.initiate()
+    assert translator.run(''.join(refined.codons)) == transcript.peptide
+    assert refined.codons[0] == transcript.codons[0]
+    assert refined.codons[-1] == transcript.codons[-1]
+    assert refined.rbs == transcript.rbs
+
+    stats = refiner.last_stats
+    assert stats['iterations'] == 400
+    assert stats['final_score'] >= stats['initial_score']
+    assert stats['final_violations'] <= stats['initial_violations']
+
+
+def test_refinement_removes_forbidden_site(refiner, utr):
+    """
+    An EcoRI site (GAATTC, Glu-Phe) inside the CDS can be fixed by a synonymous swap.
+    """
+    codons = ['ATG', 'GCT', 'GAA', 'TTC', 'AAA', 'CTG', 'GGC', 'ACC', 'CAG', 'TAA']
+    rbs = RBSOption(utr=utr, cds="ATGTAA", gene_name="test", first_six_aas="M")
+    transcript = Transcript(rbs, 'MAEFKLGTQ', codons)
+    refiner.max_iterations = 300
+
+    refined = refiner.run(transcript, time_budget=10.0)
+    checker = ForbiddenSequenceChecker()
+    checker.initiate()
+    assert checker.run(utr + ''.join(refined.codons))[0]
+
+
+def test_objective_without_hairpin_or_excess_terms(transcript, utr):
+    """
+    A custom objective that lacks the hairpin and promoter excess terms scores them as weight 0.
+    """
+    objective = Objective([CAITerm(1.0), GCTerm(1.0)])
+    objective.initiate()
+    refiner = AnnealingRefiner()
+    refiner.seed = 1
+    refiner.objective = objective
+    refiner.initiate()
+
+    state = _RefineState(refiner, utr.upper(), list(transcript.codons))
+    assert state.promoter_excess == 0.0
+    assert state.score() == pytest.approx(
+        objective.score(state.measurements()) - refiner.violation_weight * state.violations())
+
+    refiner.max_iterations = 100
+    refiner.run(transcript, time_budget=10.0)
+    assert refiner.last_stats['final_score'] >= refiner.last_stats['initial_score']
+
+
+def test_zero_budget_returns_input(refiner, transcript):
+    assert refiner.run(transcript, time_budget=0) is transcript
+
+
+def test_designer_refine_budget(stub_rbs_chooser):
+    designer = TranscriptDesigner()
+    designer.initiate()
+    designer.refiner.max_iterations = 50
+
+    transcript = designer.run("MYPFIRTARMTV", set(), refine_budget=5.0)
+    assert designer.refiner.last_stats['iterations'] == 50
+    assert len(transcript.codons) == len("MYPFIRTARMTV") + 1
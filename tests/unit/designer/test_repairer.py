@@ -0,0 +1,91 @@
+import pytest
+from genedesign.repairer import CDSRepairer
+from genedesign.models.rbs_option import RBSOption
+from genedesign.seq_utils.Translate import Translate
+from tests.benchmarking.synthetic_inputs import random_protein
+
+
+@pytest.fixture
+def repairer():
+    r = CDSRepairer()
+    r.initiate()
+    return r
+
+
+@pytest.fixture
+def translator():
+    t = Translate()
+    t.initiate()
+    return t
+
+
+def test_repair_keeps_protein_and_reduces_violations(repairer, translator, codons, utr):
+    before = repairer.violations(codons, utr)
+    result = repairer.run(codons, utr)
+
+    assert translator.run(''.join(result.codons)) == translator.run(''.join(codons))
+    assert result.codons[0] == codons[0] and result.codons[-1] == codons[-1]
+    assert len(result.violations) < len(before)
+    assert result.violations == repairer.violations(result.codons, utr)
+    assert result.edits == [(i, a, b) for i, (a, b) in enumerate(zip(codons, result.codons)) if a != b]
+
+
+def test_planted_site_is_fixed_locally(repairer, codons, utr):
+    """
+    A forbidden site planted in the middle is removed by editing one of the codons it covers.
+    """
+    codons = list(codons)
+    codons[60:62] = ['GAA', 'TTC']  # EcoRI
+    assert 'GAATTC' in [v.detail for v in repairer.violations(codons, utr)]
+    result = repairer.run(codons, utr)
+
+    assert 'GAATTC' not in [v.detail for v in result.violations]
+    assert {60, 61} & {index for index, _, _ in result.edits}
+
+
+def test_repairable_cds_passes(repairer, sample_codons):
+    """
+    Without a UTR every violation of this CDS (forbidden sites, hairpins, codon usage) can be
+    repaired, plus a planted EcoRI site.
+    """
+    codons = sample_codons('M' + random_protein(100, 0), 0)
+    codons[40:42] = ['GAA', 'TTC']  # EcoRI
+    assert {v.check for v in repairer.violations(codons)} >= {'forbidden', 'hairpin', 'codons'}
+
+    result = repairer.run(codons)
+
+    assert result.passed
+    assert repairer.violations(result.codons) == []
+
+
+def test_max_edits_is_respected(repairer, codons, utr):
+    result = repairer.run(codons, utr, max_edits=3)
+    assert len(result.edits) <= 3
+
+
+def test_designer_repair_builds_transcript(codons, utr):
+    from tests.benchmarking.synthetic_inputs import synthetic_rbs_library
+    with synthetic_rbs_library():
+        from genedesign.transcript_designer import TranscriptDesigner
+        designer = TranscriptDesigner()
+        designer.initiate()
+    rbs = RBSOption(utr=utr, cds="ATGTAA", gene_name="test", first_six_aas="M")
+    result = designer.repair(codons, rbs, max_edits=5)
+
+    assert result.transcript.rbs == rbs
+    assert result.transcript.codons == result.codons
+    assert result.transcript.peptide == designer.translator.run(''.join(codons))
+
+
+def test_regions_limit_the_repair(repairer, codons, utr):
+    """
+    With regions, only violations overlapping them are repaired and edits stay near them.
+    """
+    codons = list(codons)
+    codons[60:62] = ['GAA', 'TTC']  # EcoRI
+    site = len(utr) + 3 * 60
+    result = repairer.run(codons, utr, regions=[(site, site + 6)])
+
+    assert 'GAATTC' not in [v.detail for v in result.violations]
+    assert result.edits
+    assert all(abs(index - 60) <= 20 for index, _, _ in result.edits)
@@ -0,0 +1,73 @@
+import pytest
+from genedesign.segmented_designer import SegmentedDesigner, RARE_CODON_SECTIONS
+from genedesign.seq_utils.Translate import Translate
+from tests.benchmarking.synthetic_inputs import random_protein
+
+@pytest.fixture
+def translator():
+    translator = Translate()
+    translator.initiate()
+    return translator
+
+@pytest.fixture
+def designer(stub_rbs_chooser):
+    designer = SegmentedDesigner()
+    designer.workers = 0  # Segments designed in this process
+    designer.n_segments = 3
+    designer.min_segment_length = 50
+    designer.initiate()
+    return designer
+
+def test_plan_tiles_the_peptide(designer):
+    cores = designer.plan(301)
+    assert len(cores) == 3
+    assert cores[0][0] == 0 and cores[-1][1] == 301
+    assert all(end == start for (_, end), (start, _) in zip(cores, cores[1:]))
+
+def test_overlaps_stay_within_one_rare_codon_section(designer):
+    designer.overlap = 20
+    len_peptide = 300
+    section_length = len_peptide // RARE_CODON_SECTIONS
+    for start, _ in designer.plan(len_peptide)[1:]:
+        assert not any(start - designer.overlap + 1 < k * section_length <= start for k in range(1, RARE_CODON_SECTIONS))
+
+def test_short_peptides_are_not_segmented(designer, translator):
+    peptide = "MYPFIRTARMTVCAKKHVHLTRDAAEQLLADIDRRLDQLLPVEGERD"
+    transcript = designer.run(peptide, set())
+    assert designer.last_stats['segments'] == 1
+    assert translator.run(''.join(transcript.codons)) == peptide
+
+def test_segmented_design_encodes_the_peptide(designer, translator):
+    peptide = 'M' + random_protein(240, 3)
+    transcript = designer.run(peptide, set())
+
+    assert designer.last_stats['segments'] == 3
+    assert len(transcript.codons) == len(peptide) + 1
+    assert translator.run(''.join(transcript.codons)) == peptide
+    assert transcript.codons[0] == 'ATG'
+    assert transcript.rbs.utr
+
+def test_cut_avoids_a_site_the_junction_would_create(designer):
+    """
+    Both designs of the overlap encode six residues GCT GCT GCT + three lysines. Keeping more than one of
+    the left design's AAA codons before the right design's AAG codons forms a poly(A) site.
+    """
+    left = ['GCT'] * 20 + ['AAA', 'AAA', 'AAA']
+    right = ['GCT', 'GCT', 'GCT', 'AAG', 'AAG', 'AAG'] + ['GCT'] * 20
+    cut, violations = designer._choose_cut(left, right, right_start=17, junction=23)
+    assert violations == 0
+    assert cut <= 21
+    assert 'AAAAAAAA' not in ''.join(left[:cut] + right[cut - 17:])
+
+def test_worker_processes_design_the_segments(stub_rbs_chooser, translator):
+    designer = SegmentedDesigner()
+    designer.workers = 2
+    designer.min_segment_length = 50
+    designer.initiate()
+    try:
+        peptide = 'M' + random_protein(160, 4)
+        transcript = designer.run(peptide, set())
+    finally:
+        designer.close()
+    assert designer.last_stats['segments'] == 2
+    assert translator.run(''.join(transcript.codons)) == peptide
@@ -0,0 +1,146 @@
+import asyncio
+import time
+import pytest
+from genedesign.montecarlo import DesignCancelled
+from genedesign.models.rbs_option import RBSOption
+from genedesign.models.transcript import Transcript
+from genedesign.service import DesignService, DesignClient, default_designer_factory
+from genedesign.transcript_designer import TranscriptDesigner
+
+class StubDesigner:
+    """
+    Stands in for TranscriptDesigner in the worker processes. Designing takes `delay` seconds per
+    residue, and the stop hook is polled once per residue as MonteCarlo polls it once per window.
+    """
+    delay = 0.002
+
+    def __init__(self):
+        self.should_stop = None
+
+    def set_stop_hook(self, should_stop):
+        self.should_stop = should_stop
+
+    def run(self, peptide, ignores):
+        if peptide.startswith('X'):
+            raise ValueError("Unsupported residue")
+        delay = 0.05 if peptide.startswith('MSLOW') else self.delay
+        for _ in peptide:
+            if self.should_stop is not None and self.should_stop():
+                raise DesignCancelled()
+            time.sleep(delay)
+        rbs = RBSOption(utr="GATTTAACTTTAAGAAGGAGATATACATATG", cds="ATGTAA", gene_name="stub", first_six_aas="M")
+        return Transcript(rbs, peptide, ['ATG'] * len(peptide) + ['TAA'])
+
+def stub_factory():
+    return StubDesigner()
+
+def run_service(test, **settings):
+    """
+    Starts a service with stub workers on a free port, runs `test(service, client)` and stops it.
+    """
+    service = DesignService()
+    service.port = 0
+    service.workers = 1
+    service.designer_factory = stub_factory
+    for name, value in settings.items():
+        setattr(service, name, value)
+    service.initiate()
+
+    async def main():
+        await service.start()
+        try:
+            async with DesignClient(service.host, service.port) as client:
+                return await test(service, client)
+        finally:
+            await service.stop()
+
+    return asyncio.run(main())
+
+
+def test_round_trip():
+    async def test(service, client):
+        return await client.design_transcript("MYPF", deadline=10)
+
+    response = run_service(test)
+    assert response['status'] == 'ok'
+    assert response['transcript']['cds'] == 'ATG' * 4 + 'TAA'
+    assert response['transcript']['gene'] == 'stub'
+
+
+def test_requests_are_batched():
+    async def test(service, client):
+        return await asyncio.gather(*[client.design_transcript("MYPF" * 3, deadline=10) for _ in range(6)])
+
+    responses = run_service(test, batch_size=3, batch_window=0.2)
+    assert all(response['status'] == 'ok' for response in responses)
+    assert max(response['batch_size'] for response in responses) > 1
+    assert len({response['id'] for response in responses}) == 6
+
+
+def test_full_queue_answers_busy():
+    async def test(service, client):
+        return await asyncio.gather(*[client.design_transcript("MSLOW", deadline=10) for _ in range(8)])
+
+    responses = run_service(test, max_queue=1, batch_size=1)
+    statuses = [response['status'] for response in responses]
+    assert 'busy' in statuses
+    assert 'ok' in statuses
+
+
+def test_deadline_stops_inflight_work():
+    async def test(service, client):
+        start = time.perf_counter()
+        response = await client.design_transcript("MSLOW" + "A" * 200, deadline=0.3)
+        return response, time.perf_counter() - start
+
+    response, elapsed = run_service(test)
+    assert response['status'] == 'timeout'
+    # The full design would take 10 s; the stop hook ends it within a window
+    assert elapsed < 3
+
+
+def test_cancel_inflight_request():
+    async def test(service, client):
+        pending = asyncio.create_task(client.design_transcript("MSLOW" + "A" * 200, deadline=30, request_id='slow'))
+        await asyncio.sleep(0.3)
+        await client.cancel('slow')
+        return await pending
+
+    assert run_service(test)['status'] == 'cancelled'
+
+
+def test_errors_are_reported():
+    async def test(service, client):
+        return await asyncio.gather(
+            client.design_transcript("XYZ", deadline=10),
+            client.request({'type': 'unknown'}),
+        )
+
+    design_error, type_error = run_service(test)
+    assert design_error['status'] == 'error' and 'Unsupported residue' in design_error['error']
+    assert type_error['status'] == 'error'
+
+
+def test_montecarlo_stop_hook(stub_rbs_chooser):
+    designer = TranscriptDesigner()
+    designer.initiate()
+    designer.set_stop_hook(lambda: True)
+    with pytest.raises(DesignCancelled):
+        designer.run("MYPFIRTARMTV", set())
+
+    designer.set_stop_hook(None)
+    assert len(designer.run("MYPFIRTARMTV", set()).codons) == 13
+
+
+def test_operon_round_trip(stub_rbs_chooser):
+    # Real TranscriptDesigner workers; forked workers inherit the stubbed RBSChooser
+    async def test(service, client):
+        return await client.design_operon(["MYPFIRTARMTV", "MSKGEELFTGVV"], "TTGACA", "TTTTTT", deadline=30)
+
+    response = run_service(test, designer_factory=default_designer_factory)
+    assert response['status'] == 'ok'
+    assert len(response['transcripts']) == 2
+    cds = [transcript['cds'] for transcript in response['transcripts']]
+    assert all(len(sequence) == 3 * 13 for sequence in cds)
+    assert response['sequence'].startswith("TTGACA") and response['sequence'].endswith("TTTTTT")
+    assert all(sequence in response['sequence'] for sequence in cds)
@@ -6,4 +6,97 @@ Coverage:
 Test the reverse-translation of protein sequences into optimized DNA.
 Ensure proper RBS assignment for each mRNA.
 Validate handling of codon optimization and RNA folding requirements.
-"""
\ No newline at end of file
+"""
+
+import pytest
+from genedesign.seq_utils.Translate import Translate
+from genedesign.transcript_designer import TranscriptDesigner
+from tests.benchmarking.synthetic_inputs import random_protein
+
+@pytest.fixture
+def translator():
+    translator = Translate()
+    translator.initiate()
+    return translator
+
+def test_transcript_covers_every_residue(stub_rbs_chooser, translator):
+    peptide = "MYPFIRTARMTVCAKKHVHLTRDAAEQLLADIDRRLDQLLPVEGERDVVGAAMREGALAPGKRIRPMLLLLTARDLGC"
+    designer = TranscriptDesigner()
+    designer.initiate()
+
+    transcript = designer.run(peptide, set())
+
+    # Every window must contribute its codons, even when no candidate passes the checks
+    assert len(transcript.codons) == len(peptide) + 1
+    assert translator.run(''.join(transcript.codons)) == peptide
+    assert transcript.codons[-1] in ("TAA", "TGA", "TAG")
+
+def test_paralog_starts_from_the_earlier_design(stub_rbs_chooser, translator):
+    peptide = "MYPFIRTARMTVCAKKHVHLTRDAAEQLLADIDRRLDQLLPVEGERDVVGAAMREGALAPGKRIRPMLLLLTARDLGC"
+    paralog = "MSTNQW" + peptide[6:50] + "WHEKNQ" + peptide[56:]
+    designer = TranscriptDesigner()
+    designer.initiate()
+    designer.enable_profiling()
+
+    first = designer.run(peptide, set())
+    designer.design_index.initiate()
+    designer.design_index.add(peptide + '*', first.codons)
+    second = designer.run(paralog, set())
+
+    assert translator.run(''.join(second.codons)) == paralog
+    counters = designer.profile()['counters']
+    assert counters['warm_start.reused_codons'] > 0
+    # Windows inside the shared stretch pass their first proposal
+    shared = sum(a == b for a, b in zip(first.codons[9:47], second.codons[9:47]))
+    assert shared >= 30
+
+def test_only_validated_designs_are_indexed(stub_rbs_chooser):
+    designer = TranscriptDesigner()
+    designer.initiate()
+    designer.design_index.max_designs = 3
+
+    validated = 0
+    for seed in range(6):
+        designer.run(random_protein(120, seed=seed), set())
+        validated += not designer.search_algorithm.fallback_windows
+    assert len(designer.design_index) == min(validated, 3)
+
+    designer.design_index.initiate()
+    designer.run(random_protein(120, seed=7), set(), budget=0.0)
+    assert designer.search_algorithm.timed_out
+    assert len(designer.design_index) == 0
+
+def test_expired_deadline_still_returns_a_complete_design(stub_rbs_chooser, translator):
+    peptide = "MYPFIRTARMTVCAKKHVHLTRDAAEQLLADIDRRLDQLLPVEGERDVVGAAMREGALAPGKRIRPMLLLLTARDLGC"
+    designer = TranscriptDesigner()
+    designer.initiate()
+
+    result = designer.run_anytime(peptide, set(), budget=0.0)
+
+    assert result.timed_out
+    assert translator.run(''.join(result.transcript.codons)) == peptide
+    assert result.violations == designer.repairer.violations(result.transcript.codons, result.transcript.rbs.utr)
+
+def test_budget_bounds_the_design_time(stub_rbs_chooser, translator):
+    peptide = 'M' + random_protein(600, 2)
+    designer = TranscriptDesigner()
+    designer.initiate()
+    designer.run_anytime(peptide[:50], set(), budget=0.05)  # Warm up
+
+    result = designer.run_anytime(peptide, set(), budget=0.1)
+
+    # The search stops at the deadline; the bound on the finishing work is generous for slow machines
+    assert result.timed_out
+    assert result.elapsed < 2.0
+    assert translator.run(''.join(result.transcript.codons)) == peptide
+
+def test_background_improvement_does_not_add_violations(stub_rbs_chooser):
+    designer = TranscriptDesigner()
+    designer.initiate()
+
+    result = designer.run_anytime('M' + random_protein(120, 4), set(), budget=0.02, keep_improving=True)
+
+    if result.violations:
+        improved = result.improved.result(timeout=60)
+        assert improved.transcript.peptide == result.transcript.peptide
+        assert len(improved.violations) <= len(result.violations)
@@ -0,0 +1,45 @@
+import pytest
+from genedesign.window_cache import WindowCache
+
+@pytest.fixture
+def cache():
+    cache = WindowCache()
+    cache.initiate()
+    return cache
+
+def test_stored_codons_are_returned(cache):
+    cache.put('MKT', 'GATATG', 'c1', ['ATG', 'AAA', 'ACC'])
+    assert cache.get('MKT', 'GATATG', 'c1') == ['ATG', 'AAA', 'ACC']
+    assert cache.get('MKT', 'CATATG', 'c1') is None
+    assert cache.get('MKT', 'GATATG', 'c2') is None  # Other constraints never hit
+    summary = cache.summary()
+    assert (summary['hits'], summary['misses'], summary['stores']) == (1, 2, 1)
+    assert summary['hit_rate'] == pytest.approx(1 / 3)
+
+def test_codons_must_cover_the_window(cache):
+    with pytest.raises(ValueError):
+        cache.put('MKT', '', 'c1', ['ATG'])
+
+def test_least_recently_used_entry_is_evicted(cache):
+    cache.max_entries = 2
+    cache.put('AA', '', 'c', ['GCT', 'GCT'])
+    cache.put('KK', '', 'c', ['AAA', 'AAA'])
+    cache.get('AA', '', 'c')
+    cache.put('GG', '', 'c', ['GGT', 'GGT'])
+    assert len(cache) == 2
+    assert cache.get('KK', '', 'c') is None
+    assert cache.get('AA', '', 'c') == ['GCT', 'GCT']
+    assert cache.evictions == 1
+
+def test_cache_persists_between_runs(cache, tmp_path):
+    path = str(tmp_path / 'windows.tsv')
+    cache.put('AA', '', 'c', ['GCT', 'GCC'])
+    cache.put('KTI', 'ATGATG', 'c', ['AAA', 'ACC', 'ATT'])
+    cache.save(path)
+
+    restored = WindowCache()
+    restored.path = path
+    restored.initiate()
+    assert len(restored) == 2
+    assert restored.get('KTI', 'ATGATG', 'c') == ['AAA', 'ACC', 'ATT']
+    assert list(restored.entries) == list(cache.entries)
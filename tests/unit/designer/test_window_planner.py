@@ -0,0 +1,58 @@
+import pytest
+from genedesign.window_planner import WindowPlanner
+from genedesign.sliding_window_generator import sliding_window_generator
+
+@pytest.fixture
+def planner():
+    planner = WindowPlanner()
+    planner.initiate()
+    return planner
+
+def test_plan_without_feedback_matches_sliding_windows(planner):
+    """
+    With no recorded outcomes the plan is the fixed sliding window, as index ranges.
+    """
+    peptide = 'MKTIIALSYIFCLVFADYKDDDDK*'
+    windows = [peptide[start:end] for start, _, end in planner.plan(len(peptide))]
+    assert windows == list(sliding_window_generator(peptide, n_in_scope=3, n_ahead=6))
+
+def test_plan_covers_every_residue_once(planner):
+    """
+    The committed ranges tile the peptide while the window size changes.
+    """
+    covered = []
+    for i, (start, scope_end, end) in enumerate(planner.plan(40)):
+        assert start < scope_end <= end <= 40
+        covered.extend(range(start, scope_end))
+        planner.record(1 if i % 3 else 50, i % 3 != 0)
+    assert covered == list(range(40))
+
+def test_easy_windows_widen_the_step(planner):
+    planner.record(1, True)
+    planner.record(1, True)
+    assert planner.scope == 5
+    for _ in range(10):
+        planner.record(1, True)
+    assert planner.scope == planner.max_in_scope
+
+def test_hard_windows_narrow_the_step_and_extend_lookahead(planner):
+    for _ in range(3):
+        planner.record(1, True)
+    planner.record(100, False)
+    assert planner.scope == 3
+    assert planner.ahead == 9
+    planner.record(100, False)
+    assert planner.scope == planner.min_in_scope
+    assert planner.ahead == planner.max_ahead
+
+def test_summary_and_reset(planner):
+    planner.record(1, True)
+    planner.record(30, True)
+    planner.record(100, False)
+    summary = planner.summary()
+    assert summary['windows'] == 3
+    assert summary['attempts'] == 131
+    assert summary['accepted'] == 2
+    planner.reset()
+    assert planner.summary()['windows'] == 0
+    assert planner.scope == planner.n_in_scope
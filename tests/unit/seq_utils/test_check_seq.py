@@ -1,5 +1,7 @@
 import pytest
 from genedesign.seq_utils.check_seq import CheckSequence
+from genedesign.models.rbs_option import RBSOption
+from genedesign.objective import Measurements
 
 
 @pytest.fixture
@@ -91,4 +93,127 @@ def test_multiple_checkers_fail(check_sequence):
 
     # Assert that the result is False and print the results_list for debugging
     assert result == False
-    print(f"Test forbidden_sequence_fails results: {results_list}")
\ No newline at end of file
+    print(f"Test forbidden_sequence_fails results: {results_list}")
+
+@pytest.fixture
+def rbs():
+    return RBSOption(utr="GATTTAACTTTAAGAAGGAGATATACATATG", cds="ATGTAA", gene_name="test", first_six_aas="M")
+
+
+def test_short_circuit_matches_full_verdict(check_sequence, rbs):
+    """
+    The short-circuit mode must reach the same verdict as the full mode, and the same score for accepted
+    candidates.
+    """
+    codon_sets = [
+        ["ATG", "GGT", "GCG", "AAA", "CTG", "GAA", "TTC", "CAG", "ATT", "ACC", "GAT", "CGT"],
+        ["ATG", "GAA", "TTC", "TAA"],
+        ["ATG", "GCG", "CGT", "GCG", "CGC", "GGC", "CGC", "TAA"],
+        ['ATG', 'TTG', 'ACA', 'GCT', 'AGC', 'TCA', 'GTC', 'CTA', 'GGT', 'ATA', "GGT", "TAA"],
+    ]
+    for codons in codon_sets:
+        full_result, full_score = check_sequence.run(codons[-3:], codons, rbs, len(codons))
+        short_result, short_score = check_sequence.run(codons[-3:], codons, rbs, len(codons), short_circuit=True)
+        assert short_result == full_result
+
+    # A passing window taken from a design
+    committed = ['ATG', 'CTC', 'ATG', 'TCT', 'TAC', 'GCG', 'GAT', 'ACT', 'TGG', 'TTT', 'CAT', 'GTT', 'AAG',
+                 'GGG', 'ACC', 'GGT', 'AAG', 'CCT', 'ATG', 'TGC', 'GCC', 'GTA', 'AGT', 'ACT', 'ATG', 'ACC',
+                 'CAT', 'CTA', 'TCT', 'GAT', 'CAT', 'GAC', 'CTG', 'TAC', 'GAT', 'ATC', 'AAG']
+    candidate = ['TGG', 'TTC', 'ATG']
+    full_result, full_score = check_sequence.run(candidate, committed, rbs, 61)
+    short_result, short_score = check_sequence.run(candidate, committed, rbs, 61, short_circuit=True)
+    assert full_result and short_result
+    assert short_score == pytest.approx(full_score)
+
+
+def test_short_circuit_stops_at_first_failure(check_sequence, rbs):
+    """
+    A candidate rejected by the first stage in the order must not reach the next one, and rejected
+    candidates are scored without counting RNase E sites.
+    """
+    check_sequence.check_order = ['sequence', 'codons']
+    codons = ["ATG", "GAA", "TTC", "TAA"]  # EcoRI site
+    result, score = check_sequence.run([], codons, rbs, len(codons), short_circuit=True)
+
+    assert result == False
+    full_seq = check_sequence.combine_sequences(rbs.utr, ''.join(codons))
+    sequence_result = check_sequence.fused_checker.run(full_seq)
+    assert not sequence_result.passes_forbidden
+    passed = sum([sequence_result.passes_forbidden, sequence_result.passes_promoter,
+                  sequence_result.passes_hairpin, sequence_result.passes_gc])
+    assert score == check_sequence.objective.score(Measurements(
+        checks_passed=passed, checks_total=5, hairpin_counts=sequence_result.hairpin_counts,
+        promoter_max_score=sequence_result.promoter_max_score, gc_content=sequence_result.gc_content))
+    assert check_sequence.check_stats['sequence']['calls'] == 1
+    assert check_sequence.check_stats['codons']['calls'] == 0
+
+
+def test_reorder_puts_cheap_rejecting_checks_first(check_sequence):
+    """
+    Stages are sorted by mean time divided by rejection rate, unmeasured stages first.
+    """
+    check_sequence.check_stats = {
+        'codons': {'calls': 10, 'passes': 10, 'time': 0.1},     # never rejects
+        'sequence': {'calls': 10, 'passes': 5, 'time': 1.0},    # 0.1s per call, 50% rejections
+    }
+    check_sequence.reorder_checks()
+    assert check_sequence.check_order == ['sequence', 'codons']
+
+    check_sequence.check_stats['codons'] = {'calls': 0, 'passes': 0, 'time': 0.0}
+    check_sequence.reorder_checks()
+    assert check_sequence.check_order == ['codons', 'sequence']
+
+
+def test_locate_maps_violations_to_candidate_codons(check_sequence, rbs):
+    """
+    Violations are reported in check-window coordinates and mapped back to the candidate codons they overlap.
+    """
+    committed = ["ATG", "GCT", "CAG", "GAC", "CTG", "ACC"]
+    context = check_sequence.new_context(rbs.utr, committed)
+    candidate = ["AAC", "GAA", "TTC", "CTG", "GCG", "ACC"]  # EcoRI across codons 1 and 2
+    window = context.window(candidate)
+    offset = len(window) - 3 * len(candidate)
+
+    violations = check_sequence.locate(candidate, context, 60)
+    forbidden = [v for v in violations if v.check == 'forbidden']
+    assert [(v.start - offset, v.end - offset, v.detail) for v in forbidden] == [(3, 9, "GAATTC")]
+    assert window[forbidden[0].start:forbidden[0].end] == "GAATTC"
+    assert {1, 2} <= set(check_sequence.violating_codons(candidate, context, 60))
+
+
+def test_locate_agrees_with_run(check_sequence, rbs):
+    committed = ["ATG", "GCT", "CAG", "GAC", "CTG", "ACC"]
+    context = check_sequence.new_context(rbs.utr, committed)
+    candidates = [
+        ["AAC", "GAA", "TTC", "CTG", "GCG", "ACC"],
+        ["AAC", "GAT", "TCC", "CTG", "GCG", "ACC"],
+        ["GGC", "GCG", "CGC", "GGC", "CGC", "GCC"],
+    ]
+    for candidate in candidates:
+        result, _ = check_sequence.run(candidate, committed, rbs, 60, context=context)
+        assert (check_sequence.locate(candidate, context, 60) == []) == result
+
+def test_locate_blames_the_candidate_for_rare_codons_in_the_history(check_sequence, rbs):
+    """
+    With the rare codon limit already exceeded by the committed codons, a candidate without rare
+    codons is still rejected, so locate() reports the whole candidate.
+    """
+    rare = sorted(check_sequence.codon_checker.rare_codons)
+    committed = ["ATG"] + [rare[0]] * 4
+    context = check_sequence.new_context(rbs.utr, committed)
+    candidate = ["GCG", "CTG", "AAA", "GAA", "ACC", "CAG"]
+    assert not set(candidate) & set(rare)
+
+    result, _ = check_sequence.run(candidate, committed, rbs, 60, context=context)
+    violations = [v for v in check_sequence.locate(candidate, context, 60) if v.check == 'codons']
+    assert not result
+    assert len(violations) == 1
+    assert check_sequence.violating_codons(candidate, context, 60) == list(range(len(candidate)))
+
+def test_constraint_key_follows_the_constraints(check_sequence):
+    key = check_sequence.constraint_key(50)
+    assert check_sequence.constraint_key(50) == key
+    assert check_sequence.constraint_key(40) != key
+    check_sequence.forbidden_checker.forbidden.append("GGTACC")  # KpnI
+    assert check_sequence.constraint_key(50) != key
@@ -0,0 +1,75 @@
+import pytest
+from genedesign.seq_utils.constrained_sampler import ConstrainedSampler, ForbiddenSiteAutomaton, DEAD
+from genedesign.checkers.forbidden_sequence_checker import ForbiddenSequenceChecker
+from genedesign.seq_utils.Translate import Translate
+from tests.benchmarking.synthetic_inputs import random_dna, random_protein
+
+
+@pytest.fixture(scope="module")
+def sampler():
+    s = ConstrainedSampler()
+    s.seed = 0
+    s.initiate()
+    return s
+
+
+@pytest.fixture(scope="module")
+def forbidden_checker():
+    checker = ForbiddenSequenceChecker()
+    checker.initiate()
+    return checker
+
+
+def test_automaton_matches_substring_search(sampler, forbidden_checker):
+    """
+    The automaton reaches DEAD exactly when the sequence contains a site on either strand.
+    """
+    automaton = sampler.automaton
+    for seed in range(300):
+        seq = random_dna(40, seed)
+        assert (automaton.advance(0, seq) == DEAD) == (not forbidden_checker.run(seq)[0])
+    assert automaton.advance(0, "AAAGAATTCAAA") == DEAD
+    assert automaton.advance(0, "AAGCAGGTGAA") == DEAD  # Reverse complement of AarI (CACCTGC)
+
+
+def test_codon_table_matches_advance(sampler):
+    automaton = sampler.automaton
+    for state in range(0, automaton.n_states, 7):
+        for codon, index in automaton.codon_index.items():
+            assert automaton.codon_next[state, index] == automaton.advance(state, codon)
+
+
+def test_samples_are_site_free_and_translate(sampler, forbidden_checker):
+    translator = Translate()
+    translator.initiate()
+    history = "ACGTGAA"  # A window starting with TTC would complete GAATTC
+    for seed in range(50):
+        window = random_protein(9, seed)
+        codons = sampler.run(window, history)
+        assert translator.run(''.join(codons)) == window
+        assert forbidden_checker.run(history + ''.join(codons))[0]
+
+
+def test_fixed_first_codon(sampler):
+    codons = sampler.run("MKF", fixed_first="ATG")
+    assert codons[0] == "ATG" and len(codons) == 3
+
+
+def test_distribution_is_conditioned_sampling(sampler):
+    """
+    With no reachable site the draw follows SampleCodon's probabilities; EF after GA never yields GAATTC.
+    """
+    counts = {}
+    for _ in range(2000):
+        codons = sampler.run("EF")
+        counts[tuple(codons)] = counts.get(tuple(codons), 0) + 1
+    assert ("GAA", "TTC") not in counts
+    assert len(counts) == 3  # GAG-TTC, GAA-TTT and GAG-TTT remain
+
+
+def test_infeasible_window_returns_none(sampler):
+    """
+    Lys (AAA/AAG) after seven A's always completes a poly(A) site.
+    """
+    assert sampler.run("K", "AAAAAAA") is None
+    assert sampler.run("K", "AAAAA") == ["AAG"]
@@ -0,0 +1,72 @@
+import random
+import pytest
+from genedesign.seq_utils.design_index import DesignIndex, minimizers
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+
+def random_peptide(rng, length):
+    return ''.join(rng.choice(AMINO_ACIDS) for _ in range(length))
+
+@pytest.fixture
+def index():
+    index = DesignIndex()
+    index.initiate()
+    return index
+
+def test_minimizers_are_shared_by_shared_stretches():
+    rng = random.Random(1)
+    shared = random_peptide(rng, 15)
+    left = random_peptide(rng, 30) + shared + random_peptide(rng, 10)
+    right = random_peptide(rng, 5) + shared
+    assert {kmer for _, kmer in minimizers(left, 8, 8)} & {kmer for _, kmer in minimizers(right, 8, 8)}
+
+def test_query_finds_the_shared_stretch(index):
+    rng = random.Random(2)
+    domain = random_peptide(rng, 40)
+    design = 'M' + random_peptide(rng, 30) + domain + random_peptide(rng, 20) + '*'
+    codons = [f"C{i:02d}" for i in range(len(design))]
+    design_id = index.add(design, codons)
+
+    query = 'M' + random_peptide(rng, 12) + domain + random_peptide(rng, 25) + '*'
+    segments = index.query(query)
+    assert len(segments) == 1
+    segment = segments[0]
+    assert segment.design_id == design_id
+    assert query[segment.start:segment.end] == design[segment.design_start:segment.design_start + len(segment)]
+    # The exact match may run a residue or two past the domain by chance
+    assert segment.start <= 13 and segment.end >= 53
+
+    template = index.template(query)
+    assert len(template) == len(query)
+    assert template[13:53] == codons[31:71]
+    assert template[0] is None and template[-2] is None
+
+def test_short_matches_are_ignored(index):
+    rng = random.Random(3)
+    shared = random_peptide(rng, index.min_shared - 1)
+    design = random_peptide(rng, 30) + shared + '*'
+    index.add(design, ['AAA'] * len(design))
+    assert index.query(random_peptide(rng, 20) + shared + random_peptide(rng, 20)) == []
+
+def test_longest_match_wins(index):
+    rng = random.Random(4)
+    domain = random_peptide(rng, 60)
+    index.add(domain[:30] + '*', ['AAA'] * 31)
+    index.add(domain + '*', ['CCC'] * 61)
+    template = index.template('M' + domain + '*')
+    assert template[1:61] == ['CCC'] * 60
+    assert len(index) == 2
+
+def test_add_needs_one_codon_per_residue(index):
+    with pytest.raises(ValueError):
+        index.add("MKA*", ['ATG', 'AAA', 'GCG'])
+
+def test_oldest_designs_are_evicted(index):
+    rng = random.Random(5)
+    index.max_designs = 2
+    domains = [random_peptide(rng, 40) for _ in range(3)]
+    ids = [index.add(domain + '*', ['AAA'] * 41) for domain in domains]
+    assert len(index) == 2
+    assert index.query('M' + domains[0]) == []
+    assert [segment.design_id for segment in index.query('M' + domains[2])] == [ids[2]]
+    assert all(design_id != ids[0] for postings in index.postings.values() for design_id, _ in postings)
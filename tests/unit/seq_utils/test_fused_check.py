@@ -0,0 +1,59 @@
+import random
+import pytest
+from genedesign.seq_utils.fused_check import FusedSequenceChecker
+from genedesign.checkers.forbidden_sequence_checker import ForbiddenSequenceChecker
+from genedesign.checkers.internal_promoter_checker import PromoterChecker
+from genedesign.checkers.hairpin_checker import hairpin_checker
+from genedesign.checkers.gc_content_checker import gc_checker
+
+@pytest.fixture(scope="module")
+def checkers():
+    fused = FusedSequenceChecker()
+    fused.initiate()
+    forbidden = ForbiddenSequenceChecker()
+    forbidden.initiate()
+    promoter = PromoterChecker()
+    promoter.initiate()
+    return fused, forbidden, promoter
+
+def random_sequences(n_sequences, seed=7):
+    """
+    Random sequences of skewed composition and varied length, some carrying a known promoter.
+    """
+    rng = random.Random(seed)
+    for i in range(n_sequences):
+        length = rng.choice([1, 28, 29, 49, 50, 51, 76, 120, 300])
+        weights = [rng.random() for _ in range(4)]
+        seq = ''.join(rng.choices('ACGT', weights=weights, k=length))
+        if i % 7 == 0:
+            seq = seq[:length // 2] + "TTGACAATTAATCATCGAACTAGTATAAT" + seq[length // 2:]
+        yield seq
+
+def test_matches_individual_checkers(checkers):
+    fused, forbidden, promoter = checkers
+    for seq in random_sequences(500):
+        result = fused.run(seq)
+        assert (result.passes_forbidden, result.forbidden_site) == forbidden.run(seq)
+        assert (result.passes_promoter, result.promoter_sequence) == promoter.run(seq)
+        assert (result.passes_hairpin, fused.hairpin_string(seq, result)) == hairpin_checker(seq)
+        assert (result.passes_gc, result.gc_content) == gc_checker(seq)
+
+def test_known_failures(checkers):
+    fused, _, _ = checkers
+    result = fused.run("TTGACAATTAATCATCGAACTAGTATAAT")
+    assert result.passes_promoter is False
+    assert result.promoter_max_score >= fused.threshold
+    assert fused.run("CCCGAATTCGGG").forbidden_site == "GAATTC"
+    assert fused.run("ACGTGTAAAAAAAAAAAGCG").forbidden_site == "AAAAAAAA"
+    assert fused.run("TTGAGACCTT").forbidden_site == "GGTCTC"  # Found on the reverse strand
+
+def test_lowercase_input(checkers):
+    fused, _, _ = checkers
+    assert fused.run("ccgaattcgg") == fused.run("CCGAATTCGG")
+
+def test_invalid_sequences(checkers):
+    fused, _, _ = checkers
+    with pytest.raises(ValueError, match="The sequence is empty."):
+        fused.run("")
+    with pytest.raises(ValueError, match="Invalid characters in sequence:"):
+        fused.run("ACGTNACGT")
@@ -0,0 +1,88 @@
+import os
+import pytest
+from Bio import SeqIO
+from Bio.Seq import Seq
+from Bio.SeqFeature import CompoundLocation, FeatureLocation, SeqFeature
+from Bio.SeqRecord import SeqRecord
+from genedesign.seq_utils.genome_index import GenomeIndex, index_paths
+from genedesign.seq_utils.get_top_5_percent_utr_cds import extract_genes_info, get_top_5_percent_utr_cds
+from tests.benchmarking.synthetic_inputs import random_dna
+
+def feature(kind, location, locus_tag, gene=None):
+    qualifiers = {"locus_tag": [locus_tag]}
+    if gene:
+        qualifiers["gene"] = [gene]
+    return SeqFeature(location, type=kind, qualifiers=qualifiers)
+
+@pytest.fixture
+def genbank_file(tmp_path):
+    record = SeqRecord(Seq(random_dna(2000, seed=7)), id="TEST01", name="TEST01", annotations={"molecule_type": "DNA"})
+    locations = {
+        "b0001": FeatureLocation(100, 160, strand=1),
+        "b0002": FeatureLocation(500, 590, strand=-1),
+        "b0003": FeatureLocation(20, 80, strand=1),  # UTR clipped at the record start
+        "b0004": FeatureLocation(1970, 2000, strand=-1),  # UTR clipped at the record end
+        "b0005": CompoundLocation([FeatureLocation(800, 830, strand=-1), FeatureLocation(700, 730, strand=-1)]),
+    }
+    for number, (locus_tag, location) in enumerate(locations.items()):
+        record.features.append(feature("gene", location, locus_tag, gene=f"gen{number}"))
+        record.features.append(feature("CDS", location, locus_tag))
+    record.features.append(feature("gene", FeatureLocation(1200, 1300, strand=1), "b0006", gene="noCDS"))
+
+    path = str(tmp_path / "genome.gb")
+    SeqIO.write(record, path, "genbank")
+    return path
+
+def test_matches_extract_genes_info(genbank_file):
+    expected = extract_genes_info(genbank_file)
+    index = GenomeIndex()
+    index.initiate(genbank_file)
+
+    assert len(index) == len(expected) == 5
+    for locus_tag, info in expected.items():
+        assert index.get(locus_tag) == {"gene": info["gene"], "UTR": str(info["UTR"]), "CDS": str(info["CDS"])}
+    assert "b0006" not in index
+    index.close()
+
+def test_index_is_written_next_to_data(genbank_file):
+    GenomeIndex().initiate(genbank_file)
+    assert all(os.path.exists(path) for path in index_paths(genbank_file))
+
+def test_prebuilt_index_works_without_genbank(genbank_file):
+    expected = GenomeIndex()
+    expected.initiate(genbank_file)
+    cds = expected.get("b0002")["CDS"]
+    expected.close()
+
+    os.remove(genbank_file)
+    index = GenomeIndex()
+    index.initiate(genbank_file)
+    assert index.get("b0002")["CDS"] == cds
+    index.close()
+
+def test_stale_index_is_rebuilt(genbank_file):
+    index = GenomeIndex()
+    index.initiate(genbank_file)
+    index.close()
+
+    record = SeqIO.read(genbank_file, "genbank")
+    record.features = record.features[:2]
+    SeqIO.write(record, genbank_file, "genbank")
+    os.utime(genbank_file, ns=(0, 0))
+
+    index.initiate(genbank_file)
+    assert len(index) == 1
+    index.close()
+
+def test_missing_files_raise(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        GenomeIndex().initiate(str(tmp_path / "missing.gb"))
+
+def test_top_percent_uses_index(genbank_file, tmp_path):
+    abundance_file = tmp_path / "abundance.txt"
+    lines = [f"511145.b{number:04d}\t{1000 - number}" for number in range(1, 41)]
+    abundance_file.write_text("#comment\n" + "\n".join(lines) + "\n")
+
+    top = get_top_5_percent_utr_cds(str(abundance_file), genbank_file)
+    assert list(top) == ["b0001", "b0002"]
+    assert top["b0001"]["CDS"] == str(extract_genes_info(genbank_file)["b0001"]["CDS"])
@@ -0,0 +1,102 @@
+import math
+import pytest
+from genedesign.objective import Objective, ObjectiveTerm, Measurements, DEFAULT_WEIGHTS
+from genedesign.checkers.internal_promoter_checker import PromoterChecker
+from genedesign.seq_utils.check_seq import CheckSequence
+from genedesign.models.rbs_option import RBSOption
+
+
+@pytest.fixture
+def objective():
+    obj = Objective()
+    obj.initiate()
+    return obj
+
+
+def test_default_terms_use_default_weights(objective):
+    assert objective.weights == DEFAULT_WEIGHTS
+
+
+def test_missing_measurements_contribute_nothing(objective):
+    assert objective.score(Measurements()) == 0.0
+    assert objective.breakdown(Measurements(cai=0.8)) == {'cai': 0.8}
+
+
+def test_penalties_are_graded(objective):
+    """
+    More hairpins, a promoter closer to the threshold and GC further out of range all score worse.
+    """
+    assert objective.score(Measurements(hairpin_counts=(1, 1))) == 0.0
+    assert objective.score(Measurements(hairpin_counts=(3, 1))) < objective.score(Measurements(hairpin_counts=(2, 1))) < 0
+    assert objective.score(Measurements(hairpin_excess=1)) == objective.score(Measurements(hairpin_counts=(2, 1)))
+
+    threshold = PromoterChecker.threshold
+    far = objective.score(Measurements(promoter_max_score=threshold - 5))
+    near = objective.score(Measurements(promoter_max_score=threshold - 1))
+    over = objective.score(Measurements(promoter_max_score=threshold + 1))
+    assert far == 0.0
+    assert over < near < far
+
+    # The summed promoter excess is a separate term with its own weight
+    assert objective.breakdown(Measurements(promoter_excess=3.0)) == {'promoter_excess': pytest.approx(-0.3)}
+    objective.set_weight('promoter', 0.0)
+    assert objective.score(Measurements(promoter_excess=3.0)) == pytest.approx(-0.3)
+
+    assert objective.score(Measurements(gc_content=0.5)) == 0.0
+    assert objective.score(Measurements(gc_content=0.2)) < objective.score(Measurements(gc_content=0.35)) < 0
+    assert objective.score(Measurements(gc_content=0.7)) == pytest.approx(objective.score(Measurements(gc_content=0.3)))
+
+
+def test_weights_and_custom_terms(objective):
+    m = Measurements(checks_passed=3, checks_total=5, cai=0.5)
+    assert objective.score(m) == pytest.approx(0.6 + 0.5)
+
+    objective.set_weight('cai', 2.0)
+    assert objective.score(m) == pytest.approx(0.6 + 1.0)
+
+    class LengthTerm(ObjectiveTerm):
+        name = 'length'
+        def value(self, m):
+            return m.length
+
+    objective.add_term(LengthTerm(weight=0.01))
+    assert objective.score(Measurements(length=100)) == pytest.approx(1.0)
+    with pytest.raises(KeyError):
+        objective.term('missing')
+    assert objective.find_term('missing') is None
+
+
+def test_incremental_state_matches_full_rescore(objective):
+    codons = ["ATG", "GCT", "AAA", "TTA", "GAA", "CGC", "ATT", "TAA"]
+    state = objective.new_state()
+    for codon in codons:
+        state.extend([codon])
+
+    fresh = objective.new_state().extend(codons)
+    assert state.rnase_sites == objective.rnase_checker.count(''.join(codons))
+    assert state.score() == pytest.approx(fresh.score())
+
+    m = state.measurements()
+    assert m.cai == pytest.approx(objective.codon_checker.calc_cai(codons))
+    assert m.gc_content == pytest.approx(sum(base in 'GC' for base in ''.join(codons)) / len(''.join(codons)))
+
+
+def test_copy_is_independent(objective):
+    parent = objective.new_state().extend(["ATG", "GCT"])
+    child = parent.copy().extend(["AAA"])
+    assert parent.n_codons == 2 and child.n_codons == 3
+    assert parent.seq == "ATGGCT"
+
+
+def test_check_sequence_shares_objective(objective):
+    checker = CheckSequence()
+    checker.objective = objective
+    checker.initiate()
+    assert checker.objective is objective
+
+    rbs = RBSOption(utr="GATTTAACTTTAAGAAGGAGATATACATATG", cds="ATGTAA", gene_name="test", first_six_aas="M")
+    codons = ["ATG", "GGT", "GCG", "AAA", "CTG", "GAA", "TTC", "CAG", "ATT", "ACC", "GAT", "CGT"]
+    _, before = checker.run(codons[-3:], codons, rbs, len(codons))
+    objective.set_weight('cai', 0.0)
+    _, after = checker.run(codons[-3:], codons, rbs, len(codons))
+    assert before - after == pytest.approx(checker.check_codons(codons + codons[-3:], len(codons))[1])
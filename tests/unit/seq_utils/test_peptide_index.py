@@ -0,0 +1,36 @@
+import random
+import Levenshtein
+import pytest
+from genedesign.seq_utils.peptide_index import PeptideIndex, deletion_variants
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+
+@pytest.fixture
+def peptides():
+    rng = random.Random(5)
+    # Small alphabet slices make close neighbours common
+    peptides = {'M' + ''.join(rng.choice(AMINO_ACIDS[:6]) for _ in range(rng.randint(3, 5))) for _ in range(400)}
+    return sorted(peptides)
+
+def test_deletion_variants():
+    assert deletion_variants("MKA", 1) == {"MKA", "KA", "MA", "MK"}
+    assert deletion_variants("MK", 3) == {"MK", "M", "K", ""}
+
+def test_query_matches_brute_force(peptides):
+    index = PeptideIndex()
+    index.initiate(peptides, max_distance=2)
+    rng = random.Random(9)
+    for _ in range(100):
+        query = 'M' + ''.join(rng.choice(AMINO_ACIDS[:8]) for _ in range(rng.randint(2, 6)))
+        expected = {}
+        for peptide_id, peptide in enumerate(peptides):
+            distance = Levenshtein.distance(query, peptide)
+            if distance <= 2:
+                expected.setdefault(distance, []).append(peptide_id)
+        assert index.query(query) == dict(sorted(expected.items()))
+
+def test_exact_distance(peptides):
+    index = PeptideIndex()
+    index.initiate(peptides)
+    assert index.distance("MAAAA", 0) == Levenshtein.distance("MAAAA", peptides[0])
+    assert len(index) == len(peptides)
@@ -0,0 +1,83 @@
+import pytest
+from genedesign.seq_utils.sequence_context import SequenceContext
+from genedesign.seq_utils.check_seq import CheckSequence
+from genedesign.models.rbs_option import RBSOption
+from tests.benchmarking.synthetic_inputs import random_codons
+
+UTR = "GATTTAACTTTAAGAAGGAGATATACATATG"
+
+
+@pytest.fixture
+def check_sequence():
+    cs = CheckSequence()
+    cs.initiate()
+    return cs
+
+
+@pytest.fixture
+def rbs():
+    return RBSOption(utr=UTR, cds="ATGTAA", gene_name="test", first_six_aas="M")
+
+
+def test_window_matches_joined_history(check_sequence):
+    """
+    However many codons are committed, the window equals the tail of the joined sequence plus the candidate.
+    """
+    codons = random_codons(60, seed=4)
+    candidate = random_codons(9, seed=5)
+    context = check_sequence.new_context(UTR)
+    for n in range(len(codons)):
+        history = UTR[-25:] + ''.join(codons[:n])
+        expected = history[-(50 - 27):] + ''.join(candidate)
+        assert context.window(candidate) == expected
+        context.commit([codons[n]])
+
+
+def test_short_history_and_long_candidate(check_sequence):
+    context = check_sequence.new_context('')
+    assert context.window(['ATG']) == 'ATG'
+    context.commit(['ATG', 'GCT'])
+    assert context.window(['AAA']) == 'ATGGCTAAA'
+    long_candidate = ['GCT'] * 20
+    assert context.window(long_candidate) == 'GCT' * 20
+
+
+def test_codon_stats_match_codon_checker(check_sequence):
+    codons = random_codons(40, seed=6)
+    candidate = random_codons(9, seed=7)
+    context = check_sequence.new_context(UTR, codons)
+    n, distinct, rare, cai = context.codon_stats(candidate)
+    _, diversity, expected_rare, expected_cai = check_sequence.codon_checker.run(codons + candidate)
+    assert n == 49
+    assert distinct / 62 == pytest.approx(diversity)
+    assert rare == expected_rare
+    assert cai == pytest.approx(expected_cai)
+    assert check_sequence.check_context_codons(context, candidate, 100) == pytest.approx(check_sequence.check_codons(codons + candidate, 100))
+
+
+def test_candidate_is_checked(check_sequence, rbs):
+    """
+    A forbidden site inside the candidate window fails the check even when the committed sequence is clean.
+    """
+    codons = ["ATG", "GGT", "GCG", "AAA", "CTG", "CAG", "ATT", "ACC"]
+    context = check_sequence.new_context(UTR, codons)
+    dirty, _ = check_sequence.run(["GAA", "TTC", "CTG"], codons, rbs, 30, context=context)  # EcoRI
+    assert not dirty
+    assert check_sequence.run(["GAA", "TTC", "CTG"], codons, rbs, 30, short_circuit=True, context=context)[0] == dirty
+
+
+def test_placed_context_counts_the_rare_codon_allowance_before_it(check_sequence):
+    """
+    A segment starting at codon 120 of a 300-codon CDS may use two rare codons up to codon 200, minus
+    what the codons before it were allowed.
+    """
+    candidate = ['CTG', 'AAA', 'GAA', 'AGG']
+    context = check_sequence.new_context('')
+    assert check_sequence.check_context_codons(context, candidate, 300)[0]
+
+    context.place(120, rare_offset=2)
+    assert not check_sequence.check_context_codons(context, candidate, 300)[0]
+    assert check_sequence.violating_codons(candidate, context, 300) == [3]
+
+    context.place(120, rare_offset=1)
+    assert check_sequence.check_context_codons(context, candidate, 300)[0]